@@ -0,0 +1,190 @@
+"""
+UI-independent driver that runs a compiled plan over a range of workbook rows
+"""
+
+from collections import namedtuple
+
+from engine import prepare_variables, run_row
+from error_policy import ErrorPolicy
+from row_filter import matching_rows
+from validation import ValidationError, validate_rows
+from run_control import RunCancelled, RunControl
+from translations import get_text
+
+# Outcome of a run: rows completed, failed and rejected by validation, whether
+# stop() ended it early and whether the error policy aborted it
+RunResult = namedtuple("RunResult", ["completed", "failed", "stopped", "rejected", "aborted"])
+
+
+def _ignore(*args, **kwargs):
+    pass
+
+
+class AutomationRunner:
+    """Run every step of a plan for rows [start_row, end_row) of a row source
+
+    Used by the GUI's worker thread and by the headless command line alike;
+    everything the caller wants to see comes back through callbacks:
+
+    - log(message, row=None) for each log line
+    - progress(done, total) after each completed row
+    - on_error(row_idx, exc) when a row has failed for good
+
+    What happens after a failure is decided by policy (an ErrorPolicy), never
+    by asking the operator, so unattended runs cannot stall. Failed rows are
+    recorded in failures (a FailureLog) when one is given.
+
+    control is the RunControl whose sleep the plan was compiled with; stop(),
+    pause() and resume() act on it.
+
+    row_filter, if given, is a row_filter expression: only the rows of the
+    range it matches are run. rules, a {variable: rules} dict of normalized
+    validation rules, rejects rows with bad cells before the first row runs;
+    rejected rows are reported like failed ones, without running any step.
+    transforms, a value_transforms.ValueTransforms, formats the mapped values
+    and fills in templates while the rows are prepared.
+    """
+
+    def __init__(self, plan, source, mappings, start_row, end_row, journal=None, skip_rows=(),
+                 stats=None, log=_ignore, progress=_ignore, on_error=_ignore, lang="en",
+                 policy=None, failures=None, control=None, row_filter=None, rules=None,
+                 transforms=None):
+        self.plan = plan
+        self.source = source
+        self.mappings = mappings
+        self.start_row = start_row
+        self.end_row = end_row
+        self.journal = journal
+        self.skip_rows = skip_rows
+        self.stats = stats
+        self.log = log
+        self.progress = progress
+        self.on_error = on_error
+        self.lang = lang
+        self.policy = policy or ErrorPolicy()
+        self.failures = failures
+        self.control = control or RunControl()
+        self.row_filter = row_filter
+        self.rules = rules
+        self.transforms = transforms
+
+    def stop(self):
+        """End the run, interrupting any wait in progress; safe from any thread"""
+        self.control.stop()
+
+    def pause(self):
+        """Freeze the run before its next step (or inside a wait)"""
+        self.control.pause()
+
+    def resume(self):
+        self.control.resume()
+
+    @property
+    def paused(self):
+        return self.control.paused
+
+    def run(self):
+        """Run the rows on the calling thread and return a RunResult
+
+        Errors preparing the rows (e.g. a mapped column that cannot be read,
+        or a FilterError) are raised before the first row runs.
+        """
+        control = self.control
+        completed = failed = rejected = consecutive = 0
+        aborted = False
+        try:
+            # Run preparation: parse any mapped columns a projected load skipped,
+            # then turn every mapped column into strings once for the whole range
+            lang = self.lang
+            self.source.ensure_columns(self.mappings.values())
+            selected = None
+            total_rows = max(min(self.end_row, self.source.row_count) - self.start_row, 0)
+            if self.row_filter:
+                # One vectorized pass picks the rows; only those are prepared and run
+                selected = matching_rows(self.source, self.row_filter, self.start_row, self.end_row)
+                self.log(get_text("filter_matches", lang).format(len(selected), total_rows))
+                total_rows = len(selected)
+            if self.rules:
+                selected = self._reject_invalid_rows(selected)
+                rejected = total_rows - len(selected)
+                total_rows = len(selected)
+            table = prepare_variables(self.source, self.mappings, self.start_row, self.end_row, selected,
+                                      self.transforms)
+
+            self.progress(0, total_rows)
+            for position, (row_idx, values) in enumerate(table.iter_rows(), 1):
+                if not control.checkpoint():
+                    break
+                if row_idx in self.skip_rows:
+                    continue  # Completed by the run being resumed
+
+                self.log(get_text("processing_row", lang).format(row_idx + 1), row=row_idx + 1)
+
+                finished, error, attempts = self._run_with_retries(row_idx, values)
+                if error is None:
+                    consecutive = 0
+                    if finished:
+                        # Only rows that ran every step are checkpointed
+                        if self.journal is not None:
+                            self.journal.mark_done(row_idx)
+                        completed += 1
+                        self.progress(position, total_rows)
+                    continue
+
+                failed += 1
+                consecutive += 1
+                self.log(get_text("error_in_row", lang).format(row_idx + 1, str(error)), row=row_idx + 1)
+                if self.failures is not None:
+                    self.failures.record(row_idx, dict(zip(self.mappings, values)), error, attempts)
+                self.on_error(row_idx, error)
+                if self.policy.should_abort(consecutive):
+                    self.log(get_text("run_aborted", lang).format(consecutive))
+                    aborted = True
+                    break
+        finally:
+            stopped = control.stopped
+            if self.journal is not None:
+                self.journal.close()
+            if self.stats is not None:
+                self.stats.finish()
+        return RunResult(completed, failed, stopped, rejected, aborted)
+
+    def _reject_invalid_rows(self, selected):
+        """Validate the rows to run in one pass; return the indices of the valid ones"""
+        import numpy as np
+        lang = self.lang
+        report = validate_rows(self.source, self.mappings, self.rules, self.start_row, self.end_row, selected,
+                               transforms=self.transforms)
+        # Rows the resumed run already completed are not reported again
+        rejected_rows = np.array([row_idx for row_idx in report.rejected.tolist() if row_idx not in self.skip_rows],
+                                 dtype=np.int64)
+        self.log(get_text("validation_summary", lang).format(report.checked, len(rejected_rows), report.elapsed))
+        for line in report.summary():
+            self.log(line)
+        for row_idx in rejected_rows.tolist():
+            error = ValidationError(report.reason(row_idx))
+            self.log(get_text("row_rejected", lang).format(row_idx + 1, str(error)), row=row_idx + 1)
+            if self.failures is not None:
+                self.failures.record(row_idx, report.values(row_idx), error, 0)
+            self.on_error(row_idx, error)
+        if selected is None:
+            selected = np.arange(self.start_row, min(self.end_row, self.source.row_count))
+        return np.setdiff1d(selected, rejected_rows, assume_unique=True)
+
+    def _run_with_retries(self, row_idx, values):
+        """Run one row, retrying it per the policy; return (finished, error, attempts)"""
+        control = self.control
+        attempt = 0
+        while True:
+            try:
+                return run_row(self.plan, values, control.checkpoint, control.sleep, self.stats), None, attempt + 1
+            except Exception as e:
+                delay = self.policy.retry_delay(attempt)
+                if delay is None or control.stopped:
+                    return False, e, attempt + 1
+                attempt += 1
+                self.log(get_text("retrying_row", self.lang).format(row_idx + 1, attempt, delay, str(e)), row=row_idx + 1)
+                try:
+                    control.sleep(delay)
+                except RunCancelled:
+                    return False, None, attempt
@@ -0,0 +1,106 @@
+"""
+Background task runner that keeps the Tk event loop responsive
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker when its task has been cancelled"""
+
+
+class BackgroundTask:
+    """Handle shared between a worker function and the Tk thread
+
+    The worker reports progress and checks for cancellation through this
+    object; it must never touch Tk widgets directly.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.future = None
+        self._cancel_event = threading.Event()
+        self._progress = None
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """Abort the worker if the task has been cancelled"""
+        if self._cancel_event.is_set():
+            raise TaskCancelled(self.name)
+
+    def report(self, message):
+        """Publish a progress message; the Tk thread picks up the latest one"""
+        self._progress = message
+
+
+class TaskRunner:
+    """Run functions on a worker pool and marshal results back through root.after"""
+
+    def __init__(self, root, max_workers=2, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dataflow-loader")
+        self._tasks = set()
+
+    def submit(self, name, func, *args, on_done=None, on_error=None, on_progress=None, on_cancel=None):
+        """Run func(task, *args) in the pool; callbacks are invoked on the Tk thread
+
+        on_cancel runs as soon as the task is cancelled; the worker finishes
+        in the background and its result is discarded.
+        """
+        task = BackgroundTask(name)
+        task.future = self.executor.submit(func, task, *args)
+        self._tasks.add(task)
+        callbacks = (on_done, on_error, on_progress, on_cancel)
+        self.root.after(self.poll_ms, self._poll, task, callbacks, None)
+        return task
+
+    def _poll(self, task, callbacks, last_progress):
+        on_done, on_error, on_progress, on_cancel = callbacks
+
+        # Results of a cancelled task are discarded, so there is no need to
+        # wait for its worker to notice
+        if task.cancelled:
+            self._tasks.discard(task)
+            if on_cancel:
+                on_cancel()
+            return
+
+        progress = task._progress
+        if on_progress and progress is not None and progress != last_progress:
+            on_progress(progress)
+
+        if not task.future.done():
+            self.root.after(self.poll_ms, self._poll, task, callbacks, progress)
+            return
+
+        self._tasks.discard(task)
+        error = task.future.exception()
+        if isinstance(error, TaskCancelled):
+            if on_cancel:
+                on_cancel()
+        elif error is not None:
+            if on_error:
+                on_error(error)
+        elif on_done:
+            on_done(task.future.result())
+
+    def shutdown(self):
+        """Cancel every task and drop the queued ones without waiting for the workers
+
+        Running workers stop at their next check_cancelled().
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        try:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError:
+            # cancel_futures is new in Python 3.9
+            self.executor.shutdown(wait=False)
@@ -0,0 +1,256 @@
+"""
+Throughput benchmarks for the data and automation engine on synthetic workbooks
+
+Example:
+    python benchmark.py --rows 1000 100000 --cols 5 50 --output bench.json
+    python benchmark.py --output new.json --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from data_sources import (DataFrameSource, StreamingSheetSource, list_sheets, project_columns,
+                          read_sheet_columns, read_sheet_header)
+from engine import compile_plan, prepare_variables, run_row, variable_slots
+from input_backends import NullBackend
+from run_log import RunLog
+
+SHEET_NAME = "Data"
+FORMATS = ("xlsx", "csv", "parquet")
+DEFAULT_FORMATS = ("xlsx", "csv")  # parquet needs pyarrow
+MODES = ("memory", "streaming")
+STAGES = ("discover", "load", "prepare", "run")
+
+DEFAULT_ROWS = (1000, 10000)
+DEFAULT_COLS = (5, 50)
+DEFAULT_MAPPED = 5
+
+# Stages faster than this in the baseline are too noisy to flag as regressions
+MIN_COMPARE_SECONDS = 0.005
+
+
+def column_name(index):
+    return f"col_{index}"
+
+
+def synthetic_frame(rows, cols, seed=0):
+    """Build a DataFrame cycling through integer, float and text columns"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for index in range(cols):
+        kind = index % 3
+        if kind == 0:
+            values = rng.integers(0, 1000000, rows)
+        elif kind == 1:
+            values = np.round(rng.random(rows) * 1000, 2)
+        else:
+            values = np.char.add("item-", rng.integers(0, 100000, rows).astype(str))
+        data[column_name(index)] = values
+    return pd.DataFrame(data)
+
+
+def write_workbook(path, rows, cols, fmt):
+    """Write a synthetic sheet to path as xlsx, csv or parquet"""
+    frame = synthetic_frame(rows, cols)
+    if fmt == "csv":
+        frame.to_csv(path, index=False)
+        return
+    if fmt == "parquet":
+        frame.to_parquet(path, index=False)
+        return
+    # Write-only mode streams rows to disk instead of building the sheet in memory
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_NAME)
+    sheet.append(list(frame.columns))
+    for row in frame.itertuples(index=False, name=None):
+        sheet.append([value.item() if hasattr(value, "item") else value for value in row])
+    workbook.save(path)
+
+
+def workbook_path(work_dir, rows, cols, fmt):
+    """Return the synthetic workbook for a size, generating it on first use"""
+    path = os.path.join(work_dir, f"synthetic_{rows}x{cols}.{fmt}")
+    if not os.path.exists(path):
+        write_workbook(path, rows, cols, fmt)
+    return path
+
+
+def build_preset(mapped):
+    """Column mappings and steps resembling a typical form-filling preset"""
+    mappings = {f"var{index}": column_name(index) for index in range(mapped)}
+    steps = []
+    for index, variable in enumerate(mappings):
+        steps.append({'action': "Click", 'params': {'x': 100, 'y': 100 + 30 * index}, 'delay': 0})
+        steps.append({'action': "Type Text", 'params': {'text_source': "Excel Data", 'text': variable}, 'delay': 0})
+        steps.append({'action': "Key Press", 'params': {'key': "tab"}, 'delay': 0})
+    steps.append({'action': "Key Press", 'params': {'key': "enter"}, 'delay': 0})
+    return mappings, steps
+
+
+def load(path, mode, sheet, mapped_columns):
+    """Load a sheet the way the Excel tab does, projected to the mapped columns"""
+    if mode == "streaming":
+        return StreamingSheetSource(path, sheet).scan()
+    all_columns = read_sheet_header(path, sheet)
+    projection = project_columns(all_columns, mapped_columns)
+    return DataFrameSource(read_sheet_columns(path, sheet, projection), all_columns)
+
+
+def run_case(path, mode, mappings, steps, log):
+    """Time every stage once; returns ({stage: seconds}, rows processed)"""
+    timings = {}
+
+    start = time.perf_counter()
+    sheet = list_sheets(path)[0]
+    timings["discover"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    source = load(path, mode, sheet, mappings.values())
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    source.ensure_columns(mappings.values())
+    table = prepare_variables(source, mappings)
+    plan = compile_plan(steps, variable_slots(mappings), NullBackend())
+    timings["prepare"] = time.perf_counter() - start
+
+    # Same per-row work as run_automation: one log line, then every step
+    rows = 0
+    start = time.perf_counter()
+    for row_idx, values in table.iter_rows():
+        log.write(f"Processing row {row_idx + 1}", row=row_idx + 1)
+        run_row(plan, values)
+        rows += 1
+    timings["run"] = time.perf_counter() - start
+    return timings, rows
+
+
+def benchmark(rows_list, cols_list, formats, modes, mapped, repeat, work_dir, progress=print):
+    """Run every size/format/mode combination and return the result records"""
+    results = []
+    log = RunLog(log_dir=os.path.join(work_dir, "logs"))
+    try:
+        for fmt in formats:
+            for rows in rows_list:
+                for cols in cols_list:
+                    progress(f"Preparing {rows}x{cols} {fmt} workbook...")
+                    path = workbook_path(work_dir, rows, cols, fmt)
+                    mappings, steps = build_preset(min(mapped, cols))
+
+                    for mode in modes:
+                        if mode == "streaming" and fmt != "xlsx":
+                            continue
+                        # Keep the fastest repetition of each stage to damp noise
+                        best = {}
+                        for _ in range(repeat):
+                            timings, processed = run_case(path, mode, mappings, steps, log)
+                            for stage, seconds in timings.items():
+                                best[stage] = min(seconds, best.get(stage, seconds))
+
+                        record = {
+                            "format": fmt, "mode": mode, "rows": rows, "cols": cols,
+                            "mapped": len(mappings), "steps": len(steps),
+                            "file_bytes": os.path.getsize(path),
+                            "stages": {stage: round(best[stage], 6) for stage in STAGES},
+                            "rows_per_second": round(processed / best["run"], 1) if best["run"] else None,
+                            "steps_per_second": round(processed * len(steps) / best["run"], 1) if best["run"] else None,
+                        }
+                        results.append(record)
+                        progress(format_record(record))
+    finally:
+        log.stop()
+    return results
+
+
+def case_key(record):
+    return (record["format"], record["mode"], record["rows"], record["cols"])
+
+
+def format_record(record):
+    stages = "  ".join(f"{stage}={record['stages'][stage]:.3f}s" for stage in STAGES)
+    return (f"{record['format']:<4} {record['mode']:<9} {record['rows']:>8}x{record['cols']:<4} "
+            f"{stages}  {record['rows_per_second']} rows/s")
+
+
+def compare(results, baseline, tolerance):
+    """Return lines describing stages more than tolerance slower than baseline"""
+    previous = {case_key(record): record for record in baseline.get("results", [])}
+    regressions = []
+    for record in results:
+        old = previous.get(case_key(record))
+        if old is None:
+            continue
+        for stage in STAGES:
+            before = old["stages"].get(stage)
+            after = record["stages"][stage]
+            if before and before >= MIN_COMPARE_SECONDS and after > before * (1 + tolerance):
+                regressions.append(f"{'/'.join(map(str, case_key(record)))} {stage}: "
+                                   f"{before:.3f}s -> {after:.3f}s ({after / before:.2f}x)")
+    return regressions
+
+
+def environment():
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "openpyxl": openpyxl.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DataFlow Pro on synthetic workbooks")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS), help="row counts to test")
+    parser.add_argument("--cols", type=int, nargs="+", default=list(DEFAULT_COLS), help="column counts to test")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(DEFAULT_FORMATS))
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES),
+                        help="sheet loading modes (streaming applies to xlsx only)")
+    parser.add_argument("--mapped", type=int, default=DEFAULT_MAPPED, help="columns mapped to variables")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per case; the fastest is kept")
+    parser.add_argument("--work-dir", help="where synthetic workbooks are kept (default: a temp directory)")
+    parser.add_argument("--label", default="", help="free-form label stored in the report, e.g. a version")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before a stage is flagged")
+    args = parser.parse_args(argv)
+
+    if min(args.rows) < 1 or min(args.cols) < 1 or args.mapped < 1 or args.repeat < 1:
+        parser.error("--rows, --cols, --mapped and --repeat must be positive")
+
+    work_dir = args.work_dir or os.path.join(tempfile.gettempdir(), "dataflow_benchmark")
+    os.makedirs(work_dir, exist_ok=True)
+
+    results = benchmark(args.rows, args.cols, args.formats, args.modes, args.mapped, args.repeat, work_dir)
+    report = {"label": args.label, "environment": environment(), "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""
+Headless command-line runner: run a saved preset over a workbook without the GUI
+
+Example:
+    python cli.py --preset presets/invoice.json --workbook orders.xlsx --sheet Orders --from-row 2 --to-row 500
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+
+from automation_runner import AutomationRunner
+from clipboard_input import ClipboardPaster
+from engine import PlanError, compile_plan, variable_slots
+from error_policy import ON_FAILURE, ErrorPolicy, FailureLog, failed_rows
+from global_hotkey import GlobalHotkey
+from row_filter import FilterError, matching_rows
+from run_journal import RunJournal, journal_path, preset_hash
+from run_control import RunControl
+from run_log import RunLog
+from run_stats import RunStats
+from sheet_cache import file_fingerprint
+from translations import get_text
+from validation import normalize_rules, validate_rows
+from value_transforms import ValueTransforms, normalize_transforms
+from lookups import LookupTables, normalize_lookup
+
+EXIT_OK = 0
+EXIT_ROW_ERRORS = 1     # the run finished but some rows failed
+EXIT_USAGE = 2          # bad arguments, preset or steps
+EXIT_DATA_ERROR = 3     # the workbook or sheet could not be read
+EXIT_INTERRUPTED = 130  # stopped with Ctrl+C or SIGTERM
+
+
+def load_preset(path, workbook=None):
+    """Return (steps, {variable: column}, {variable: rules}, ValueTransforms) from a preset saved by the GUI
+
+    Lookups are read from other sheets of workbook when the rows are prepared.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        preset = json.load(f)
+    steps = preset.get("automation_steps", [])
+    # Each mapping row is [variable, column, sample value]
+    mappings = {mapping[0]: mapping[1] for mapping in preset.get("column_mappings", [])}
+    rules = {variable: normalize_rules(rules) for variable, rules in preset.get("mapping_rules", {}).items()
+             if variable in mappings}
+    settings = {variable: normalize_transforms(settings, mappings)
+                for variable, settings in preset.get("mapping_transforms", {}).items()}
+    lookups = {variable: normalize_lookup(lookup) for variable, lookup in preset.get("mapping_lookups", {}).items()
+               if variable in mappings}
+    return steps, mappings, rules, ValueTransforms(mappings, settings, LookupTables(workbook, lookups))
+
+
+def open_source(path, sheet, mappings, streaming):
+    """Open a sheet as a row source, parsing only the mapped columns"""
+    from data_sources import (DataFrameSource, StreamingSheetSource, can_stream, list_sheets, project_columns,
+                              read_sheet_columns, read_sheet_header)
+    if sheet is None:
+        sheet = list_sheets(path)[0]
+    if streaming and can_stream(path):
+        return sheet, StreamingSheetSource(path, sheet).scan()
+
+    all_columns = read_sheet_header(path, sheet)
+    projection = project_columns(all_columns, mappings.values()) or None
+    data = read_sheet_columns(path, sheet, projection)
+    return sheet, DataFrameSource(data, all_columns, lambda columns: read_sheet_columns(path, sheet, columns))
+
+
+def open_journal(workbook, sheet, steps, mappings, rules, transforms, path=None):
+    """Build the run's checkpoint journal (not opened yet)"""
+    lookups = transforms.lookups.lookups if transforms.lookups is not None else None
+    digest = preset_hash(steps, mappings, rules, transforms.settings, lookups)
+    workbook_hash = file_fingerprint(workbook)["hash"]
+    return RunJournal(path or journal_path(workbook_hash, sheet, digest), {
+        "workbook": os.path.abspath(workbook),
+        "sheet": sheet,
+        "workbook_hash": workbook_hash,
+        "preset_hash": digest,
+    })
+
+
+def make_backend(dry_run):
+    if dry_run:
+        from input_backends import NullBackend
+        return NullBackend()
+    from input_backends import PyAutoGUIBackend
+    return PyAutoGUIBackend()
+
+
+def make_paster(backend, input_mode):
+    if input_mode != "paste":
+        return None
+    import pyperclip
+    return ClipboardPaster(backend, pyperclip)
+
+
+def add_policy_arguments(parser):
+    """Error policy options, shared with shard_runner"""
+    parser.add_argument("--on-error", choices=ON_FAILURE, default="skip",
+                        help="skip a row that still fails after its retries, or abort the run")
+    parser.add_argument("--retries", type=int, default=0, help="times a failed row is retried")
+    parser.add_argument("--backoff", type=float, default=1.0,
+                        help="seconds before the first retry; doubled for each further retry")
+    parser.add_argument("--max-consecutive-failures", type=int, default=0,
+                        help="abort after this many failed rows in a row (0 = never)")
+
+
+def policy_arguments(args):
+    """Command-line form of the error policy options, to pass them on to cli.py"""
+    return ["--on-error", args.on_error, "--retries", str(args.retries), "--backoff", str(args.backoff),
+            "--max-consecutive-failures", str(args.max_consecutive_failures)]
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Run a DataFlow Pro preset over a workbook without the GUI")
+    parser.add_argument("--preset", required=True, help="preset JSON saved from the GUI")
+    parser.add_argument("--workbook", required=True, help="Excel workbook, CSV/TSV or Parquet file to read rows from")
+    parser.add_argument("--sheet", help="sheet name (default: the first sheet)")
+    parser.add_argument("--from-row", type=int, default=1, help="first data row to process, 1-based")
+    parser.add_argument("--to-row", type=int, help="last data row to process (default: the last row)")
+    parser.add_argument("--filter", metavar="EXPR",
+                        help='process only rows matching a condition, e.g. \'status == "NEW" and amount > 100\'')
+    parser.add_argument("--streaming", action="store_true", help="stream .xlsx rows instead of loading the sheet")
+    parser.add_argument("--input-mode", choices=("type", "paste"), default="type",
+                        help="default way Type Text steps enter values")
+    parser.add_argument("--resume", action="store_true", help="skip rows completed by an interrupted run")
+    add_policy_arguments(parser)
+    parser.add_argument("--failures-file", help="where failed rows are recorded (default: failures/failures_<time>.jsonl)")
+    parser.add_argument("--failures-from", help="process only the rows listed in a failures file of an earlier run")
+    parser.add_argument("--dry-run", action="store_true", help="run every step without sending input events")
+    parser.add_argument("--validate-only", action="store_true",
+                        help="only check the rows against the preset's validation rules and list rejected rows")
+    parser.add_argument("--log-file", help="also write the log to this file (default: logs/dataflow.log only)")
+    parser.add_argument("--journal", help="checkpoint journal file (default: one per workbook, sheet and preset)")
+    parser.add_argument("--skip-journal", help="also skip rows completed in this journal (used by shard_runner)")
+    parser.add_argument("--quiet", action="store_true", help="print only the final summary")
+    parser.add_argument("--events", action="store_true",
+                        help="print progress, failures and the summary as JSON lines instead of log lines")
+    parser.add_argument("--stop-hotkey", metavar="KEYS",
+                        help="X11 hotkey that stops the run from any window, e.g. ctrl+shift+Escape")
+    parser.add_argument("--lang", default="en", help="language of log messages")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    lang = args.lang
+    started = time.perf_counter()
+
+    logs = [RunLog()]
+    if args.log_file:
+        logs.append(RunLog(os.path.dirname(args.log_file) or ".", os.path.basename(args.log_file)))
+
+    quiet = args.quiet or args.events
+
+    def log(message, row=None):
+        now = datetime.now()
+        for run_log in logs:
+            run_log.write(message, row, now)
+        if not quiet:
+            print(f"[{now:%H:%M:%S}] {message}", flush=True)
+
+    def emit(event, **fields):
+        if args.events:
+            print(json.dumps(dict(fields, event=event)), flush=True)
+
+    def fail(message, code):
+        log(message)
+        print(message, file=sys.stderr)
+        emit("error", message=message, code=code)
+        return code
+
+    try:
+        try:
+            steps, mappings, rules, transforms = load_preset(args.preset, args.workbook)
+        except (OSError, ValueError, TypeError, IndexError) as e:
+            return fail(get_text("preset_load_error", lang).format(str(e)), EXIT_USAGE)
+
+        try:
+            sheet, source = open_source(args.workbook, args.sheet, mappings, args.streaming)
+        except Exception as e:
+            return fail(get_text("error_loading_file", lang).format(str(e)), EXIT_DATA_ERROR)
+
+        start_row = max(args.from_row - 1, 0)
+        end_row = source.row_count if args.to_row is None else min(args.to_row, source.row_count)
+        if start_row >= end_row:
+            return fail(f"No rows to process in {args.from_row}..{end_row}", EXIT_USAGE)
+
+        if args.validate_only:
+            try:
+                selected = matching_rows(source, args.filter, start_row, end_row) if args.filter else None
+                report = validate_rows(source, mappings, rules, start_row, end_row, selected, transforms=transforms)
+            except FilterError as e:
+                return fail(get_text("invalid_filter", lang).format(str(e)), EXIT_USAGE)
+            except Exception as e:
+                return fail(get_text("error_loading_sheet", lang).format(str(e)), EXIT_DATA_ERROR)
+            summary = get_text("validation_summary", lang).format(report.checked, len(report.rejected), report.elapsed)
+            log(summary)
+            for line in report.summary():
+                log(line)
+            for row_idx in report.rejected.tolist():
+                log(get_text("row_rejected", lang).format(row_idx + 1, report.reason(row_idx)), row=row_idx + 1)
+                emit("row_failed", row=row_idx + 1, error=report.reason(row_idx))
+            if args.quiet and not args.events:
+                print(summary)
+            return EXIT_ROW_ERRORS if len(report.rejected) else EXIT_OK
+
+        backend = make_backend(args.dry_run)
+        paster = make_paster(backend, args.input_mode)
+        control = RunControl()
+        try:
+            plan = compile_plan(steps, variable_slots(mappings), backend, paster, args.input_mode, control.sleep)
+        except PlanError as e:
+            return fail(get_text("invalid_steps", lang).format(str(e)), EXIT_USAGE)
+
+        try:
+            policy = ErrorPolicy(args.retries, args.backoff, on_failure=args.on_error,
+                                 max_consecutive=args.max_consecutive_failures)
+            retry_rows = failed_rows(args.failures_from) if args.failures_from else None
+        except (OSError, ValueError, KeyError) as e:
+            return fail(str(e), EXIT_USAGE)
+
+        journal = open_journal(args.workbook, sheet, steps, mappings, rules, transforms, args.journal)
+        skip_rows = journal.completed() if args.resume else set()
+        if args.skip_journal:
+            skip_rows |= RunJournal(args.skip_journal).completed()
+        if retry_rows is not None:
+            skip_rows |= set(range(start_row, end_row)) - retry_rows
+        journal.open(reset=not args.resume)
+        failures = FailureLog(args.failures_file)
+
+        def progress(done, total):
+            emit("progress", done=done, total=total)
+
+        def on_error(row_idx, error):
+            emit("row_failed", row=row_idx + 1, error=str(error))
+
+        stats = RunStats(plan)
+        runner = AutomationRunner(plan, source, mappings, start_row, end_row, journal, skip_rows, stats,
+                                  log=log, progress=progress, on_error=on_error, lang=lang,
+                                  policy=policy, failures=failures, control=control, row_filter=args.filter,
+                                  rules=rules, transforms=transforms)
+
+        signal.signal(signal.SIGINT, lambda signum, frame: control.stop())
+        signal.signal(signal.SIGTERM, lambda signum, frame: control.stop())
+        if hasattr(signal, "SIGUSR1"):
+            # kill -USR1 pauses a run at its current step, kill -USR2 resumes it
+            signal.signal(signal.SIGUSR1, lambda signum, frame: control.pause())
+            signal.signal(signal.SIGUSR2, lambda signum, frame: control.resume())
+
+        hotkey = None
+        if args.stop_hotkey:
+            hotkey = GlobalHotkey(args.stop_hotkey, control.stop)
+            if hotkey.start():
+                log(get_text("stop_hotkey_active", lang).format(args.stop_hotkey))
+            else:
+                log(get_text("stop_hotkey_unavailable", lang).format(hotkey.error))
+
+        try:
+            result = runner.run()
+        except FilterError as e:
+            return fail(get_text("invalid_filter", lang).format(str(e)), EXIT_USAGE)
+        except Exception as e:
+            return fail(get_text("error_loading_sheet", lang).format(str(e)), EXIT_DATA_ERROR)
+        finally:
+            if hotkey is not None:
+                hotkey.stop()
+            if paster is not None:
+                paster.restore()
+        json_path, csv_path = stats.export()
+
+        totals = stats.totals()
+        summary = (f"Rows completed: {result.completed}, failed: {result.failed}, rejected: {result.rejected}, "
+                   f"skipped: {sum(1 for row_idx in skip_rows if start_row <= row_idx < end_row)}, elapsed: {totals['elapsed']:.1f}s, "
+                   f"{totals['rows_per_minute']:.1f} rows/min "
+                   f"(startup {stats.started - started:.2f}s)")
+        log(summary)
+        log(get_text("stats_exported", lang).format(f"{json_path}, {csv_path}"))
+        if failures.count:
+            log(get_text("failures_saved", lang).format(failures.count, failures.path))
+        if args.quiet and not args.events:
+            print(summary)
+
+        code = (EXIT_INTERRUPTED if result.stopped else EXIT_ROW_ERRORS if result.failed or result.rejected
+                else EXIT_OK)
+        emit("summary", completed=result.completed, failed=result.failed, rejected=result.rejected,
+             stopped=result.stopped, aborted=result.aborted, elapsed=totals["elapsed"], rows_per_minute=totals["rows_per_minute"], code=code)
+        return code
+    finally:
+        for run_log in logs:
+            run_log.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Clipboard paste fast path for typing long values
+"""
+
+import sys
+
+# Values shorter than this are typed; typing them is as fast as pasting
+PASTE_MIN_LENGTH = 16
+
+PASTE_HOTKEY = ("command", "v") if sys.platform == "darwin" else ("ctrl", "v")
+
+INPUT_MODES = ("default", "type", "paste")
+
+
+class ClipboardPaster:
+    """Enter text by putting it on the clipboard and sending one paste hotkey
+
+    Short ASCII strings are still typed. The operator's clipboard is saved
+    before the first paste and put back by restore() once the run is over,
+    so the target app never sees the old content mid-run.
+    """
+
+    def __init__(self, backend, clipboard, min_length=PASTE_MIN_LENGTH):
+        self.backend = backend
+        self.clipboard = clipboard
+        self.min_length = min_length
+        self._saved = None
+        self._saving = False
+
+    def write(self, text):
+        # pyautogui cannot type non-ASCII characters, so those always paste
+        if len(text) < self.min_length and text.isascii():
+            self.backend.write(text)
+            return
+        if not self._saving:
+            self._saved = self.clipboard.paste()
+            self._saving = True
+        self.clipboard.copy(text)
+        self.backend.hotkey(*PASTE_HOTKEY)
+
+    def restore(self):
+        """Put the clipboard content from before the first paste back"""
+        if self._saving:
+            self.clipboard.copy(self._saved if self._saved is not None else "")
+            self._saving = False
+            self._saved = None
@@ -0,0 +1,363 @@
+"""
+Row sources that feed workbook data to the automation engine
+"""
+
+import csv
+import os
+import threading
+
+# pandas and openpyxl are imported where they are used, so importing this
+# module stays cheap and the GUI can draw before the first workbook is opened
+
+# Number of rows kept in memory for previews and sample data in streaming mode
+PREVIEW_ROWS = 50
+
+# How often (in rows) long scans report progress
+PROGRESS_EVERY = 10000
+
+# Extensions openpyxl's read-only reader can stream
+STREAMABLE_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# Flat files read as a workbook with a single sheet named after the file
+CSV_EXTENSIONS = ('.csv', '.tsv', '.txt')
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+# CSV column types are inferred on this many leading rows, then the file is
+# parsed in chunks of CSV_CHUNK_ROWS with those types
+CSV_SAMPLE_ROWS = 10000
+CSV_CHUNK_ROWS = 200000
+
+# Bytes read to detect the delimiter of a .csv/.txt file
+_SNIFF_BYTES = 64 * 1024
+
+
+def can_stream(file_path):
+    """Return True if the file can be read with the streaming row source"""
+    return str(file_path).lower().endswith(STREAMABLE_EXTENSIONS)
+
+
+def file_kind(file_path):
+    """Return "csv", "parquet" or "excel" depending on the file extension"""
+    name = str(file_path).lower()
+    if name.endswith(CSV_EXTENSIONS):
+        return "csv"
+    if name.endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    return "excel"
+
+
+def list_sheets(file_path):
+    """Return the sheet names of a workbook; a flat file has one, named after it"""
+    if file_kind(file_path) != "excel":
+        return [os.path.splitext(os.path.basename(file_path))[0]]
+    import pandas as pd
+    with pd.ExcelFile(file_path) as excel_file:
+        return excel_file.sheet_names
+
+
+def _csv_options(file_path):
+    """Delimiter and encoding for pd.read_csv; .tsv is tab-separated, others are sniffed"""
+    options = {"encoding": "utf-8-sig"}  # Excel's CSV export starts with a BOM
+    if str(file_path).lower().endswith(".tsv"):
+        options["sep"] = "\t"
+        return options
+    with open(file_path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        sample = f.read(_SNIFF_BYTES)
+    try:
+        options["sep"] = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        options["sep"] = ","
+    return options
+
+
+def _parquet_columns(file_path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files needs pyarrow: pip install pyarrow")
+    # Skip the index pandas may store next to the data columns
+    return [name for name in pq.read_schema(file_path).names if not name.startswith("__index_level_")]
+
+
+def _is_code(value):
+    # 00123 or -0012: a leading zero before another digit
+    if not isinstance(value, str):
+        return False
+    digits = value[1:] if value[:1] == "-" else value
+    return digits[:1] == "0" and digits[1:2].isdigit()
+
+
+def _numbers_unless_codes(text):
+    """Turn a text column of a CSV into numbers, unless it holds codes
+
+    Text stays text when any cell has a leading zero (00123), is not a
+    number, or is an integer too big to survive a float64 column.
+    """
+    if any(_is_code(value) for value in text.tolist()):
+        return text
+    for dtype in ("int64", "float64"):  # float64 when there are blanks or decimals
+        try:
+            numbers = text.astype(dtype)
+        except (ValueError, TypeError, OverflowError):
+            continue
+        if dtype == "float64" and (numbers.abs() > 2 ** 53).any():
+            return text
+        return numbers
+    return text
+
+
+def _read_csv(file_path, columns=None, progress=None):
+    """Parse a CSV file in chunks, with column types inferred on its first rows
+
+    Text and decimal columns keep the sample's types in every chunk. Columns
+    that look like whole numbers in the sample, or are empty there, may
+    still hold codes with leading zeros further down, so they are read as
+    text and turned into numbers once every row is known. If a later row
+    does not fit the sample (text in a decimal column), the file is parsed
+    again with the types inferred over every row. progress(rows_read) is
+    called after each chunk and may raise to abort.
+    """
+    import pandas as pd
+    options = _csv_options(file_path)
+    if columns is not None:
+        wanted = set(columns)
+        options["usecols"] = lambda name: name in wanted
+
+    sample = pd.read_csv(file_path, nrows=CSV_SAMPLE_ROWS, **options)
+    undecided = [col for col, dtype in sample.dtypes.items() if dtype.kind in "iu" or sample[col].isna().all()]
+    # Boolean columns stay inferred per chunk: an empty cell further down
+    # turns them into objects, as with read_excel
+    dtypes = {col: dtype for col, dtype in sample.dtypes.items() if dtype.kind != "b"}
+    dtypes.update(dict.fromkeys(undecided, object))
+
+    chunks = []
+    rows = 0
+    try:
+        for chunk in pd.read_csv(file_path, dtype=dtypes, chunksize=CSV_CHUNK_ROWS, **options):
+            chunks.append(chunk)
+            rows += len(chunk)
+            if progress:
+                progress(rows)
+    except (ValueError, TypeError):
+        data = pd.read_csv(file_path, low_memory=False, dtype=dict.fromkeys(undecided, object), **options)
+    else:
+        data = pd.concat(chunks, ignore_index=True) if chunks else sample.iloc[:0]
+    for col in undecided:
+        data[col] = _numbers_unless_codes(data[col])
+    return data
+
+
+def _header_names(header):
+    """Build column names from a header row the same way pandas does"""
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def project_columns(all_columns, mapped_columns):
+    """Return the sheet columns referenced by mappings, in sheet order
+
+    Mapped columns come back from the Tk mapping tree, which may turn numeric
+    headers into ints, so names are compared as strings.
+    """
+    wanted = {str(col) for col in mapped_columns}
+    return [col for col in all_columns if str(col) in wanted]
+
+
+def _infer_numbers(data):
+    """Give columns of only numbers, dates or booleans their pandas dtype back
+
+    Text columns and columns mixing text with numbers stay object. Whole
+    numbers with blanks become float64, as read_excel would make them,
+    unless that would round integers beyond 2**53.
+    """
+    inferred = data.infer_objects()
+    for col in data.columns:
+        if inferred[col].dtype.kind == "f" and data[col].dtype == object:
+            if any(isinstance(value, int) and abs(value) > 2 ** 53 for value in data[col].tolist()):
+                inferred[col] = data[col]
+    return inferred
+
+
+def read_sheet_header(file_path, sheet_name):
+    """Return the column names of a sheet without parsing its rows"""
+    import pandas as pd
+    kind = file_kind(file_path)
+    if kind == "csv":
+        return list(pd.read_csv(file_path, nrows=0, **_csv_options(file_path)).columns)
+    if kind == "parquet":
+        return _parquet_columns(file_path)
+    return list(pd.read_excel(file_path, sheet_name=sheet_name, nrows=0).columns)
+
+
+def read_sheet_columns(file_path, sheet_name, columns=None, progress=None):
+    """Parse a sheet, restricted to the given columns when provided
+
+    CSV files are parsed in chunks, calling progress(rows_read) after each;
+    Parquet files only read the requested columns from disk.
+    """
+    import pandas as pd
+    kind = file_kind(file_path)
+    if kind == "csv":
+        return _read_csv(file_path, columns, progress)
+    if kind == "parquet":
+        return pd.read_parquet(file_path, columns=None if columns is None else list(columns))
+    # Cells are read as the reader returns them, like in streaming mode, so
+    # text that looks like a number (00123) is not turned into one
+    if columns is None:
+        data = pd.read_excel(file_path, sheet_name=sheet_name, dtype=object)
+    else:
+        wanted = set(columns)
+        data = pd.read_excel(file_path, sheet_name=sheet_name, usecols=lambda name: name in wanted, dtype=object)
+    return _infer_numbers(data)
+
+
+class DataFrameSource:
+    """Row source backed by a sheet loaded into a DataFrame
+
+    The DataFrame may hold only a projection of the sheet's columns. columns
+    always lists every column of the sheet; missing ones are parsed on demand
+    through loader(columns) when ensure_columns asks for them.
+    """
+
+    streaming = False
+
+    def __init__(self, data, columns=None, loader=None):
+        self.data = data
+        self.columns = list(data.columns) if columns is None else list(columns)
+        self.row_count = len(data)
+        self.loader = loader
+        self._lock = threading.Lock()
+
+    @property
+    def is_projected(self):
+        return len(self.data.columns) < len(self.columns)
+
+    def missing_columns(self, columns):
+        loaded = set(self.data.columns)
+        return [col for col in dict.fromkeys(columns) if col not in loaded]
+
+    def ensure_columns(self, columns):
+        """Parse any requested columns not loaded yet; return True if data changed"""
+        with self._lock:
+            missing = self.missing_columns(columns)
+            if not missing or self.loader is None:
+                return False
+            extra = self.loader(missing)
+            import pandas as pd
+            merged = pd.concat([self.data, extra[missing].reset_index(drop=True)], axis=1)
+            # Keep the sheet's original column order
+            self.data = merged[[col for col in self.columns if col in merged.columns]]
+            return True
+
+    def preview(self):
+        return self.data
+
+    def iter_rows(self, start=0, stop=None, columns=None):
+        """Yield (row_idx, values) tuples, values ordered like columns"""
+        stop = self.row_count if stop is None else min(stop, self.row_count)
+        frame = self.data if columns is None else self.data[list(columns)]
+        rows = frame.iloc[start:stop].itertuples(index=False, name=None)
+        for row_idx, values in enumerate(rows, start):
+            yield row_idx, values
+
+
+class StreamingSheetSource:
+    """Row source that streams an .xlsx sheet through openpyxl's read-only reader
+
+    Only headers, a short preview and the row count are kept in memory; rows
+    are parsed lazily while the automation iterates over them.
+    """
+
+    streaming = True
+
+    def __init__(self, file_path, sheet_name):
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self.columns = []
+        self.row_count = 0
+        self.preview_data = None
+
+    def _open(self):
+        import openpyxl
+        workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        sheet = workbook[self.sheet_name]
+        # The declared <dimension> may be stale or wrong; read what is there
+        sheet.reset_dimensions()
+        return workbook, sheet
+
+    def scan(self, preview_rows=PREVIEW_ROWS, progress=None):
+        """Read headers, preview rows and the row count in one cheap pass
+
+        progress, if given, is called with the number of rows counted so far
+        and may raise to abort the scan.
+        """
+        workbook, sheet = self._open()
+        try:
+            header = next(sheet.iter_rows(max_row=1, values_only=True), ())
+            self.columns = _header_names(header)
+
+            width = len(self.columns)
+            preview = []
+            for values in sheet.iter_rows(min_row=2, max_row=preview_rows + 1, values_only=True):
+                preview.append(tuple(values[:width]) + (None,) * (width - len(values)))
+            import pandas as pd
+            self.preview_data = pd.DataFrame(preview, columns=self.columns)
+
+            # Count the rows themselves, parsing only the first column; the
+            # declared sheet dimension cannot be trusted
+            count = 0
+            for _ in sheet.iter_rows(min_row=2, min_col=1, max_col=1, values_only=True):
+                count += 1
+                if progress and count % PROGRESS_EVERY == 0:
+                    progress(count)
+            self.row_count = count
+        finally:
+            workbook.close()
+        return self
+
+    # Streaming reads already parse only the requested columns
+    is_projected = False
+
+    def missing_columns(self, columns):
+        return []
+
+    def ensure_columns(self, columns):
+        return False
+
+    def preview(self):
+        return self.preview_data
+
+    def iter_rows(self, start=0, stop=None, columns=None):
+        """Yield (row_idx, values) tuples, values ordered like columns"""
+        columns = self.columns if columns is None else list(columns)
+        positions = [self.columns.index(col) for col in columns]
+        stop = self.row_count if stop is None else min(stop, self.row_count)
+        if start >= stop:
+            return
+        if not positions:
+            # Nothing to read, but callers still iterate over every row
+            for row_idx in range(start, stop):
+                yield row_idx, ()
+            return
+
+        # Restrict parsing to the span of requested columns
+        first, last = min(positions), max(positions)
+        offsets = [pos - first for pos in positions]
+
+        workbook, sheet = self._open()
+        try:
+            rows = sheet.iter_rows(min_row=start + 2, max_row=stop + 1,
+                                   min_col=first + 1, max_col=last + 1, values_only=True)
+            for row_idx, values in enumerate(rows, start):
+                yield row_idx, tuple(values[i] if i < len(values) else None for i in offsets)
+        finally:
+            workbook.close()
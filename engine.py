@@ -0,0 +1,351 @@
+"""
+Run preparation and compiled execution plans for the automation engine
+"""
+
+import itertools
+import time
+from collections import namedtuple
+
+from clipboard_input import INPUT_MODES
+from run_control import RunCancelled
+from screen_wait import wait_until_stable
+
+# Actions understood by the engine, as stored in presets
+ACTIONS = ("Click", "Double Click", "Right Click", "Type Text", "Key Press", "Wait", "Move Mouse",
+           "Wait Until Stable")
+
+
+class PlanError(ValueError):
+    """Raised when automation steps cannot be compiled into a plan"""
+
+
+class StepError(Exception):
+    """Raised by run_row when a step fails; error is the original exception"""
+
+    def __init__(self, step, error):
+        super().__init__(f"Step {step.index + 1} ({step.action}): {error}")
+        self.step = step
+        self.error = error
+
+
+# Streamed rows formatted per batch when a run has value transforms
+TRANSFORM_BATCH_ROWS = 1000
+
+# A step ready to run: run(values) performs the action for one row
+CompiledStep = namedtuple("CompiledStep", ["index", "action", "run", "delay"])
+
+
+def cell_to_text(value):
+    """Text typed for one cell
+
+    Empty cells (None from the streaming reader, NaN from pandas) become "",
+    and whole floats lose their .0, so 6 and 6.0 type the same whichever
+    way the sheet was loaded.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:
+            return ""
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+def column_to_strings(series):
+    """Convert a column to a list of cell_to_text(value), vectorized where the dtype allows
+
+    Empty cells become "" as in streaming mode, never "nan".
+    """
+    import numpy as np
+
+    missing = series.isna().to_numpy()
+    if series.dtype.kind == "f":
+        numbers = series.to_numpy()
+        with np.errstate(invalid="ignore"):
+            whole = np.isfinite(numbers) & (numbers == np.floor(numbers))
+            small = whole & (np.abs(numbers) < 2 ** 63)
+        strings = np.empty(len(numbers), dtype=object)
+        strings[~whole] = [str(value) for value in numbers[~whole].tolist()]
+        strings[small] = numbers[small].astype(np.int64).astype(str)
+        strings[whole & ~small] = [str(int(value)) for value in numbers[whole & ~small].tolist()]
+    elif series.dtype == object:
+        # Mixed columns: numbers and text one cell at a time; blanks are
+        # left out, as comparing NaN inside a ufunc warns
+        strings = np.full(len(series), "", dtype=object)
+        strings[~missing] = np.frompyfunc(cell_to_text, 1, 1)(series.to_numpy()[~missing])
+    else:
+        strings = series.to_numpy(dtype=object).astype(str)
+    strings[missing] = ""
+    return strings.tolist()
+
+
+def variable_slots(variables):
+    """Assign each mapped variable its index in a prepared row"""
+    return {name: slot for slot, name in enumerate(variables)}
+
+
+class VariableTable:
+    """Mapped variables resolved to string values for a range of rows
+
+    Each variable gets a slot; iter_rows yields (row_idx, values) where
+    values[slot] is the text to type for that variable, so a step resolves
+    its value with a single index instead of a DataFrame lookup.
+    """
+
+    def __init__(self, variables, rows):
+        self.slots = variable_slots(variables)
+        self._rows = rows
+
+    def iter_rows(self):
+        return self._rows()
+
+
+def _transform_rows(transforms, variables, batch):
+    """Apply compiled transforms to a batch of raw streamed rows, column by column"""
+    import pandas as pd
+    # object dtype keeps cells as read: ints stay ints even next to empty cells
+    frame = pd.DataFrame(batch, columns=range(len(variables)), dtype=object)
+    texts = transforms.apply({variable: frame[position] for position, variable in enumerate(variables)})
+    return zip(*(texts[variable] for variable in variables))
+
+
+def prepare_variables(source, mappings, start=0, stop=None, selected=None, transforms=None):
+    """Build the VariableTable for rows [start, stop) of a row source
+
+    mappings is a {variable: column} dict. selected, if given, is a sorted
+    array of row indices (e.g. from row_filter.matching_rows) and restricts
+    the table to those rows. transforms, a value_transforms.ValueTransforms,
+    formats the values and fills in templates. In-memory sheets are
+    converted column by column up front; streaming sheets are converted as
+    rows arrive, in batches of TRANSFORM_BATCH_ROWS when there are transforms.
+    """
+    variables = list(mappings)
+    columns = [mappings[name] for name in variables]
+    stop = source.row_count if stop is None else min(stop, source.row_count)
+    start = min(start, stop)
+    if selected is not None:
+        selected = selected[(selected >= start) & (selected < stop)]
+
+    if source.streaming:
+        wanted = None if selected is None else set(selected.tolist())
+        if wanted is None:
+            first, last = start, stop
+        elif wanted:
+            first, last = int(selected[0]), int(selected[-1]) + 1
+        else:
+            first = last = start
+
+        def raw_rows():
+            for row_idx, values in source.iter_rows(first, last, columns):
+                if wanted is None or row_idx in wanted:
+                    yield row_idx, values
+
+        if not transforms:
+            def rows():
+                for row_idx, values in raw_rows():
+                    yield row_idx, tuple(cell_to_text(value) for value in values)
+        else:
+            def rows():
+                raw = raw_rows()
+                for batch in iter(lambda: list(itertools.islice(raw, TRANSFORM_BATCH_ROWS)), []):
+                    yield from zip([row_idx for row_idx, _ in batch],
+                                   _transform_rows(transforms, variables, [values for _, values in batch]))
+        return VariableTable(variables, rows)
+
+    if selected is None:
+        frame = source.data.iloc[start:stop]
+        indices = range(start, stop)
+    else:
+        frame = source.data.iloc[selected]
+        indices = selected.tolist()
+    if transforms:
+        texts = transforms.apply({variable: frame[column] for variable, column in zip(variables, columns)})
+        strings = [texts[variable] for variable in variables]
+    else:
+        strings = [column_to_strings(frame[col]) for col in columns]
+
+    def rows():
+        return zip(indices, zip(*strings) if strings else itertools.repeat(()))
+    return VariableTable(variables, rows)
+
+
+def _bind(func, *args):
+    """Wrap func(*args) as a step that ignores the row values"""
+    def run(values):
+        func(*args)
+    return run
+
+
+def _paused(func, pause, sleep):
+    """Follow an input action with the backend's settle pause, through sleep"""
+    def run(*args):
+        func(*args)
+        sleep(pause)
+    return run
+
+
+def _number(params, key, index, convert=float, minimum=None):
+    try:
+        value = convert(params[key])
+    except KeyError:
+        raise PlanError(f"Step {index + 1}: missing parameter '{key}'")
+    except (TypeError, ValueError):
+        raise PlanError(f"Step {index + 1}: '{key}' must be a number, got {params[key]!r}")
+    if minimum is not None and value < minimum:
+        raise PlanError(f"Step {index + 1}: '{key}' must be at least {minimum}, got {value}")
+    return value
+
+
+def _parse_keys(key, index, backend):
+    """Split a 'ctrl+shift+s' style key string and check every key name"""
+    if not isinstance(key, str) or not key.strip():
+        raise PlanError(f"Step {index + 1}: no key given")
+    keys = tuple(part.strip() for part in key.split('+')) if '+' in key else (key,)
+    known = backend.key_names
+    for name in keys:
+        # Single characters are typed as-is; longer names must be known keys
+        if not name or (known is not None and len(name) > 1 and name.lower() not in known):
+            raise PlanError(f"Step {index + 1}: unknown key '{name}' in '{key}'")
+    return keys
+
+
+def _input_mode(params, input_mode):
+    mode = params.get('input_mode', 'default')
+    return input_mode if mode == 'default' else mode
+
+
+def uses_paste(steps, input_mode="type"):
+    """Whether any Type Text step of steps enters its text by clipboard paste"""
+    return any(step.get('action') == "Type Text" and _input_mode(step.get('params', {}), input_mode) == 'paste'
+               for step in steps)
+
+
+def _text_writer(params, index, backend, paster, input_mode):
+    """Pick how a Type Text step enters its value: keystrokes or clipboard paste"""
+    if params.get('input_mode', 'default') not in INPUT_MODES:
+        raise PlanError(f"Step {index + 1}: unknown input mode '{params['input_mode']}'")
+    mode = _input_mode(params, input_mode)
+    if mode != 'paste':
+        return backend.write
+    if paster is None:
+        raise PlanError(f"Step {index + 1}: clipboard paste is not available")
+    return paster.write
+
+
+def compile_step(step, index, slots, backend, paster=None, input_mode="type", sleep=time.sleep):
+    """Validate one step and bind its action to an InputBackend
+
+    paster is a ClipboardPaster used by Type Text steps whose input mode (or
+    the run's default input_mode) is 'paste'. Every wait of the step, including
+    the backend's action_pause after input actions, goes through sleep, so a
+    RunControl.sleep makes the whole step interruptible.
+    """
+    pause = getattr(backend, "action_pause", 0)
+    action = step.get('action')
+    params = step.get('params', {})
+    if action not in ACTIONS:
+        raise PlanError(f"Step {index + 1}: unknown action '{action}'")
+    delay = _number(step, 'delay', index, minimum=0) if 'delay' in step else 0.0
+
+    if action in ("Click", "Double Click", "Right Click", "Move Mouse"):
+        x = _number(params, 'x', index, int)
+        y = _number(params, 'y', index, int)
+        func = {"Click": backend.click, "Double Click": backend.double_click,
+                "Right Click": backend.right_click, "Move Mouse": backend.move_to}[action]
+        run = _bind(_paused(func, pause, sleep) if pause else func, x, y)
+
+    elif action == "Type Text":
+        write = _text_writer(params, index, backend, paster, input_mode)
+        if pause:
+            write = _paused(write, pause, sleep)
+        if params.get('text_source', 'Fixed Text') == "Excel Data":
+            variable = params.get('text')
+            if variable not in slots:
+                raise PlanError(f"Step {index + 1}: variable '{variable}' is not mapped to a column")
+            slot = slots[variable]
+
+            def run(values):
+                write(values[slot])
+        else:
+            run = _bind(write, str(params.get('text', '')))
+
+    elif action == "Key Press":
+        keys = _parse_keys(params.get('key'), index, backend)
+        func = backend.hotkey if len(keys) > 1 else backend.press
+        run = _bind(_paused(func, pause, sleep) if pause else func, *keys)
+
+    elif action == "Wait Until Stable":
+        region = (_number(params, 'x', index, int), _number(params, 'y', index, int),
+                  _number(params, 'width', index, int, minimum=1), _number(params, 'height', index, int, minimum=1))
+        timeout = _number(params, 'timeout', index, minimum=0)
+        screenshot = backend.screenshot
+
+        def run(values):
+            wait_until_stable(screenshot, region, timeout, sleep=sleep)
+
+    else:  # Wait
+        run = _bind(sleep, _number(params, 'seconds', index, minimum=0))
+
+    return CompiledStep(index, action, run, delay)
+
+
+def run_row(plan, values, is_running=None, sleep=time.sleep, stats=None):
+    """Run every step of a plan for one row
+
+    Returns True when all steps ran, False when is_running() turned false
+    before the last one or a wait raised RunCancelled. With a RunStats,
+    every step's timings are recorded. A failing step raises StepError.
+    """
+    try:
+        if stats is not None:
+            return _run_row_timed(plan, values, is_running, sleep, stats)
+        for step in plan:
+            if is_running is not None and not is_running():
+                return False
+            try:
+                step.run(values)
+            except RunCancelled:
+                raise
+            except Exception as e:
+                raise StepError(step, e) from e
+            if step.delay:
+                sleep(step.delay)
+        return True
+    except RunCancelled:
+        return False
+
+
+def _run_row_timed(plan, values, is_running, sleep, stats):
+    clock = stats.clock
+    row_start = previous = clock()
+    for position, step in enumerate(plan):
+        if is_running is not None and not is_running():
+            return False
+        started = clock()
+        try:
+            step.run(values)
+        except RunCancelled:
+            raise
+        except Exception as e:
+            raise StepError(step, e) from e
+        ran = clock()
+        if step.delay:
+            sleep(step.delay)
+        done = clock()
+        # Overhead is the gap between the previous step finishing and this one starting
+        stats.record_step(position, ran - started, done - ran, started - previous)
+        previous = done
+    stats.record_row(previous - row_start)
+    return True
+
+
+def compile_plan(steps, slots, backend, paster=None, input_mode="type", sleep=time.sleep):
+    """Compile automation steps into a list of CompiledStep
+
+    Every step is validated up front, so a bad preset fails before the first
+    row instead of somewhere in the middle of a run.
+    """
+    if not steps:
+        raise PlanError("No automation steps defined")
+    return [compile_step(step, index, slots, backend, paster, input_mode, sleep) for index, step in enumerate(steps)]
@@ -0,0 +1,93 @@
+"""
+Unattended handling of failed rows: retries with backoff, skip or abort, and a failures file
+"""
+
+import json
+import os
+from datetime import datetime
+
+FAILURES_DIR = "failures"
+
+# What a run does with a row that still fails after its retries
+ON_FAILURE = ("skip", "abort")
+
+
+class ErrorPolicy:
+    """How a run reacts when a row fails
+
+    A failed row is retried up to retries times, waiting backoff seconds
+    before the first retry and twice as long before each further one (capped
+    at max_backoff). A row that still fails is skipped, or ends the run when
+    on_failure is "abort". max_consecutive, if not 0, also ends the run after
+    that many failed rows in a row.
+    """
+
+    def __init__(self, retries=0, backoff=1.0, max_backoff=30.0, on_failure="skip", max_consecutive=0):
+        if on_failure not in ON_FAILURE:
+            raise ValueError(f"on_failure must be one of {', '.join(ON_FAILURE)}, got {on_failure!r}")
+        if retries < 0 or backoff < 0 or max_consecutive < 0:
+            raise ValueError("retries, backoff and max_consecutive cannot be negative")
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_failure = on_failure
+        self.max_consecutive = max_consecutive
+
+    def retry_delay(self, attempt):
+        """Seconds to wait before retry number attempt + 1, or None to give up"""
+        if attempt >= self.retries:
+            return None
+        return min(self.backoff * 2 ** attempt, self.max_backoff)
+
+    def should_abort(self, consecutive_failures):
+        if self.on_failure == "abort":
+            return True
+        return bool(self.max_consecutive) and consecutive_failures >= self.max_consecutive
+
+
+def default_failures_path(failures_dir=FAILURES_DIR, when=None):
+    return os.path.join(failures_dir, f"failures_{(when or datetime.now()):%Y%m%d_%H%M%S}.jsonl")
+
+
+class FailureLog:
+    """JSON-lines file of failed rows: row, step, exception and the row's values
+
+    The file is created on the first failure, so clean runs leave nothing
+    behind. failed_rows() reads one back to re-run just those rows. Each
+    entry is appended with a single write, so several processes can share
+    one file.
+    """
+
+    def __init__(self, path=None, failures_dir=FAILURES_DIR):
+        self.path = path or default_failures_path(failures_dir)
+        self.count = 0
+
+    def record(self, row_idx, values, error, attempts):
+        step = getattr(error, "step", None)
+        cause = getattr(error, "error", error)
+        entry = {
+            "row": row_idx + 1,
+            "row_index": row_idx,
+            "step": step.index + 1 if step is not None else None,
+            "action": step.action if step is not None else None,
+            "exception": type(cause).__name__,
+            "error": str(cause),
+            "attempts": attempts,
+            "values": values,
+            "time": datetime.now().isoformat(timespec="seconds"),
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self.count += 1
+
+
+def failed_rows(path):
+    """Return the 0-based indices of the rows listed in a failures file"""
+    rows = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                rows.add(int(json.loads(line)["row_index"]))
+    return rows
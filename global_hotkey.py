@@ -0,0 +1,208 @@
+"""
+System-wide hotkey listener backed by X11, used as an emergency stop during runs
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+
+# Pressed in any window to stop a running automation. Plain Escape is not
+# used: Key Press steps may send it to the target app themselves.
+DEFAULT_STOP_HOTKEY = "ctrl+shift+Escape"
+
+# Longest time the listener thread takes to notice stop()
+POLL_INTERVAL = 0.05
+
+_MODIFIERS = {"shift": 1 << 0, "ctrl": 1 << 2, "control": 1 << 2, "alt": 1 << 3, "super": 1 << 6, "win": 1 << 6}
+_LOCK_MASK = 1 << 1      # Caps Lock
+_NUM_LOCK_MASK = 1 << 4  # Mod2, Num Lock on practically every layout
+_KEY_PRESS = 2
+_GRAB_MODE_ASYNC = 1
+
+
+class _XEvent(ctypes.Union):
+    _fields_ = [("type", ctypes.c_int), ("pad", ctypes.c_long * 24)]
+
+
+_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+_xlib = None
+
+# X errors of the listeners' own connections, {display: [error events]}
+_errors = {}
+_error_handler = None
+_previous_handler = None
+_handler_lock = threading.Lock()
+
+
+def _load_xlib():
+    global _xlib
+    if _xlib is None:
+        path = ctypes.util.find_library("X11")
+        if path is None:
+            raise OSError("libX11 not found")
+        xlib = ctypes.cdll.LoadLibrary(path)
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XStringToKeysym.restype = ctypes.c_ulong
+        xlib.XStringToKeysym.argtypes = [ctypes.c_char_p]
+        xlib.XKeysymToKeycode.restype = ctypes.c_ubyte
+        xlib.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        xlib.XGrabKey.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint, ctypes.c_ulong,
+                                  ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        xlib.XUngrabKey.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint, ctypes.c_ulong]
+        xlib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        xlib.XPending.argtypes = [ctypes.c_void_p]
+        xlib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XEvent)]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xlib.XSetErrorHandler.restype = ctypes.c_void_p
+        xlib.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+        _xlib = xlib
+    return _xlib
+
+
+def _install_error_handler(xlib):
+    """Install the process-wide X error handler the listeners need, once
+
+    Xlib's default handler exits the process on BadAccess (the key is
+    grabbed by another client). The handler is process-wide, so it is set
+    once from the thread calling start() and never swapped while Tk uses
+    Xlib: errors of a listener's connection are recorded for it, all others
+    go to the handler that was installed before.
+    """
+    global _error_handler, _previous_handler
+    with _handler_lock:
+        if _error_handler is not None:
+            return
+
+        def handle(display, event):
+            failed = _errors.get(display)
+            if failed is not None:
+                failed.append(event)
+                return 0
+            return _previous_handler(display, event) if _previous_handler is not None else 0
+
+        _error_handler = _ERROR_HANDLER(handle)
+        previous = xlib.XSetErrorHandler(ctypes.cast(_error_handler, ctypes.c_void_p))
+        _previous_handler = _ERROR_HANDLER(previous) if previous else None
+
+
+def parse_hotkey(hotkey):
+    """Split 'ctrl+shift+Escape' into (modifier mask, X keysym name)"""
+    *modifiers, key = [part.strip() for part in hotkey.split("+")]
+    mask = 0
+    for name in modifiers:
+        if name.lower() not in _MODIFIERS:
+            raise ValueError(f"Unknown modifier '{name}' in hotkey '{hotkey}'")
+        mask |= _MODIFIERS[name.lower()]
+    if not key:
+        raise ValueError(f"No key in hotkey '{hotkey}'")
+    return mask, key
+
+
+class GlobalHotkey:
+    """Call callback from a background thread whenever hotkey is pressed
+
+    The key is grabbed on the X11 root window, so it fires whichever window
+    has the focus. The listener has its own display connection and blocks
+    in select() on it, so a press is handled as soon as the X server sends
+    it. Only X11 is supported; start() reports why when it cannot listen.
+    """
+
+    def __init__(self, hotkey, callback, poll_interval=POLL_INTERVAL):
+        self.hotkey = hotkey
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self._stopping = threading.Event()
+        self._thread = None
+        self.error = None
+
+    def start(self):
+        """Grab the hotkey and start listening; return False (see .error) on failure"""
+        if not sys.platform.startswith("linux") or not os.environ.get("DISPLAY"):
+            self.error = "global hotkeys need an X11 display"
+            return False
+        try:
+            _install_error_handler(_load_xlib())
+        except OSError as e:
+            self.error = str(e)
+            return False
+        ready = threading.Event()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, args=(ready,), name="global-hotkey", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.error is None
+
+    def stop(self):
+        """Release the hotkey; the listener exits within poll_interval"""
+        self._stopping.set()
+
+    def _grab(self, xlib, display, root):
+        mask, key = parse_hotkey(self.hotkey)
+        keysym = xlib.XStringToKeysym(key.encode()) or xlib.XStringToKeysym(key.capitalize().encode())
+        keycode = xlib.XKeysymToKeycode(display, keysym) if keysym else 0
+        if not keycode:
+            raise ValueError(f"Unknown key '{key}' in hotkey '{self.hotkey}'")
+
+        # A grab matches exact modifier state, so also grab with Caps/Num Lock on
+        grabs = [(keycode, mask | extra) for extra in (0, _LOCK_MASK, _NUM_LOCK_MASK, _LOCK_MASK | _NUM_LOCK_MASK)]
+
+        # XSync makes the server answer every grab on this connection, so a
+        # BadAccess has reached the error handler before it returns
+        failed = _errors[display]
+        for code, modifiers in grabs:
+            xlib.XGrabKey(display, code, modifiers, root, 0, _GRAB_MODE_ASYNC, _GRAB_MODE_ASYNC)
+        xlib.XSync(display, 0)
+        if failed:
+            for code, modifiers in grabs:
+                xlib.XUngrabKey(display, code, modifiers, root)
+            raise OSError(f"'{self.hotkey}' is already grabbed by another application")
+        return grabs
+
+    def _listen(self, ready):
+        try:
+            xlib = _load_xlib()
+            display = xlib.XOpenDisplay(None)
+            if not display:
+                raise OSError("cannot open the X display")
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+            ready.set()
+            return
+
+        root = xlib.XDefaultRootWindow(display)
+        errors = _errors[display] = []
+        try:
+            try:
+                grabs = self._grab(xlib, display, root)
+            except (OSError, ValueError) as e:
+                self.error = str(e)
+                return
+            finally:
+                ready.set()
+
+            fd = xlib.XConnectionNumber(display)
+            event = _XEvent()
+            while not self._stopping.is_set():
+                select.select([fd], [], [], self.poll_interval)
+                while xlib.XPending(display):
+                    xlib.XNextEvent(display, ctypes.byref(event))
+                    if event.type == _KEY_PRESS:
+                        self.callback()
+
+            for code, modifiers in grabs:
+                xlib.XUngrabKey(display, code, modifiers, root)
+            xlib.XSync(display, 0)
+        finally:
+            xlib.XCloseDisplay(display)
+            # Another listener may have opened a connection at the same address since
+            with _handler_lock:
+                if _errors.get(display) is errors:
+                    del _errors[display]
@@ -0,0 +1,117 @@
+"""
+Input backends that perform the mouse and keyboard actions of automation steps
+"""
+
+
+class InputBackend:
+    """Interface the step engine drives; one method per input primitive
+
+    key_names lists the key names press/hotkey accept, or is None to accept
+    any key (used when compiling Key Press steps). action_pause is how long
+    the engine waits after each input action so the target app can keep up.
+    """
+
+    key_names = None
+    action_pause = 0
+
+    def click(self, x, y):
+        raise NotImplementedError
+
+    def double_click(self, x, y):
+        raise NotImplementedError
+
+    def right_click(self, x, y):
+        raise NotImplementedError
+
+    def move_to(self, x, y):
+        raise NotImplementedError
+
+    def write(self, text):
+        raise NotImplementedError
+
+    def press(self, key):
+        raise NotImplementedError
+
+    def hotkey(self, *keys):
+        raise NotImplementedError
+
+    def screenshot(self, region):
+        """Return an image of region=(x, y, width, height)"""
+        raise NotImplementedError
+
+    def position(self):
+        """Return the current (x, y) of the mouse pointer"""
+        raise NotImplementedError
+
+
+def _blank_frame(region):
+    import numpy as np
+    _, _, width, height = region
+    return np.zeros((height, width, 3), dtype=np.uint8)
+
+
+class PyAutoGUIBackend(InputBackend):
+    """Drive the real mouse and keyboard through pyautogui"""
+
+    def __init__(self):
+        import pyautogui
+        self.pyautogui = pyautogui
+        self.key_names = pyautogui.KEYBOARD_KEYS
+
+        # pyautogui sleeps PAUSE seconds after every call, which a stop cannot
+        # interrupt; the engine takes over that pause with an interruptible wait
+        if pyautogui.PAUSE:
+            self.action_pause = pyautogui.PAUSE
+            pyautogui.PAUSE = 0
+
+        # Bind the hot methods directly to skip one call layer per action
+        self.click = pyautogui.click
+        self.double_click = pyautogui.doubleClick
+        self.right_click = pyautogui.rightClick
+        self.move_to = pyautogui.moveTo
+        self.write = pyautogui.write
+        self.press = pyautogui.press
+        self.hotkey = pyautogui.hotkey
+        self.position = pyautogui.position
+
+    def screenshot(self, region):
+        return self.pyautogui.screenshot(region=region)
+
+
+class NullBackend(InputBackend):
+    """Backend that accepts every action and does nothing
+
+    Used to measure the engine's own overhead. Screenshots return the same
+    blank frame every time.
+    """
+
+    def __init__(self, screen_size=(1920, 1080)):
+        self.screen_size = screen_size
+
+    def click(self, x, y):
+        pass
+
+    def double_click(self, x, y):
+        pass
+
+    def right_click(self, x, y):
+        pass
+
+    def move_to(self, x, y):
+        pass
+
+    def write(self, text):
+        pass
+
+    def press(self, key):
+        pass
+
+    def hotkey(self, *keys):
+        pass
+
+    def screenshot(self, region):
+        return _blank_frame(region)
+
+    def position(self):
+        return (0, 0)
+
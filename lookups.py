@@ -0,0 +1,146 @@
+"""
+Lookup joins: replace a mapped key with a value from another sheet of the workbook
+"""
+
+import threading
+
+from data_sources import read_sheet_columns
+from engine import cell_to_text, column_to_strings
+
+# pandas and numpy are imported where they are used, like in data_sources
+
+# Settings of a mapping's lookup, as stored in presets under "mapping_lookups"
+LOOKUP_KEYS = ("sheet", "key", "value")
+
+# Conflicting keys listed in the error when a lookup sheet has some
+CONFLICTS_SHOWN = 5
+
+
+def _key_of(value):
+    """Key text of one cell: numbers as written by cell_to_text, text trimmed
+
+    Text is never read as a number, so codes like 00012 and 12 stay apart
+    and long IDs are not rounded; 123, 123.0 and " 123" all give "123".
+    """
+    return value.strip() if isinstance(value, str) else cell_to_text(value)
+
+
+def _key_texts(keys):
+    """Key text of every cell of a Series, working out each distinct value once"""
+    import numpy as np
+    import pandas as pd
+    # Code -1 (an empty cell) picks the extra last slot
+    codes, distinct = pd.factorize(keys.to_numpy(dtype=object))
+    return np.append(np.array([_key_of(value) for value in distinct], dtype=object), "")[codes]
+
+
+def normalize_lookup(settings):
+    """Check one mapping's lookup; return it, or {} when no lookup is set
+
+    Raises ValueError for unknown settings or a lookup missing its sheet,
+    key column or value column.
+    """
+    clean = {}
+    for key, value in (settings or {}).items():
+        if key not in LOOKUP_KEYS:
+            raise ValueError(f"Unknown lookup setting '{key}'")
+        if value is not None and str(value).strip():
+            clean[key] = value if key != "sheet" else str(value)
+    if clean and len(clean) < len(LOOKUP_KEYS):
+        missing = ", ".join(key for key in LOOKUP_KEYS if key not in clean)
+        raise ValueError(f"Lookup needs a sheet, a key column and a value column (missing: {missing})")
+    return clean
+
+
+def lookup_text(lookup):
+    """Short description of a lookup for the mapping tree, e.g. Customers[code → account]"""
+    if not lookup:
+        return ""
+    return f"{lookup['sheet']}[{lookup['key']} → {lookup['value']}]"
+
+
+class LookupTable:
+    """Hashed index from the key column of a sheet to its value column
+
+    The index is built once; resolve() then joins a whole column of keys in
+    one vectorized get_indexer call. Rows with an empty key are left out,
+    and a key repeated with the same value is kept once; keys repeated with
+    different values are listed in conflicts, since no row can be picked.
+    """
+
+    def __init__(self, keys, values):
+        import pandas as pd
+        texts = _key_texts(keys)
+        pairs = pd.DataFrame({"key": texts, "value": column_to_strings(values)})
+        pairs = pairs[pairs["key"] != ""].drop_duplicates()
+        self.conflicts = pairs["key"][pairs["key"].duplicated()].unique().tolist()
+
+        index = pd.Index(texts)
+        first = ~index.duplicated() & (index != "")
+        self.index = index[first]
+        self.values = values.to_numpy(dtype=object)[first]
+
+    def __len__(self):
+        return len(self.index)
+
+    def resolve(self, keys):
+        """Values for a Series of keys; keys that are not found give empty cells"""
+        import numpy as np
+        import pandas as pd
+        positions = self.index.get_indexer(_key_texts(keys))
+        return pd.Series(np.append(self.values, None)[positions], index=keys.index, dtype=object)
+
+
+class LookupTables:
+    """The lookup tables of a run's mappings, read from the workbook on first use
+
+    lookups is a {variable: normalized lookup} dict. Every lookup sheet is
+    read once, limited to the key and value columns its lookups need, so
+    run preparation (on the worker thread) pays for the join, not the
+    caller building the run.
+    """
+
+    def __init__(self, file_path, lookups, read=read_sheet_columns):
+        self.file_path = file_path
+        self.lookups = {variable: lookup for variable, lookup in lookups.items() if lookup}
+        self.read = read
+        self._tables = None
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.lookups)
+
+    def __contains__(self, variable):
+        return variable in self.lookups
+
+    def load(self):
+        """Read the lookup sheets and build their indexes, once; return {variable: LookupTable}"""
+        with self._lock:
+            if self._tables is None:
+                sheets = {}
+                for lookup in self.lookups.values():
+                    columns = sheets.setdefault(lookup["sheet"], [])
+                    columns += [col for col in (lookup["key"], lookup["value"]) if col not in columns]
+                frames = {sheet: self.read(self.file_path, sheet, columns) for sheet, columns in sheets.items()}
+
+                tables = {}
+                for variable, lookup in self.lookups.items():
+                    frame = frames[lookup["sheet"]]
+                    names = {str(col): col for col in frame.columns}
+                    missing = [str(col) for col in (lookup["key"], lookup["value"]) if str(col) not in names]
+                    if missing:
+                        raise ValueError(f"Lookup of '{variable}': no column {', '.join(missing)} "
+                                         f"in sheet '{lookup['sheet']}'")
+                    table = LookupTable(frame[names[str(lookup["key"])]], frame[names[str(lookup["value"])]])
+                    if table.conflicts:
+                        shown = ", ".join(repr(key) for key in table.conflicts[:CONFLICTS_SHOWN])
+                        more = len(table.conflicts) - CONFLICTS_SHOWN
+                        raise ValueError(f"Lookup of '{variable}': {len(table.conflicts)} key(s) of sheet "
+                                         f"'{lookup['sheet']}' have different values: {shown}"
+                                         + (f" and {more} more" if more > 0 else ""))
+                    tables[variable] = table
+                self._tables = tables
+            return self._tables
+
+    def resolve(self, variable, keys):
+        return self.load()[variable].resolve(keys)
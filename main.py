@@ -1,20 +1,47 @@
+import time
+STARTUP_STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import json
-import pandas as pd
-import pyautogui
-import pyperclip
-import time
 import threading
 from datetime import datetime
 import os
 from translations import translations, get_text
+from data_sources import (
+    DataFrameSource, StreamingSheetSource, can_stream, file_kind, list_sheets,
+    project_columns, read_sheet_header, read_sheet_columns
+)
+from sheet_cache import SheetCache
+from background_tasks import TaskRunner
+from ui_events import UIEventQueue
+from run_log import RunLog, WIDGET_MAX_LINES
+from run_stats import RunStats
+from run_journal import RunJournal, first_incomplete, journal_path, preset_hash
+from clipboard_input import ClipboardPaster, INPUT_MODES
+from input_backends import PyAutoGUIBackend
+from engine import PlanError, compile_plan, compile_step, prepare_variables, uses_paste, variable_slots
+from automation_runner import AutomationRunner
+from error_policy import ErrorPolicy, FailureLog
+from run_control import RunControl
+from row_filter import FilterError, matching_rows
+from validation import normalize_rules, validate_rows
+from value_transforms import ValueTransforms, compile_format, normalize_transforms
+from lookups import LookupTables, lookup_text, normalize_lookup
+from global_hotkey import DEFAULT_STOP_HOTKEY, GlobalHotkey
 from ui_improvements import (
     setup_styles, create_tooltip, create_icon_button,
     create_status_bar, show_notification, setup_keyboard_shortcuts,
     ICONS, THEMES
 )
 
+# pandas, openpyxl, pyautogui and pyperclip are not imported above: they load
+# on first use (workbook load, run or capture) so the window appears quickly
+IMPORTS_DONE = time.perf_counter()
+
+# Rejected rows listed in the validation window; the log has all of them
+REJECTED_ROWS_SHOWN = 1000
+
 class AutomationGUI:
     def __init__(self):
         self.root = tk.Tk()
@@ -38,14 +65,48 @@ class AutomationGUI:
         self.excel_columns = []
         self.excel_sheets = []
         self.current_file_path = None
+        self.current_sheet = None
+        self.row_source = None
+        # Content hash of the workbook, taken by the sheet load for the run journal
+        self.workbook_hash = None
+        self.streaming_mode = tk.BooleanVar(value=False)
+        self.paste_text = tk.BooleanVar(value=False)
+        self._backend = None
+        self._paster = None
+        self.runner = None
+        self.stop_hotkey = None
+        self.mapping_rules = {}
+        self.mapping_transforms = {}
+        self.mapping_lookups = {}
+        self.filter_task = None
+        self.filter_after = None
         self.automation_steps = []
         self.current_preset = None
         self.presets_folder = "presets"
+        self.sheet_cache = SheetCache()
+        self.task_runner = TaskRunner(self.root)
+        self.load_task = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Ensure presets folder exists
         if not os.path.exists(self.presets_folder):
             os.makedirs(self.presets_folder)
 
+        # Every log line is also streamed to a rotating file on disk
+        self.run_log = RunLog()
+
+        # Worker threads report log lines, progress and status through this
+        # queue; the Tk thread applies them in batches a few times per second
+        self.ui_events = UIEventQueue(self.root, {
+            "log": self.append_log_lines,
+            "progress": self.set_progress,
+            "status": self.update_status,
+            "stats": self.show_run_stats,
+            "notify": lambda message, kind: show_notification(self.root, message, kind),
+            "emergency_stop": self.stop_automation,
+        }, coalesced=("progress", "status", "stats"))
+        self.ui_events.start()
+
         self.create_gui()
 
         # Create status bar
@@ -55,6 +116,40 @@ class AutomationGUI:
         # Setup keyboard shortcuts
         self.setup_shortcuts()
 
+        self.window_built = time.perf_counter()
+        # Idle callbacks run once Tk has drawn the window for the first time
+        self.root.after_idle(self.report_startup)
+
+    def report_startup(self):
+        first_paint = time.perf_counter()
+        self.log(get_text("startup_time", self.current_language).format(
+            (IMPORTS_DONE - STARTUP_STARTED) * 1000,
+            (self.window_built - IMPORTS_DONE) * 1000,
+            (first_paint - STARTUP_STARTED) * 1000))
+
+    @property
+    def backend(self):
+        """Input backend; pyautogui is imported on the first run or capture"""
+        if self._backend is None:
+            self._backend = PyAutoGUIBackend()
+        return self._backend
+
+    def paster_for(self, steps, input_mode):
+        """Clipboard paster for steps, or None when none of them pastes
+
+        pyperclip is only imported when a step pastes its text.
+        """
+        if not uses_paste(steps, input_mode):
+            return None
+        if self._paster is None:
+            import pyperclip
+            self._paster = ClipboardPaster(self.backend, pyperclip)
+        return self._paster
+
+    def restore_clipboard(self):
+        if self._paster is not None:
+            self._paster.restore()
+
     def create_gui(self):
         # Main container frame with padding
         main_container = ttk.Frame(self.root, style="Card.TFrame")
@@ -94,6 +189,9 @@ class AutomationGUI:
         file_menu.add_command(label=f"{ICONS['load']} {get_text('load_preset', self.current_language)}",
                             command=self.load_preset, accelerator="Ctrl+O")
         file_menu.add_separator()
+        file_menu.add_command(label=f"{ICONS['remove']} {get_text('clear_sheet_cache', self.current_language)}",
+                            command=self.clear_sheet_cache)
+        file_menu.add_separator()
         file_menu.add_command(label=f"{ICONS['error']} {get_text('exit', self.current_language)}",
                             command=self.root.quit, accelerator="Alt+F4")
 
@@ -151,6 +249,23 @@ class AutomationGUI:
         load_sheet_btn.pack(side=tk.LEFT, padx=10)
         create_tooltip(load_sheet_btn, "Load the selected sheet's data")
 
+        streaming_check = ttk.Checkbutton(sheet_frame, text=get_text("streaming_mode", lang), variable=self.streaming_mode)
+        streaming_check.pack(side=tk.LEFT, padx=5)
+        create_tooltip(streaming_check, "Read rows lazily during the run instead of loading the whole sheet (.xlsx only)")
+
+        # Background loading progress
+        load_frame = ttk.Frame(excel_section)
+        load_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.load_progress = ttk.Progressbar(load_frame, mode='indeterminate', length=200)
+        self.load_progress.pack(side=tk.LEFT, padx=5)
+
+        self.cancel_load_btn = create_icon_button(load_frame, "stop", get_text("cancel_loading", lang),
+                                                  command=self.cancel_loading, style="Secondary.TButton",
+                                                  state=tk.DISABLED)
+        self.cancel_load_btn.pack(side=tk.LEFT, padx=5)
+        create_tooltip(self.cancel_load_btn, "Cancel the workbook or sheet currently loading")
+
         # Data preview
         self.data_preview = ttk.Label(excel_section, text=get_text("no_data_loaded", lang), foreground="gray")
         self.data_preview.pack(pady=5)
@@ -160,12 +275,14 @@ class AutomationGUI:
         mapping_section.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
         # Create treeview for column mapping
-        columns = (get_text("variable", lang), get_text("excel_column", lang), get_text("sample_data", lang))
+        columns = (get_text("variable", lang), get_text("excel_column", lang), get_text("sample_data", lang),
+                   get_text("value_format", lang), get_text("validation_rules", lang))
         self.mapping_tree = ttk.Treeview(mapping_section, columns=columns, show='headings', style="Treeview")
+        self.mapping_tree.bind("<Double-1>", lambda e: self.edit_column_mapping())
 
         for col in columns:
             self.mapping_tree.heading(col, text=col)
-            self.mapping_tree.column(col, width=200)
+            self.mapping_tree.column(col, width=160)
 
         scrollbar_mapping = ttk.Scrollbar(mapping_section, orient=tk.VERTICAL, command=self.mapping_tree.yview)
         self.mapping_tree.configure(yscrollcommand=scrollbar_mapping.set)
@@ -180,7 +297,7 @@ class AutomationGUI:
         add_map_btn = create_icon_button(mapping_controls, "add", get_text("add_mapping", lang),
                                         command=self.add_column_mapping, style="Secondary.TButton")
         add_map_btn.pack(side=tk.LEFT, padx=5)
-        create_tooltip(add_map_btn, "Map an Excel column to a variable for automation")
+        create_tooltip(add_map_btn, "Map an Excel column to a variable for automation; double-click a mapping to edit its validation rules")
 
         remove_map_btn = create_icon_button(mapping_controls, "remove", get_text("remove_mapping", lang),
                                            command=self.remove_column_mapping, style="Secondary.TButton")
@@ -197,7 +314,7 @@ class AutomationGUI:
         ttk.Label(action_section, text=get_text("action_type", lang)).grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
         self.action_type = ttk.Combobox(action_section, values=[
             get_text("click", lang), get_text("double_click", lang), get_text("right_click", lang), get_text("type_text", lang),
-            get_text("key_press", lang), get_text("wait", lang), get_text("move_mouse", lang)
+            get_text("key_press", lang), get_text("wait", lang), get_text("move_mouse", lang), get_text("wait_stable", lang)
         ], state="readonly")
         self.action_type.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
         self.action_type.bind('<<ComboboxSelected>>', self.on_action_type_change)
@@ -269,15 +386,61 @@ class AutomationGUI:
 
         ttk.Label(row_frame, text=get_text("from", lang)).pack(side=tk.LEFT, padx=(10, 0))
         self.from_row = tk.IntVar(value=1)
-        ttk.Entry(row_frame, textvariable=self.from_row, width=5).pack(side=tk.LEFT, padx=2)
+        self.from_entry = ttk.Entry(row_frame, textvariable=self.from_row, width=5)
+        self.from_entry.pack(side=tk.LEFT, padx=2)
 
         ttk.Label(row_frame, text=get_text("to", lang)).pack(side=tk.LEFT, padx=(5, 0))
         self.to_row = tk.IntVar(value=10)
-        ttk.Entry(row_frame, textvariable=self.to_row, width=5).pack(side=tk.LEFT, padx=2)
+        self.to_entry = ttk.Entry(row_frame, textvariable=self.to_row, width=5)
+        self.to_entry.pack(side=tk.LEFT, padx=2)
+        self.toggle_row_selection()
+
+        paste_check = ttk.Checkbutton(exec_section, text=get_text("paste_long_text", lang), variable=self.paste_text)
+        paste_check.grid(row=0, column=2, padx=10, pady=5, sticky=tk.W)
+        create_tooltip(paste_check, "Enter long values with one clipboard paste instead of typing each character")
+
+        # Only rows matching the filter (within the range above) are run
+        ttk.Label(exec_section, text=get_text("row_filter", lang)).grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+        filter_frame = ttk.Frame(exec_section)
+        filter_frame.grid(row=1, column=1, columnspan=2, padx=5, pady=5, sticky=tk.W)
+
+        self.row_filter = tk.StringVar()
+        filter_entry = ttk.Entry(filter_frame, textvariable=self.row_filter, width=50)
+        filter_entry.pack(side=tk.LEFT)
+        create_tooltip(filter_entry, 'Only run rows matching a condition, e.g. status == "NEW" and amount > 100. '
+                                     'Write column names with spaces in `backticks`.')
+        self.filter_count_label = ttk.Label(filter_frame, text="")
+        self.filter_count_label.pack(side=tk.LEFT, padx=10)
+        for var in (self.row_filter, self.process_all, self.from_row, self.to_row):
+            var.trace_add("write", lambda *args: self.schedule_filter_count())
+
+        # What an unattended run does with failed rows
+        ttk.Label(exec_section, text=get_text("on_row_error", lang)).grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
+        policy_frame = ttk.Frame(exec_section)
+        policy_frame.grid(row=2, column=1, columnspan=2, padx=5, pady=5, sticky=tk.W)
+
+        self.error_actions = {get_text("error_skip", lang): "skip", get_text("error_abort", lang): "abort"}
+        self.on_row_error = ttk.Combobox(policy_frame, values=list(self.error_actions), state="readonly", width=24)
+        self.on_row_error.current(0)
+        self.on_row_error.pack(side=tk.LEFT)
+
+        ttk.Label(policy_frame, text=get_text("retries", lang)).pack(side=tk.LEFT, padx=(10, 0))
+        self.retries = tk.IntVar(value=0)
+        ttk.Spinbox(policy_frame, from_=0, to=10, textvariable=self.retries, width=4).pack(side=tk.LEFT, padx=2)
+
+        ttk.Label(policy_frame, text=get_text("backoff_s", lang)).pack(side=tk.LEFT, padx=(10, 0))
+        self.backoff = tk.DoubleVar(value=1.0)
+        ttk.Entry(policy_frame, textvariable=self.backoff, width=5).pack(side=tk.LEFT, padx=2)
+
+        ttk.Label(policy_frame, text=get_text("stop_after_failures", lang)).pack(side=tk.LEFT, padx=(10, 0))
+        self.max_consecutive = tk.IntVar(value=0)
+        consecutive_spin = ttk.Spinbox(policy_frame, from_=0, to=1000, textvariable=self.max_consecutive, width=5)
+        consecutive_spin.pack(side=tk.LEFT, padx=2)
+        create_tooltip(consecutive_spin, "Stop the run when this many rows fail one after another, e.g. when the target app has crashed")
 
         # Execution buttons
         button_frame = ttk.Frame(exec_section)
-        button_frame.grid(row=1, column=0, columnspan=2, pady=10)
+        button_frame.grid(row=3, column=0, columnspan=3, pady=10)
 
         start_btn = create_icon_button(button_frame, "play", get_text("start_automation", lang),
                                       command=self.start_automation, style="Success.TButton")
@@ -287,13 +450,39 @@ class AutomationGUI:
         stop_btn = create_icon_button(button_frame, "stop", get_text("stop_automation", lang),
                                      command=self.stop_automation, style="Danger.TButton")
         stop_btn.pack(side=tk.LEFT, padx=5)
-        create_tooltip(stop_btn, "Stop the running automation (Esc)")
+        create_tooltip(stop_btn, f"Stop the running automation (Esc, or {DEFAULT_STOP_HOTKEY} from any window)")
+
+        self.pause_btn = ttk.Button(button_frame, text=get_text("pause", lang),
+                                    command=self.toggle_pause, style="Secondary.TButton")
+        self.pause_btn.pack(side=tk.LEFT, padx=5)
+        create_tooltip(self.pause_btn, "Freeze the run at its current step; press again to continue")
 
         test_btn = create_icon_button(button_frame, "test", get_text("test_single_step", lang),
                                      command=self.test_single_step, style="Secondary.TButton")
         test_btn.pack(side=tk.LEFT, padx=5)
         create_tooltip(test_btn, "Test the selected step with sample data")
 
+        validate_btn = create_icon_button(button_frame, "success", get_text("validate_data", lang),
+                                          command=self.validate_data, style="Secondary.TButton")
+        validate_btn.pack(side=tk.LEFT, padx=5)
+        create_tooltip(validate_btn, "Check the rows against the mappings' validation rules without running anything")
+
+        # Live per-step timings of the current run
+        stats_section = ttk.LabelFrame(self.execution_frame, text=f"{ICONS['info']} {get_text('step_statistics', lang)}", style="TLabelframe")
+        stats_section.pack(fill=tk.X, padx=10, pady=5)
+
+        self.rows_per_minute_label = ttk.Label(stats_section, text=get_text("rows_per_minute", lang).format(0))
+        self.rows_per_minute_label.pack(anchor=tk.W, padx=5)
+
+        stats_columns = ("step", "action", "runs", "p50", "p95", "max", "delay", "overhead")
+        stats_headings = ("step", "action", "runs", "p50_ms", "p95_ms", "max_ms", "delay_p50_ms", "overhead_p50_ms")
+        self.stats_tree = ttk.Treeview(stats_section, columns=stats_columns, show='headings', height=5, style="Treeview")
+        for col, key in zip(stats_columns, stats_headings):
+            self.stats_tree.heading(col, text=get_text(key, lang))
+            self.stats_tree.column(col, width=120 if col == "action" else 80)
+        self.stats_tree.pack(fill=tk.X, padx=5, pady=5)
+        create_tooltip(self.stats_tree, "Per-step timings of the current run; the slowest steps show the highest p95")
+
         # Progress and log
         progress_section = ttk.LabelFrame(self.execution_frame, text=f"{ICONS['info']} {get_text('progress_log', lang)}", style="TLabelframe")
         progress_section.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -301,6 +490,27 @@ class AutomationGUI:
         self.progress = ttk.Progressbar(progress_section, mode='determinate')
         self.progress.pack(fill=tk.X, padx=5, pady=5)
 
+        # Search and jump-to-row over the full on-disk log
+        search_frame = ttk.Frame(progress_section)
+        search_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5)
+
+        self.log_search = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.log_search, width=30)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.bind('<Return>', lambda e: self.search_log())
+        search_btn = ttk.Button(search_frame, text=get_text("search_log", lang),
+                                command=self.search_log, style="Secondary.TButton")
+        search_btn.pack(side=tk.LEFT, padx=5)
+        create_tooltip(search_btn, "Search the complete log file, including lines no longer shown here")
+
+        ttk.Label(search_frame, text=get_text("row", lang)).pack(side=tk.LEFT, padx=(15, 0))
+        self.log_jump_row = tk.IntVar(value=1)
+        ttk.Entry(search_frame, textvariable=self.log_jump_row, width=8).pack(side=tk.LEFT, padx=5)
+        jump_btn = ttk.Button(search_frame, text=get_text("jump_to_row", lang),
+                              command=self.jump_to_log_row, style="Secondary.TButton")
+        jump_btn.pack(side=tk.LEFT, padx=5)
+        create_tooltip(jump_btn, "Show every log line recorded for this row")
+
         self.log_text = tk.Text(progress_section, height=15)
         if hasattr(self, 'text_config'):
             self.log_text.configure(**self.text_config)
@@ -315,38 +525,50 @@ class AutomationGUI:
     def load_excel_file(self):
         file_path = filedialog.askopenfilename(
             title="Select Excel File",
-            filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+            filetypes=[("Data files", "*.xlsx *.xls *.csv *.tsv *.txt *.parquet"), ("Excel files", "*.xlsx *.xls"),
+                       ("CSV files", "*.csv *.tsv *.txt"), ("Parquet files", "*.parquet"), ("All files", "*.*")]
         )
 
         if file_path:
-            try:
-                # Load Excel file and get sheet names
-                excel_file = pd.ExcelFile(file_path)
-                self.excel_sheets = excel_file.sheet_names
-                self.current_file_path = file_path
+            # Sheet discovery runs in the background; the UI is updated in on_sheets_discovered
+            self.start_load_task("discover", self._discover_sheets, file_path,
+                                 on_done=lambda sheets: self.on_sheets_discovered(file_path, sheets),
+                                 on_error=self.on_file_load_error)
 
-                # Update UI
-                self.excel_file_label.config(text=get_text("file_loaded", self.current_language).format(os.path.basename(file_path)))
-                self.sheet_combo['values'] = self.excel_sheets
-                if self.excel_sheets:
-                    self.sheet_combo.set(self.excel_sheets[0])  # Select first sheet by default
+    def _discover_sheets(self, task, file_path):
+        """Worker: return the sheet names of a workbook (a CSV or Parquet file has one)"""
+        task.report(get_text("reading_workbook", self.current_language).format(os.path.basename(file_path)))
+        return list_sheets(file_path)
 
-                # Reset preview
-                self.data_preview.config(text=get_text("select_sheet_msg", self.current_language), foreground="orange")
+    def on_sheets_discovered(self, file_path, sheets):
+        self.finish_load_task()
+        self.excel_sheets = sheets
+        self.current_file_path = file_path
 
-                self.log(get_text("sheets_found", self.current_language).format(len(self.excel_sheets)))
-                self.update_status(f"Excel file loaded: {len(self.excel_sheets)} sheets found")
+        # Update UI
+        self.excel_file_label.config(text=get_text("file_loaded", self.current_language).format(os.path.basename(file_path)))
+        self.sheet_combo['values'] = self.excel_sheets
+        if self.excel_sheets:
+            self.sheet_combo.set(self.excel_sheets[0])  # Select first sheet by default
 
-                # Load the first sheet by default
-                self.load_selected_sheet()
+        # Reset preview
+        self.data_preview.config(text=get_text("select_sheet_msg", self.current_language), foreground="orange")
 
-            except Exception as e:
-                messagebox.showerror(get_text("error", self.current_language), get_text("error_loading_file", self.current_language).format(str(e)))
-                self.log(get_text("error_loading_file", self.current_language).format(str(e)))
+        self.log(get_text("sheets_found", self.current_language).format(len(self.excel_sheets)))
+        self.update_status(f"Excel file loaded: {len(self.excel_sheets)} sheets found")
+
+        # Load the first sheet by default
+        self.load_selected_sheet()
+
+    def on_file_load_error(self, error):
+        self.finish_load_task()
+        messagebox.showerror(get_text("error", self.current_language), get_text("error_loading_file", self.current_language).format(str(error)))
+        self.log(get_text("error_loading_file", self.current_language).format(str(error)))
 
     def on_sheet_selected(self, event):
-        # This method is called when a sheet is selected from dropdown
-        pass
+        # Picking another sheet while one is loading switches the load to it
+        if self.load_task is not None:
+            self.load_selected_sheet()
 
     def load_selected_sheet(self):
         lang = self.current_language
@@ -354,32 +576,149 @@ class AutomationGUI:
             messagebox.showwarning(get_text("warning", lang), get_text("select_file_sheet", lang))
             return
 
-        try:
-            sheet_name = self.sheet_combo.get()
-            self.excel_data = pd.read_excel(self.current_file_path, sheet_name=sheet_name)
-            self.excel_columns = list(self.excel_data.columns)
-
-            # Clear existing mappings
-            self.mapping_tree.delete(*self.mapping_tree.get_children())
-
-            # Update preview
-            cols_text = ', '.join(self.excel_columns[:5]) + (' ...' if len(self.excel_columns) > 5 else '')
-            self.data_preview.config(
-                text=get_text("sheet_info", self.current_language).format(sheet_name, len(self.excel_data), cols_text),
-                foreground="green"
-            )
-
-            self.log(get_text("sheet_loaded", self.current_language).format(sheet_name, len(self.excel_data), len(self.excel_columns)))
-            self.update_status(f"Sheet '{sheet_name}' loaded successfully")
-
-            # Update row selection max values
-            if hasattr(self, 'to_row'):
-                self.to_row.set(len(self.excel_data))
+        # Read Tk state here; the worker must not touch widgets or variables
+        sheet_name = self.sheet_combo.get()
+        streaming = self.streaming_mode.get() and can_stream(self.current_file_path)
+        # Known mappings (from the tree or a preset) limit which columns are parsed
+        mapped_columns = list(dict.fromkeys(self.get_column_mappings().values()))
+        self.start_load_task("sheet", self._read_sheet, self.current_file_path, sheet_name, streaming, mapped_columns,
+                             on_done=lambda result: self.on_sheet_loaded(sheet_name, *result),
+                             on_error=self.on_sheet_load_error)
+
+    def _read_sheet(self, task, file_path, sheet_name, streaming, mapped_columns):
+        """Worker: parse a sheet and return (row source, loaded from cache, workbook hash)
+
+        The workbook is hashed here, off the Tk thread, so starting a run
+        does not read the whole file again to find its journal.
+        """
+        task.report(get_text("loading_sheet", self.current_language).format(sheet_name))
+        workbook_hash = self.sheet_cache.fingerprint(file_path)["hash"]
+        task.check_cancelled()
+        return self._parse_sheet(task, file_path, sheet_name, streaming, mapped_columns) + (workbook_hash,)
+
+    def _parse_sheet(self, task, file_path, sheet_name, streaming, mapped_columns):
+        """Worker: parse a sheet and return (row source, loaded from cache)"""
+        lang = self.current_language
+        if streaming:
+            def scan_progress(count):
+                task.check_cancelled()
+                task.report(get_text("scanning_rows", lang).format(sheet_name, count))
+            return StreamingSheetSource(file_path, sheet_name).scan(progress=scan_progress), False
+
+        def loader(columns):
+            return read_sheet_columns(file_path, sheet_name, columns)
+
+        def read_progress(count):
+            task.check_cancelled()
+            task.report(get_text("scanning_rows", lang).format(sheet_name, count))
+
+        if file_kind(file_path) == "parquet":
+            # Parquet is columnar already: reading the projection beats the cache
+            all_columns = read_sheet_header(file_path, sheet_name)
+            projection = project_columns(all_columns, mapped_columns) or None
+            return DataFrameSource(read_sheet_columns(file_path, sheet_name, projection), all_columns, loader), False
+
+        # Try the cache first, restricted to the mapped columns when there are any
+        all_columns = self.sheet_cache.header(file_path, sheet_name)
+        if all_columns is not None:
+            projection = project_columns(all_columns, mapped_columns) or None
+            data = self.sheet_cache.load(file_path, sheet_name, projection)
+            if data is not None:
+                return DataFrameSource(data, all_columns, loader), True
+
+        projection = None
+        if mapped_columns:
+            all_columns = read_sheet_header(file_path, sheet_name)
+            projection = project_columns(all_columns, mapped_columns) or None
+            task.check_cancelled()
+        data = read_sheet_columns(file_path, sheet_name, projection, progress=read_progress)
+        task.check_cancelled()
+        self.sheet_cache.store(file_path, sheet_name, data, all_columns)
+        return DataFrameSource(data, all_columns, loader), False
+
+    def on_sheet_loaded(self, sheet_name, source, from_cache, workbook_hash):
+        self.finish_load_task()
+        if from_cache:
+            self.log(get_text("sheet_from_cache", self.current_language).format(sheet_name))
+
+        self.row_source = source
+        self.current_sheet = sheet_name
+        self.workbook_hash = workbook_hash
+        # In streaming mode this only holds the preview rows
+        self.excel_data = source.preview()
+        self.excel_columns = list(source.columns)
+
+        # Keep mappings that still point at a column of this sheet
+        sheet_columns = {str(col) for col in self.excel_columns}
+        for child in self.mapping_tree.get_children():
+            values = self.mapping_tree.item(child)['values']
+            if str(values[1]) in sheet_columns:
+                self.mapping_tree.item(child, values=self.mapping_values(values[0], values[1]))
+            else:
+                self.mapping_tree.delete(child)
+        if source.is_projected:
+            self.log(get_text("columns_projected", self.current_language).format(len(self.excel_data.columns), len(self.excel_columns)))
+
+        # Update preview
+        cols_text = ', '.join(self.excel_columns[:5]) + (' ...' if len(self.excel_columns) > 5 else '')
+        self.data_preview.config(
+            text=get_text("sheet_info", self.current_language).format(sheet_name, source.row_count, cols_text),
+            foreground="green"
+        )
 
-        except Exception as e:
-            self.data_preview.config(text=get_text("error_loading_sheet", self.current_language).format(str(e)), foreground="red")
-            messagebox.showerror(get_text("error", self.current_language), get_text("error_loading_sheet", self.current_language).format(str(e)))
-            self.log(get_text("error_loading_sheet", self.current_language).format(str(e)))
+        self.log(get_text("sheet_loaded", self.current_language).format(sheet_name, source.row_count, len(self.excel_columns)))
+        self.update_status(f"Sheet '{sheet_name}' loaded successfully")
+
+        # Update row selection max values; this also recounts filter matches
+        if hasattr(self, 'to_row'):
+            self.to_row.set(source.row_count)
+
+    def on_sheet_load_error(self, error):
+        self.finish_load_task()
+        self.data_preview.config(text=get_text("error_loading_sheet", self.current_language).format(str(error)), foreground="red")
+        messagebox.showerror(get_text("error", self.current_language), get_text("error_loading_sheet", self.current_language).format(str(error)))
+        self.log(get_text("error_loading_sheet", self.current_language).format(str(error)))
+
+    def start_load_task(self, name, func, *args, on_done, on_error):
+        """Run a loading job on the worker pool, replacing any job still in progress"""
+        if self.load_task is not None:
+            self.load_task.cancel()
+        self.load_task = self.task_runner.submit(
+            name, func, *args,
+            on_done=on_done, on_error=on_error,
+            on_progress=self.on_load_progress, on_cancel=self.on_load_cancelled
+        )
+        self.load_progress.start(15)
+        self.cancel_load_btn.config(state=tk.NORMAL)
+        self.update_status("Loading...")
+
+    def finish_load_task(self):
+        self.load_task = None
+        self.load_progress.stop()
+        self.cancel_load_btn.config(state=tk.DISABLED)
+
+    def on_load_progress(self, message):
+        self.data_preview.config(text=message, foreground="orange")
+
+    def on_load_cancelled(self):
+        # A replaced job is cancelled too; only reset the UI if nothing else is loading
+        if self.load_task is not None and self.load_task.cancelled:
+            self.finish_load_task()
+            self.data_preview.config(text=get_text("load_cancelled", self.current_language), foreground="gray")
+            self.update_status("Loading cancelled")
+
+    def cancel_loading(self):
+        if self.load_task is not None:
+            # Reset the UI now; the worker stops reading in the background
+            self.load_task.cancel()
+            self.on_load_cancelled()
+            self.log(get_text("load_cancelled", self.current_language))
+
+    def clear_sheet_cache(self):
+        """Remove all cached sheets so the next load re-parses the workbook"""
+        removed = self.sheet_cache.invalidate()
+        self.log(get_text("sheet_cache_cleared", self.current_language).format(removed))
+        self.update_status(f"Sheet cache cleared: {removed} entries removed")
 
     def add_column_mapping(self):
         lang = self.current_language
@@ -387,17 +726,120 @@ class AutomationGUI:
             messagebox.showwarning(get_text("warning", lang), get_text("load_excel_first", lang))
             return
 
-        dialog = ColumnMappingDialog(self.root, self.excel_columns, self.excel_data, lang)
+        dialog = ColumnMappingDialog(self.root, self.excel_columns, self.excel_data, lang,
+                                     variables=list(self.get_column_mappings()), sheets=self.lookup_sheets(),
+                                     read_header=self.read_lookup_header)
         self.root.wait_window(dialog.dialog)  # Wait for dialog to close
         if dialog.result:
-            var_name, excel_col = dialog.result
-            sample_data = str(self.excel_data[excel_col].iloc[0]) if not self.excel_data.empty else "N/A"
-            self.mapping_tree.insert("", tk.END, values=(var_name, excel_col, sample_data))
+            var_name, excel_col, rules, transforms, lookup = dialog.result
+            self.mapping_rules[var_name] = rules
+            self.mapping_transforms[var_name] = transforms
+            self.mapping_lookups[var_name] = lookup
+            self.mapping_tree.insert("", tk.END, values=self.mapping_values(var_name, excel_col))
             self.log(get_text("added_mapping", lang).format(var_name, excel_col))
+            if self.row_source.missing_columns([excel_col]):
+                self.load_missing_columns()
+
+    def edit_column_mapping(self):
+        """Change the selected mapping's variable, column, lookup, format or validation rules"""
+        selected = self.mapping_tree.selection()
+        if not selected or not self.excel_columns:
+            return
+        var_name, excel_col = self.mapping_tree.item(selected[0])['values'][:2]
+        dialog = ColumnMappingDialog(self.root, self.excel_columns, self.excel_data, self.current_language,
+                                     initial=(var_name, excel_col, self.mapping_rules.get(var_name, {}),
+                                              self.mapping_transforms.get(var_name, {}),
+                                              self.mapping_lookups.get(var_name, {})),
+                                     variables=list(self.get_column_mappings()), sheets=self.lookup_sheets(),
+                                     read_header=self.read_lookup_header)
+        self.root.wait_window(dialog.dialog)
+        if dialog.result:
+            new_name, new_col, rules, transforms, lookup = dialog.result
+            self.mapping_rules.pop(var_name, None)
+            self.mapping_transforms.pop(var_name, None)
+            self.mapping_lookups.pop(var_name, None)
+            self.mapping_rules[new_name] = rules
+            self.mapping_transforms[new_name] = transforms
+            self.mapping_lookups[new_name] = lookup
+            self.mapping_tree.item(selected[0], values=self.mapping_values(new_name, new_col))
+            if self.row_source.missing_columns([new_col]):
+                self.load_missing_columns()
+
+    def mapping_values(self, var_name, excel_col):
+        """Row shown in the mapping tree: variable, column, formatted sample, lookup and format, rules"""
+        transforms = self.mapping_transforms.get(var_name, {})
+        lookup = self.mapping_lookups.get(var_name)
+        # The sample of a looked-up mapping is its key, so it is shown unformatted
+        sample = self.sample_value(excel_col, None if lookup else transforms.get("format"))
+        return (var_name, excel_col, sample, transforms_text(transforms, lookup),
+                rules_text(self.mapping_rules.get(var_name), self.current_language))
+
+    def mapping_settings(self, mappings):
+        """Validation rules and compiled value transforms for a run over mappings
+
+        Lookup sheets are only read when the transforms are first applied,
+        which happens on the worker thread preparing the run.
+        """
+        rules = {variable: self.mapping_rules[variable] for variable in mappings if self.mapping_rules.get(variable)}
+        lookups = LookupTables(self.current_file_path, {variable: self.mapping_lookups.get(variable)
+                                                        for variable in mappings},
+                               read=self.read_lookup_sheet)
+        transforms = ValueTransforms(mappings, {variable: self.mapping_transforms[variable] for variable in mappings
+                                                if self.mapping_transforms.get(variable)}, lookups)
+        return rules, transforms
+
+    def lookup_sheets(self):
+        """Sheets of the workbook a mapping can look its values up in"""
+        return [sheet for sheet in self.excel_sheets if sheet != self.current_sheet]
+
+    def read_lookup_header(self, sheet_name):
+        columns = self.sheet_cache.header(self.current_file_path, sheet_name)
+        return columns if columns is not None else read_sheet_header(self.current_file_path, sheet_name)
+
+    def read_lookup_sheet(self, file_path, sheet_name, columns):
+        """Parse the key and value columns of a lookup sheet, from the sheet cache when it has them"""
+        data = self.sheet_cache.load(file_path, sheet_name, columns)
+        return data if data is not None else read_sheet_columns(file_path, sheet_name, columns)
+
+    def sample_value(self, excel_col, value_format=None):
+        """Return the first value of a column for display, or a placeholder"""
+        if self.excel_data is None or self.excel_data.empty:
+            return "N/A"
+        if excel_col not in self.excel_data.columns:
+            return "..."  # Not parsed yet, filled in by load_missing_columns
+        return format_sample(self.excel_data[excel_col], value_format)
+
+    def load_missing_columns(self):
+        """Parse mapped columns left out by a projected load, in the background"""
+        source = self.row_source
+        columns = list(self.get_column_mappings().values())
+
+        def on_done(changed):
+            if source is not self.row_source or not changed:
+                return
+            self.excel_data = source.preview()
+            for child in self.mapping_tree.get_children():
+                values = self.mapping_tree.item(child)['values']
+                self.mapping_tree.item(child, values=self.mapping_values(values[0], values[1]))
+
+        self.task_runner.submit("columns", lambda task: source.ensure_columns(columns),
+                                on_done=on_done, on_error=self.on_sheet_load_error)
+
+    def get_column_mappings(self):
+        """Return the variable -> Excel column mappings from the mapping tree"""
+        mappings = {}
+        for child in self.mapping_tree.get_children():
+            values = self.mapping_tree.item(child)['values']
+            mappings[values[0]] = values[1]
+        return mappings
 
     def remove_column_mapping(self):
         selected = self.mapping_tree.selection()
         if selected:
+            variable = self.mapping_tree.item(selected[0])['values'][0]
+            self.mapping_rules.pop(variable, None)
+            self.mapping_transforms.pop(variable, None)
+            self.mapping_lookups.pop(variable, None)
             self.mapping_tree.delete(selected[0])
 
     def on_action_type_change(self, event):
@@ -417,7 +859,8 @@ class AutomationGUI:
             get_text("type_text", lang): "Type Text",
             get_text("key_press", lang): "Key Press",
             get_text("wait", lang): "Wait",
-            get_text("move_mouse", lang): "Move Mouse"
+            get_text("move_mouse", lang): "Move Mouse",
+            get_text("wait_stable", lang): "Wait Until Stable"
         }
         action_type_en = action_map.get(action_type, action_type)
 
@@ -453,6 +896,12 @@ class AutomationGUI:
             # Set default
             self.current_params['text_source'].set(get_text("fixed_text", lang))
 
+            # Keystrokes or clipboard paste; 'default' follows the Execute tab setting
+            ttk.Label(self.params_frame, text=get_text("input_mode", lang)).grid(row=row, column=4, padx=5, sticky=tk.W)
+            self.current_params['input_mode'] = ttk.Combobox(self.params_frame, values=INPUT_MODES, state="readonly", width=8)
+            self.current_params['input_mode'].grid(row=row, column=5, padx=5)
+            self.current_params['input_mode'].set("default")
+
         elif action_type_en == "Key Press":
             ttk.Label(self.params_frame, text=get_text("key", lang)).grid(row=row, column=0, padx=5, sticky=tk.W)
             self.current_params['key'] = ttk.Combobox(self.params_frame, values=[
@@ -480,6 +929,36 @@ class AutomationGUI:
             capture_btn.grid(row=row, column=4, padx=5)
             create_tooltip(capture_btn, "Click to capture mouse coordinates (3-second countdown)")
 
+        elif action_type_en == "Wait Until Stable":
+            # Watched region: top-left corner (capturable) plus size
+            ttk.Label(self.params_frame, text="X:").grid(row=row, column=0, padx=5, sticky=tk.W)
+            self.current_params['x'] = tk.IntVar()
+            ttk.Entry(self.params_frame, textvariable=self.current_params['x'], width=10).grid(row=row, column=1, padx=5)
+
+            ttk.Label(self.params_frame, text="Y:").grid(row=row, column=2, padx=5, sticky=tk.W)
+            self.current_params['y'] = tk.IntVar()
+            ttk.Entry(self.params_frame, textvariable=self.current_params['y'], width=10).grid(row=row, column=3, padx=5)
+
+            capture_btn = ttk.Button(self.params_frame, text=f"{ICONS['capture']} {get_text('capture', lang)}",
+                                    command=self.capture_coords_for_action, style="Secondary.TButton")
+            capture_btn.grid(row=row, column=4, padx=5)
+            create_tooltip(capture_btn, "Capture the top-left corner of the region to watch (3-second countdown)")
+
+            row += 1
+            ttk.Label(self.params_frame, text=get_text("width", lang)).grid(row=row, column=0, padx=5, sticky=tk.W)
+            self.current_params['width'] = tk.IntVar(value=200)
+            ttk.Entry(self.params_frame, textvariable=self.current_params['width'], width=10).grid(row=row, column=1, padx=5)
+
+            ttk.Label(self.params_frame, text=get_text("height", lang)).grid(row=row, column=2, padx=5, sticky=tk.W)
+            self.current_params['height'] = tk.IntVar(value=100)
+            ttk.Entry(self.params_frame, textvariable=self.current_params['height'], width=10).grid(row=row, column=3, padx=5)
+
+            row += 1
+            ttk.Label(self.params_frame, text=get_text("timeout_s", lang)).grid(row=row, column=0, padx=5, sticky=tk.W)
+            self.current_params['timeout'] = tk.DoubleVar(value=5.0)
+            timeout_entry = ttk.Entry(self.params_frame, textvariable=self.current_params['timeout'], width=10)
+            timeout_entry.grid(row=row, column=1, padx=5)
+            create_tooltip(timeout_entry, "Continue after this many seconds even if the region keeps changing")
 
         # Delay parameter (common to all actions)
         row += 1
@@ -521,7 +1000,8 @@ class AutomationGUI:
             get_text("type_text", lang): "Type Text",
             get_text("key_press", lang): "Key Press",
             get_text("wait", lang): "Wait",
-            get_text("move_mouse", lang): "Move Mouse"
+            get_text("move_mouse", lang): "Move Mouse",
+            get_text("wait_stable", lang): "Wait Until Stable"
         }
         action_type_en = action_map.get(action_type, action_type)
 
@@ -636,7 +1116,7 @@ class AutomationGUI:
         countdown = [3]  # Use list to modify in nested function
 
         def update_display():
-            x, y = pyautogui.position()
+            x, y = self.backend.position()
             coord_display.config(text=get_text("current_position", lang).format(x, y))
 
             if countdown[0] > 0:
@@ -645,7 +1125,7 @@ class AutomationGUI:
                 capture_window.after(1000, update_display)
             else:
                 # Capture coordinates
-                final_x, final_y = pyautogui.position()
+                final_x, final_y = self.backend.position()
 
                 # Update the action parameters
                 if hasattr(self, 'current_params') and 'x' in self.current_params:
@@ -661,7 +1141,7 @@ class AutomationGUI:
                 capture_window.after(1000, capture_window.destroy)
 
         def start_fast_update():
-            x, y = pyautogui.position()
+            x, y = self.backend.position()
             coord_display.config(text=get_text("current_position", lang).format(x, y))
             if countdown[0] > 0:
                 capture_window.after(50, start_fast_update)
@@ -674,12 +1154,69 @@ class AutomationGUI:
 
     def toggle_row_selection(self):
         # Enable/disable row range inputs based on "All rows" checkbox
-        pass
+        state = tk.DISABLED if self.process_all.get() else tk.NORMAL
+        self.from_entry.config(state=state)
+        self.to_entry.config(state=state)
+
+    def row_range(self):
+        """Return the [start, end) row range selected on the Execute tab"""
+        row_count = self.row_source.row_count
+        if self.process_all.get():
+            return 0, row_count
+        return max(self.from_row.get() - 1, 0), min(self.to_row.get(), row_count)
+
+    def schedule_filter_count(self, delay_ms=300):
+        """Recount matching rows once typing pauses"""
+        if self.filter_after is not None:
+            self.root.after_cancel(self.filter_after)
+        self.filter_after = self.root.after(delay_ms, self.update_filter_count)
+
+    def update_filter_count(self):
+        """Count the rows matching the filter in the background and show the result"""
+        self.filter_after = None
+        if self.filter_task is not None:
+            self.filter_task.cancel()
+            self.filter_task = None
+        expression = self.row_filter.get().strip()
+        if not expression or self.row_source is None:
+            self.filter_count_label.config(text="")
+            return
+        try:
+            start_row, end_row = self.row_range()
+        except tk.TclError:
+            return  # Range being edited
+
+        lang = self.current_language
+        source = self.row_source
+
+        def count(task):
+            # Streaming sheets are scanned in batches; a newer count cancels this one
+            return len(matching_rows(source, expression, start_row, end_row,
+                                     progress=lambda rows: task.check_cancelled()))
+
+        def on_done(matches):
+            self.filter_task = None
+            self.filter_count_label.config(
+                text=get_text("filter_matches", lang).format(matches, max(end_row - start_row, 0)), foreground="green")
+
+        def on_error(error):
+            self.filter_task = None
+            self.filter_count_label.config(text=get_text("invalid_filter", lang).format(str(error)), foreground="red")
+
+        self.filter_count_label.config(text=get_text("counting_rows", lang), foreground="gray")
+        self.filter_task = self.task_runner.submit("filter", count, on_done=on_done, on_error=on_error)
 
     def save_preset(self):
+        mappings = [self.mapping_tree.item(child)['values'][:3] for child in self.mapping_tree.get_children()]
         preset_data = {
             'automation_steps': self.automation_steps,
-            'column_mappings': [self.mapping_tree.item(child)['values'] for child in self.mapping_tree.get_children()]
+            'column_mappings': mappings,
+            'mapping_rules': {mapping[0]: self.mapping_rules[mapping[0]] for mapping in mappings
+                              if self.mapping_rules.get(mapping[0])},
+            'mapping_transforms': {mapping[0]: self.mapping_transforms[mapping[0]] for mapping in mappings
+                                   if self.mapping_transforms.get(mapping[0])},
+            'mapping_lookups': {mapping[0]: self.mapping_lookups[mapping[0]] for mapping in mappings
+                                if self.mapping_lookups.get(mapping[0])}
         }
 
         filename = filedialog.asksaveasfilename(
@@ -715,10 +1252,18 @@ class AutomationGUI:
                     params_text = ", ".join([f"{k}={v}" for k, v in step['params'].items()])
                     self.steps_tree.insert("", tk.END, values=(i + 1, step['action'], params_text, step['delay']))
 
-                # Load column mappings
+                # Load column mappings with their formats and validation rules
+                self.mapping_rules = {variable: normalize_rules(rules)
+                                      for variable, rules in preset_data.get('mapping_rules', {}).items()}
+                self.mapping_transforms = {variable: normalize_transforms(transforms)
+                                           for variable, transforms in preset_data.get('mapping_transforms', {}).items()}
+                self.mapping_lookups = {variable: normalize_lookup(lookup)
+                                        for variable, lookup in preset_data.get('mapping_lookups', {}).items()}
                 self.mapping_tree.delete(*self.mapping_tree.get_children())
                 for mapping in preset_data.get('column_mappings', []):
-                    self.mapping_tree.insert("", tk.END, values=mapping)
+                    transforms = self.mapping_transforms.get(mapping[0], {})
+                    self.mapping_tree.insert("", tk.END, values=tuple(mapping[:3]) + (
+                        transforms_text(transforms, self.mapping_lookups.get(mapping[0])), rules_text(self.mapping_rules.get(mapping[0]), self.current_language)))
 
                 self.log(get_text("preset_loaded", self.current_language).format(filename))
                 messagebox.showinfo(get_text("success", self.current_language), get_text("preset_load_success", self.current_language))
@@ -727,27 +1272,158 @@ class AutomationGUI:
 
     def start_automation(self):
         lang = self.current_language
+        if self.running:
+            return
         if not self.automation_steps:
             show_notification(self.root, get_text("no_automation_steps", lang), "warning")
             return
 
-        if self.excel_data is None:
+        if self.row_source is None:
             show_notification(self.root, get_text("no_excel_data", lang), "warning")
             return
 
+        # Read Tk state on this thread; the run itself never touches the widgets' data
+        mappings = self.get_column_mappings()
+        try:
+            start_row, end_row = self.row_range()
+        except tk.TclError:
+            show_notification(self.root, get_text("invalid_row_range", lang), "warning")
+            return
+        row_filter = self.row_filter.get().strip() or None
+        try:
+            rules, transforms = self.mapping_settings(mappings)
+        except ValueError as e:
+            messagebox.showerror(get_text("error", lang), get_text("invalid_transforms", lang).format(str(e)))
+            return
+
+        # Validate and pre-bind every step before the first row; all its waits
+        # go through the run's control so Stop and Pause act immediately
+        control = RunControl()
+        try:
+            input_mode = "paste" if self.paste_text.get() else "type"
+            plan = compile_plan(self.automation_steps, variable_slots(mappings), self.backend,
+                                self.paster_for(self.automation_steps, input_mode),
+                                input_mode, control.sleep)
+        except PlanError as e:
+            messagebox.showerror(get_text("error", lang), get_text("invalid_steps", lang).format(str(e)))
+            self.log(get_text("invalid_steps", lang).format(str(e)))
+            return
+
+        try:
+            policy = ErrorPolicy(self.retries.get(), self.backoff.get(),
+                                 on_failure=self.error_actions[self.on_row_error.get()],
+                                 max_consecutive=self.max_consecutive.get())
+        except (tk.TclError, ValueError) as e:
+            messagebox.showerror(get_text("error", lang), str(e))
+            return
+
+        # Resume from the checkpoint journal of an interrupted run
+        resume = self.open_journal(mappings, rules, transforms, start_row, end_row)
+        if resume is None:
+            return
+        journal, start_row, skip_rows = resume
+
+        stats = RunStats(plan)
+        self.show_run_stats(stats)
+        failures = FailureLog()
+
+        def progress(done, total):
+            self.ui_events.post("stats", stats)
+            self.ui_events.post("progress", done, total)
+
+        self.runner = AutomationRunner(plan, self.row_source, mappings, start_row, end_row, journal, skip_rows,
+                                       stats, log=self.log, progress=progress, lang=lang,
+                                       policy=policy, failures=failures, control=control,
+                                       row_filter=row_filter, rules=rules, transforms=transforms)
+
+        # The target app has the focus during a run, so also listen system-wide
+        self.stop_hotkey = GlobalHotkey(DEFAULT_STOP_HOTKEY, self.emergency_stop)
+        if self.stop_hotkey.start():
+            self.log(get_text("stop_hotkey_active", lang).format(DEFAULT_STOP_HOTKEY))
+        else:
+            self.log(get_text("stop_hotkey_unavailable", lang).format(self.stop_hotkey.error))
+
         self.running = True
+        self.pause_btn.config(text=get_text("pause", lang))
         self.update_status("Automation running...")
         show_notification(self.root, "Automation started", "success")
-        thread = threading.Thread(target=self.run_automation)
+        thread = threading.Thread(target=self.run_automation, args=(self.runner, stats, failures))
         thread.daemon = True
         thread.start()
 
+    def open_journal(self, mappings, rules, transforms, start_row, end_row):
+        """Open the run's checkpoint journal, offering to resume an interrupted run
+
+        The workbook hash is the one taken when the sheet was loaded.
+        Returns (journal, start_row, rows to skip), or None if the operator
+        cancelled the run.
+        """
+        lang = self.current_language
+        workbook_hash = self.workbook_hash
+        digest = preset_hash(self.automation_steps, mappings, rules, transforms.settings,
+                             transforms.lookups.lookups)
+        journal = RunJournal(journal_path(workbook_hash, self.current_sheet, digest), {
+            "workbook": os.path.abspath(self.current_file_path),
+            "sheet": self.current_sheet,
+            "workbook_hash": workbook_hash,
+            "preset_hash": digest,
+        })
+
+        completed = journal.completed()
+        done = sum(1 for row_idx in completed if start_row <= row_idx < end_row)
+        if not done:
+            return journal.open(), start_row, set()
+
+        resume_row = first_incomplete(start_row, end_row, completed)
+        if resume_row is None:
+            # Every row of the range went through already: only re-run on request
+            if not messagebox.askyesno(get_text("resume_run", lang), get_text("all_rows_completed", lang).format(done)):
+                return None
+            return journal.open(reset=True), start_row, set()
+
+        if messagebox.askyesno(get_text("resume_run", lang), get_text("resume_from_row", lang).format(done, resume_row + 1)):
+            self.log(get_text("resuming_at_row", lang).format(resume_row + 1))
+            return journal.open(), resume_row, completed
+        return journal.open(reset=True), start_row, set()
+
     def stop_automation(self):
         self.running = False
+        if self.runner is not None:
+            self.runner.stop()
         self.log(get_text("automation_stopped", self.current_language))
         self.update_status("Automation stopped")
         show_notification(self.root, "Automation stopped", "info")
 
+    def on_close(self):
+        """Window closed: stop any run and cancel background work instead of waiting for it"""
+        if self.runner is not None:
+            self.runner.stop()
+        self.task_runner.shutdown()
+        self.root.destroy()
+
+    def emergency_stop(self):
+        """Hotkey thread: stop the run at once, then update the UI on the Tk thread"""
+        runner = self.runner
+        if runner is not None:
+            runner.stop()
+        self.ui_events.post("emergency_stop")
+
+    def toggle_pause(self):
+        runner = self.runner
+        if runner is None or not self.running:
+            return
+        lang = self.current_language
+        if runner.paused:
+            runner.resume()
+            self.pause_btn.config(text=get_text("pause", lang))
+            self.log(get_text("automation_resumed", lang))
+            self.update_status("Automation running...")
+        else:
+            runner.pause()
+            self.pause_btn.config(text=get_text("resume", lang))
+            self.log(get_text("automation_paused", lang))
+            self.update_status("Automation paused")
+
     def test_single_step(self):
         lang = self.current_language
         selected = self.steps_tree.selection()
@@ -759,95 +1435,184 @@ class AutomationGUI:
         step = self.automation_steps[index]
 
         try:
-            self.execute_step(step, 0)  # Test with first row data
+            # Test with first row data
+            values, slots = (), {}
+            if self.row_source is not None:
+                mappings = self.get_column_mappings()
+                self.row_source.ensure_columns(mappings.values())
+                _, transforms = self.mapping_settings(mappings)
+                table = prepare_variables(self.row_source, mappings, 0, 1, transforms=transforms)
+                slots = table.slots
+                _, values = next(table.iter_rows(), (0, ()))
+            self.execute_step(step, values, slots)
             self.log(get_text("test_completed", lang).format(step['action']))
         except Exception as e:
             messagebox.showerror(get_text("error", lang), get_text("test_failed", lang).format(str(e)))
             self.log(get_text("test_failed", lang).format(str(e)))
 
-    def run_automation(self):
-        start_row = 0 if self.process_all.get() else self.from_row.get() - 1
-        end_row = len(self.excel_data) if self.process_all.get() else self.to_row.get()
-
-        total_rows = end_row - start_row
-        self.progress.config(maximum=total_rows)
-
-        for row_idx in range(start_row, min(end_row, len(self.excel_data))):
-            if not self.running:
-                break
-
-            self.log(get_text("processing_row", self.current_language).format(row_idx + 1))
-
-            try:
-                for step in self.automation_steps:
-                    if not self.running:
-                        break
-                    self.execute_step(step, row_idx)
-                    time.sleep(step['delay'])
-
-                self.progress['value'] = row_idx - start_row + 1
-                self.root.update_idletasks()
-
-            except Exception as e:
-                self.log(get_text("error_in_row", self.current_language).format(row_idx + 1, str(e)))
-                if messagebox.askyesno(get_text("error", self.current_language), get_text("continue_next_row", self.current_language).format(row_idx + 1, str(e))):
-                    continue
-                else:
-                    break
+    def validate_data(self):
+        """Check the selected rows against the mapping rules in the background and list rejected ones"""
+        lang = self.current_language
+        if self.row_source is None:
+            show_notification(self.root, get_text("no_excel_data", lang), "warning")
+            return
+        mappings = self.get_column_mappings()
+        try:
+            rules, transforms = self.mapping_settings(mappings)
+        except ValueError as e:
+            messagebox.showerror(get_text("error", lang), get_text("invalid_transforms", lang).format(str(e)))
+            return
+        if not rules:
+            show_notification(self.root, get_text("no_validation_rules", lang), "info")
+            return
+        try:
+            start_row, end_row = self.row_range()
+        except tk.TclError:
+            show_notification(self.root, get_text("invalid_row_range", lang), "warning")
+            return
+        row_filter = self.row_filter.get().strip() or None
+        source = self.row_source
+
+        def validate(task):
+            selected = matching_rows(source, row_filter, start_row, end_row) if row_filter else None
+            return validate_rows(source, mappings, rules, start_row, end_row, selected, transforms=transforms)
+
+        def on_done(report):
+            summary = get_text("validation_summary", lang).format(report.checked, len(report.rejected), report.elapsed)
+            self.log(summary)
+            self.update_status(summary)
+            rejected = report.rejected.tolist()
+            lines = [summary, ""] + report.summary() + [""]
+            lines += [get_text("row_rejected", lang).format(row_idx + 1, report.reason(row_idx))
+                      for row_idx in rejected[:REJECTED_ROWS_SHOWN]]
+            if len(rejected) > REJECTED_ROWS_SHOWN:
+                lines.append(get_text("more_rejected_rows", lang).format(len(rejected) - REJECTED_ROWS_SHOWN))
+            self.show_log_results(get_text("validate_data", lang), lines)
+
+        def on_error(error):
+            key = "invalid_filter" if isinstance(error, FilterError) else "error_loading_sheet"
+            messagebox.showerror(get_text("error", lang), get_text(key, lang).format(str(error)))
+
+        self.update_status("Validating rows...")
+        self.task_runner.submit("validate", validate, on_done=on_done, on_error=on_error)
+
+    def run_automation(self, runner, stats, failures):
+        # Runs on a worker thread: all UI updates go through self.ui_events
+        lang = self.current_language
+        try:
+            result = runner.run()
+        except FilterError as e:
+            self.log(get_text("invalid_filter", lang).format(str(e)))
+            self.ui_events.post("status", "Automation failed")
+            return
+        except Exception as e:
+            self.log(get_text("error_loading_sheet", lang).format(str(e)))
+            self.ui_events.post("status", "Automation failed")
+            return
+        finally:
+            self.running = False
+            self.stop_hotkey.stop()
+            self.restore_clipboard()
+
+        self.export_run_stats(stats)
+        if failures.count:
+            self.log(get_text("failures_saved", lang).format(failures.count, failures.path))
+
+        counts = (result.completed, result.failed, result.rejected)
+        if result.stopped:
+            # Stop already showed its notification
+            self.log(get_text("run_outcome_stopped", lang).format(*counts))
+            self.ui_events.post("status", "Automation stopped")
+        elif result.aborted:
+            self.log(get_text("run_outcome_aborted", lang).format(*counts))
+            self.ui_events.post("status", "Automation aborted")
+            self.ui_events.post("notify", f"Automation aborted after {result.failed} failed row(s)", "error")
+        elif result.failed or result.rejected:
+            self.log(get_text("run_outcome_errors", lang).format(*counts))
+            self.ui_events.post("status", "Automation completed with errors")
+            self.ui_events.post("notify", f"Automation completed: {result.failed} failed, "
+                                          f"{result.rejected} rejected", "warning")
+        else:
+            self.log(get_text("automation_completed", lang))
+            self.ui_events.post("status", "Automation completed successfully")
+            self.ui_events.post("notify", "Automation completed!", "success")
 
-        self.running = False
-        self.log(get_text("automation_completed", self.current_language))
-        self.update_status("Automation completed successfully")
-        show_notification(self.root, "Automation completed!", "success")
-
-    def execute_step(self, step, row_idx):
-        action = step['action']
-        params = step['params']
-
-        if action == "Click":
-            pyautogui.click(params['x'], params['y'])
-
-        elif action == "Double Click":
-            pyautogui.doubleClick(params['x'], params['y'])
-
-        elif action == "Right Click":
-            pyautogui.rightClick(params['x'], params['y'])
-
-        elif action == "Type Text":
-            text_source = params.get('text_source', 'Fixed Text')
-
-            if text_source == "Excel Data":
-                # Find the Excel data for this variable
-                variable_name = params['text']
-                for child in self.mapping_tree.get_children():
-                    values = self.mapping_tree.item(child)['values']
-                    if values[0] == variable_name:
-                        excel_col = values[1]
-                        text_to_type = str(self.excel_data.iloc[row_idx][excel_col])
-                        pyautogui.write(text_to_type)
-                        break
-            else:
-                # Fixed text
-                pyautogui.write(params['text'])
+    def execute_step(self, step, values=(), slots=None):
+        """Run one step; values holds the row's variable strings indexed by slots"""
+        input_mode = "paste" if self.paste_text.get() else "type"
+        try:
+            compile_step(step, 0, slots or {}, self.backend, self.paster_for([step], input_mode),
+                         input_mode).run(values)
+        finally:
+            self.restore_clipboard()
+
+    def log(self, message, row=None):
+        """Queue a log line; safe to call from any thread"""
+        now = datetime.now()
+        self.run_log.write(message, row, now)
+        self.ui_events.post("log", f"[{now:%H:%M:%S}] {message}")
+
+    def append_log_lines(self, batch):
+        # One insert and one scroll per frame, however many lines arrived
+        self.log_text.insert(tk.END, "".join(f"{line}\n" for line, in batch))
+
+        # Keep only the most recent lines in the widget; the file has the rest
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if line_count > WIDGET_MAX_LINES:
+            self.log_text.delete('1.0', f'{line_count - WIDGET_MAX_LINES + 1}.0')
+        self.log_text.see(tk.END)
 
-        elif action == "Key Press":
-            if '+' in params['key']:
-                keys = params['key'].split('+')
-                pyautogui.hotkey(*keys)
-            else:
-                pyautogui.press(params['key'])
+    def search_log(self):
+        text = self.log_search.get().strip()
+        if text:
+            self.task_runner.submit("search", lambda task: self.run_log.search(text),
+                                    on_done=lambda lines: self.show_log_results(get_text("search_results", self.current_language).format(text), lines))
 
-        elif action == "Wait":
-            time.sleep(params['seconds'])
+    def jump_to_log_row(self):
+        try:
+            row = self.log_jump_row.get()
+        except tk.TclError:
+            return
+        self.task_runner.submit("search", lambda task: self.run_log.row_lines(row),
+                                on_done=lambda lines: self.show_log_results(get_text("row_log", self.current_language).format(row), lines))
 
-        elif action == "Move Mouse":
-            pyautogui.moveTo(params['x'], params['y'])
+    def show_log_results(self, title, lines):
+        """Show lines (log search results, a validation report) in a separate window"""
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.geometry("800x400")
 
-    def log(self, message):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        results = tk.Text(window, wrap=tk.NONE)
+        if hasattr(self, 'text_config'):
+            results.configure(**self.text_config)
+        scrollbar = ttk.Scrollbar(window, orient=tk.VERTICAL, command=results.yview)
+        results.configure(yscrollcommand=scrollbar.set)
+        results.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        results.insert(tk.END, "\n".join(lines) if lines else get_text("no_log_matches", self.current_language))
+        results.config(state=tk.DISABLED)
+
+    def set_progress(self, value, maximum):
+        self.progress.config(maximum=maximum, value=value)
+
+    def show_run_stats(self, stats):
+        self.rows_per_minute_label.config(text=get_text("rows_per_minute", self.current_language).format(stats.rows_per_minute()))
+        self.stats_tree.delete(*self.stats_tree.get_children())
+        for record in stats.summary():
+            self.stats_tree.insert('', 'end', values=(
+                record["step"], record["action"], record["runs"],
+                *(f"{record[key] * 1000:.1f}" for key in ("action_p50", "action_p95", "action_max", "delay_p50", "overhead_p50"))))
+
+    def export_run_stats(self, stats):
+        """Worker: save the finished run's step statistics as JSON and CSV"""
+        self.ui_events.post("stats", stats)
+        try:
+            json_path, csv_path = stats.export()
+        except OSError as e:
+            self.log(f"{get_text('error', self.current_language)}: {e}")
+            return
+        self.log(get_text("stats_exported", self.current_language).format(f"{json_path}, {csv_path}"))
 
     def load_language_preference(self):
         """Load saved language preference from file"""
@@ -1049,14 +1814,62 @@ DataFlow Solutions"""
         messagebox.showinfo("About", about_text)
 
 
+def rules_text(rules, lang):
+    """Short description of a mapping's validation rules for the mapping tree"""
+    if not rules:
+        return ""
+    parts = []
+    if rules.get("required"):
+        parts.append(get_text("rule_required", lang))
+    if "max_length" in rules:
+        parts.append(f"\u2264 {rules['max_length']}")
+    if "pattern" in rules:
+        parts.append(f"/{rules['pattern']}/")
+    if "min" in rules or "max" in rules:
+        parts.append(f"{rules.get('min', float('-inf')):g} .. {rules.get('max', float('inf')):g}")
+    if "date_format" in rules:
+        parts.append(rules["date_format"])
+    return ", ".join(parts)
+
+
+def transforms_text(transforms, lookup=None):
+    """Short description of a mapping's lookup, format and template for the mapping tree"""
+    parts = [lookup_text(lookup)] if lookup else []
+    if transforms.get("format"):
+        parts.append(transforms["format"])
+    if transforms.get("template"):
+        parts.append(f"= {transforms['template']}")
+    return ", ".join(parts)
+
+
+def format_sample(values, value_format=None):
+    """First value of a column as it would be typed with value_format applied"""
+    if value_format:
+        try:
+            return str(compile_format(value_format)(values.iloc[:1]).iloc[0])
+        except ValueError:
+            pass  # Shown unformatted until the format is fixed
+    return str(values.iloc[0])
+
+
 class ColumnMappingDialog:
-    def __init__(self, parent, excel_columns, excel_data, lang="en"):
+    def __init__(self, parent, excel_columns, excel_data, lang="en", initial=None, variables=(), sheets=(),
+                 read_header=None):
+        """initial, when editing a mapping, is its (variable, column, rules, transforms, lookup)
+
+        variables are the names already mapped, which a template may use;
+        sheets are the other sheets of the workbook, whose columns
+        read_header(sheet) returns, for a lookup.
+        """
         self.result = None
         self.lang = lang
+        self.variables = list(variables)
+        self.read_header = read_header
+        self.lookup_columns = []
 
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(get_text("add_column_mapping", lang))
-        self.dialog.geometry("400x200")
+        self.dialog.geometry("440x650")
         self.dialog.transient(parent)
         self.dialog.grab_set()
 
@@ -1080,22 +1893,143 @@ class ColumnMappingDialog:
 
         self.excel_col.bind('<<ComboboxSelected>>', lambda e: self.update_preview(excel_data))
 
+        # Lookup: the column holds a key whose value is taken from another sheet
+        lookup_frame = ttk.LabelFrame(self.dialog, text=get_text("lookup", self.lang))
+        lookup_frame.grid(row=3, column=0, columnspan=2, padx=10, pady=5, sticky=tk.EW)
+
+        ttk.Label(lookup_frame, text=get_text("lookup_sheet", self.lang)).grid(row=0, column=0, padx=5, pady=3, sticky=tk.W)
+        self.lookup_sheet = ttk.Combobox(lookup_frame, values=[""] + list(sheets), state="readonly", width=18)
+        self.lookup_sheet.grid(row=0, column=1, columnspan=3, padx=5, pady=3, sticky=tk.W)
+        self.lookup_sheet.bind('<<ComboboxSelected>>', lambda e: self.update_lookup_columns())
+
+        ttk.Label(lookup_frame, text=get_text("lookup_key", self.lang)).grid(row=1, column=0, padx=5, pady=3, sticky=tk.W)
+        self.lookup_key = ttk.Combobox(lookup_frame, state="readonly", width=12)
+        self.lookup_key.grid(row=1, column=1, padx=5, pady=3, sticky=tk.W)
+        create_tooltip(self.lookup_key, "Column of the lookup sheet matched against this mapping's column")
+        ttk.Label(lookup_frame, text=get_text("lookup_value", self.lang)).grid(row=1, column=2, padx=5, pady=3, sticky=tk.W)
+        self.lookup_value = ttk.Combobox(lookup_frame, state="readonly", width=12)
+        self.lookup_value.grid(row=1, column=3, padx=5, pady=3, sticky=tk.W)
+
+        # Value format and template, applied to the whole column before a run
+        format_frame = ttk.LabelFrame(self.dialog, text=get_text("value_format", self.lang))
+        format_frame.grid(row=4, column=0, columnspan=2, padx=10, pady=5, sticky=tk.EW)
+
+        self.value_format = tk.StringVar()
+        ttk.Label(format_frame, text=get_text("format_label", self.lang)).grid(row=0, column=0, padx=5, pady=3, sticky=tk.W)
+        format_entry = ttk.Entry(format_frame, textvariable=self.value_format, width=28)
+        format_entry.grid(row=0, column=1, padx=5, pady=3, sticky=tk.W)
+        create_tooltip(format_entry, "Steps separated by |: strip, upper, lower, title, number[:,.2f], "
+                                     "date:%d/%m/%Y, zfill:5, default:text")
+        self.value_format.trace_add("write", lambda *args: self.update_preview(excel_data))
+
+        self.template = tk.StringVar()
+        ttk.Label(format_frame, text=get_text("template_label", self.lang)).grid(row=1, column=0, padx=5, pady=3, sticky=tk.W)
+        template_entry = ttk.Entry(format_frame, textvariable=self.template, width=28)
+        template_entry.grid(row=1, column=1, padx=5, pady=3, sticky=tk.W)
+        create_tooltip(template_entry, "Text typed instead of the value, built from mapped variables, "
+                                       "e.g. {first} {last}")
+
+        # Validation rules, checked over the whole sheet before a run
+        rules_frame = ttk.LabelFrame(self.dialog, text=get_text("validation_rules", self.lang))
+        rules_frame.grid(row=5, column=0, columnspan=2, padx=10, pady=5, sticky=tk.EW)
+
+        self.required = tk.BooleanVar()
+        ttk.Checkbutton(rules_frame, text=get_text("rule_required", self.lang),
+                        variable=self.required).grid(row=0, column=0, columnspan=4, padx=5, pady=3, sticky=tk.W)
+
+        self.rule_vars = {key: tk.StringVar() for key in ("max_length", "pattern", "min", "max", "date_format")}
+        ttk.Label(rules_frame, text=get_text("rule_max_length", self.lang)).grid(row=1, column=0, padx=5, pady=3, sticky=tk.W)
+        ttk.Entry(rules_frame, textvariable=self.rule_vars["max_length"], width=8).grid(row=1, column=1, padx=5, pady=3, sticky=tk.W)
+
+        ttk.Label(rules_frame, text=get_text("rule_pattern", self.lang)).grid(row=2, column=0, padx=5, pady=3, sticky=tk.W)
+        pattern_entry = ttk.Entry(rules_frame, textvariable=self.rule_vars["pattern"], width=28)
+        pattern_entry.grid(row=2, column=1, columnspan=3, padx=5, pady=3, sticky=tk.W)
+        create_tooltip(pattern_entry, r"Regular expression the whole value must match, e.g. \d{5} for a postcode")
+
+        ttk.Label(rules_frame, text=get_text("rule_min", self.lang)).grid(row=3, column=0, padx=5, pady=3, sticky=tk.W)
+        ttk.Entry(rules_frame, textvariable=self.rule_vars["min"], width=8).grid(row=3, column=1, padx=5, pady=3, sticky=tk.W)
+        ttk.Label(rules_frame, text=get_text("rule_max", self.lang)).grid(row=3, column=2, padx=5, pady=3, sticky=tk.W)
+        ttk.Entry(rules_frame, textvariable=self.rule_vars["max"], width=8).grid(row=3, column=3, padx=5, pady=3, sticky=tk.W)
+
+        ttk.Label(rules_frame, text=get_text("rule_date_format", self.lang)).grid(row=4, column=0, padx=5, pady=3, sticky=tk.W)
+        date_entry = ttk.Entry(rules_frame, textvariable=self.rule_vars["date_format"], width=14)
+        date_entry.grid(row=4, column=1, columnspan=3, padx=5, pady=3, sticky=tk.W)
+        create_tooltip(date_entry, "strftime format every value must follow, e.g. %d/%m/%Y")
+
+        if initial is not None:
+            var_name, excel_col, rules, transforms, lookup = initial
+            self.var_name.set(var_name)
+            self.excel_col.set(excel_col)
+            if lookup:
+                self.lookup_sheet.set(lookup["sheet"])
+                self.update_lookup_columns()
+                self.lookup_key.set(lookup["key"])
+                self.lookup_value.set(lookup["value"])
+            self.value_format.set(transforms.get("format", ""))
+            self.template.set(transforms.get("template", ""))
+            self.update_preview(excel_data)
+            self.required.set(bool(rules.get("required")))
+            for key, var in self.rule_vars.items():
+                value = rules.get(key, "")
+                var.set(f"{value:g}" if isinstance(value, float) else value)
+
         # Buttons
         button_frame = ttk.Frame(self.dialog)
-        button_frame.grid(row=3, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=6, column=0, columnspan=2, pady=20)
 
         ttk.Button(button_frame, text=get_text("ok", self.lang), command=self.ok_clicked).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text=get_text("cancel", self.lang), command=self.cancel_clicked).pack(side=tk.LEFT, padx=5)
 
+    def update_lookup_columns(self):
+        """Offer the columns of the chosen lookup sheet as key and value columns"""
+        sheet = self.lookup_sheet.get()
+        self.lookup_columns = []
+        if sheet and self.read_header is not None:
+            try:
+                self.lookup_columns = list(self.read_header(sheet))
+            except Exception as e:
+                messagebox.showwarning(get_text("warning", self.lang), get_text("error_loading_sheet", self.lang).format(str(e)))
+        for combo in (self.lookup_key, self.lookup_value):
+            combo['values'] = self.lookup_columns
+            combo.set("")
+
+    def lookup_column(self, name):
+        # Comboboxes return text; keep the header's own type (e.g. a numeric header)
+        return next((col for col in self.lookup_columns if str(col) == name), name)
+
     def update_preview(self, excel_data):
         col = self.excel_col.get()
-        if col and not excel_data.empty:
-            preview = str(excel_data[col].iloc[0])[:30]
+        if col and col not in excel_data.columns:
+            # Column skipped by a projected load; it is parsed once mapped
+            self.preview_label.config(text=get_text("column_not_loaded", self.lang))
+        elif col and not excel_data.empty:
+            preview = format_sample(excel_data[col], self.value_format.get().strip())[:30]
             self.preview_label.config(text=preview)
 
     def ok_clicked(self):
         if self.var_name.get().strip() and self.excel_col.get():
-            self.result = (self.var_name.get().strip(), self.excel_col.get())
+            rules = {key: var.get().strip() for key, var in self.rule_vars.items()}
+            rules["required"] = self.required.get()
+            try:
+                rules = normalize_rules(rules)
+            except ValueError as e:
+                messagebox.showwarning(get_text("warning", self.lang), get_text("invalid_rules", self.lang).format(str(e)))
+                return
+            var_name = self.var_name.get().strip()
+            try:
+                transforms = normalize_transforms({"format": self.value_format.get(), "template": self.template.get()},
+                                                  self.variables + [var_name])
+            except ValueError as e:
+                messagebox.showwarning(get_text("warning", self.lang), get_text("invalid_transforms", self.lang).format(str(e)))
+                return
+            try:
+                lookup = normalize_lookup({"sheet": self.lookup_sheet.get(),
+                                           "key": self.lookup_column(self.lookup_key.get()),
+                                           "value": self.lookup_column(self.lookup_value.get())})
+            except ValueError as e:
+                messagebox.showwarning(get_text("warning", self.lang), get_text("invalid_lookup", self.lang).format(str(e)))
+                return
+            self.result = (var_name, self.excel_col.get(), rules, transforms, lookup)
             print(f"DEBUG: Dialog result set to {self.result}")  # Debug line
             self.dialog.destroy()
         else:
@@ -0,0 +1,86 @@
+"""
+Row filter expressions, evaluated once and vectorized over a sheet's columns
+"""
+
+import itertools
+import re
+
+# pandas and numpy are imported where they are used, like in data_sources
+
+# Rows parsed per batch when filtering a streaming sheet
+FILTER_CHUNK_ROWS = 50000
+
+_QUOTED = re.compile(r"`([^`]*)`")
+_LITERALS = re.compile(r"`[^`]*`|'[^']*'|\"[^\"]*\"")
+_IDENTIFIER = re.compile(r"[^\W\d]\w*")
+
+
+class FilterError(ValueError):
+    """Raised when a filter expression cannot be evaluated"""
+
+
+def filter_columns(expression, columns):
+    """Return the sheet columns an expression refers to, in sheet order
+
+    Column names that are not identifiers are written in backticks, as in
+    DataFrame.query: `Order Date` > "2024-01-01".
+    """
+    quoted = set(_QUOTED.findall(expression))
+    bare = set(_IDENTIFIER.findall(_LITERALS.sub(" ", expression)))
+    return [col for col in columns if str(col) in quoted or str(col) in bare]
+
+
+def evaluate_filter(frame, expression):
+    """Evaluate expression over every row of frame; return a boolean NumPy array
+
+    The expression is a pandas expression such as
+    status == "NEW" and amount > 100. Each comparison runs once over a
+    whole column; empty cells never match.
+    """
+    import numpy as np
+    from pandas.api.types import is_bool_dtype
+
+    frame = frame.set_axis([str(col) for col in frame.columns], axis=1)
+    try:
+        result = frame.eval(expression, engine="python")
+    except Exception as e:
+        raise FilterError(str(e))
+
+    if isinstance(result, (bool, np.bool_)):
+        return np.full(len(frame), bool(result))
+    if getattr(result, "ndim", 0) != 1 or not is_bool_dtype(result):
+        raise FilterError(f"'{expression}' is not a condition, e.g. status == \"NEW\"")
+    return result.fillna(False).to_numpy(dtype=bool)
+
+
+def matching_rows(source, expression, start=0, stop=None, progress=None):
+    """Return the sorted indices of rows in [start, stop) that match expression
+
+    Only the columns the expression names are read. In-memory sheets are
+    evaluated in one pass; streaming sheets in batches of FILTER_CHUNK_ROWS,
+    calling progress(rows_scanned) after each batch.
+    """
+    import numpy as np
+    import pandas as pd
+
+    stop = source.row_count if stop is None else min(stop, source.row_count)
+    start = min(start, stop)
+    columns = filter_columns(expression, source.columns)
+    source.ensure_columns(columns)
+
+    if not source.streaming:
+        mask = evaluate_filter(source.data.iloc[start:stop][columns], expression)
+        return np.flatnonzero(mask) + start
+
+    matches = []
+    rows = source.iter_rows(start, stop, columns)
+    while True:
+        batch = list(itertools.islice(rows, FILTER_CHUNK_ROWS))
+        if not batch:
+            break
+        indices = np.fromiter((row_idx for row_idx, _ in batch), dtype=np.int64, count=len(batch))
+        frame = pd.DataFrame([values for _, values in batch], columns=columns)
+        matches.append(indices[evaluate_filter(frame, expression)])
+        if progress:
+            progress(int(indices[-1]) + 1 - start)
+    return np.concatenate(matches) if matches else np.empty(0, dtype=np.int64)
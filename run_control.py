@@ -0,0 +1,77 @@
+"""
+Stop and pause control shared by every wait of a running automation
+"""
+
+import threading
+import time
+
+
+class RunCancelled(Exception):
+    """Raised out of a wait when the run has been stopped"""
+
+
+class RunControl:
+    """Cancellation and pause state of one run
+
+    stop(), pause() and resume() may be called from any thread (Tk, hotkey
+    listener, signal handler). Every wait of the engine goes through sleep(),
+    which wakes as soon as the run is stopped instead of finishing its
+    timeout, so stopping takes effect within one action.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._paused = False
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    @property
+    def paused(self):
+        return self._paused
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def pause(self):
+        with self._condition:
+            self._paused = True
+            self._condition.notify_all()
+
+    def resume(self):
+        with self._condition:
+            self._paused = False
+            self._condition.notify_all()
+
+    def checkpoint(self):
+        """Block while paused; return False once the run is stopped
+
+        Called before every step, so a pause freezes the run at the exact
+        step it reached.
+        """
+        if not self._paused:
+            return not self._stopped
+        with self._condition:
+            while self._paused and not self._stopped:
+                self._condition.wait()
+            return not self._stopped
+
+    def sleep(self, seconds):
+        """Wait for seconds, not counting paused time; raise RunCancelled on stop"""
+        deadline = time.monotonic() + seconds
+        with self._condition:
+            while not self._stopped:
+                if self._paused:
+                    paused_at = time.monotonic()
+                    self._condition.wait()
+                    deadline += time.monotonic() - paused_at
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._condition.wait(remaining)
+        raise RunCancelled()
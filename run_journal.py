@@ -0,0 +1,116 @@
+"""
+Crash-safe checkpoint journal of completed rows, used to resume interrupted runs
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+JOURNAL_DIR = "journals"
+
+# fsync after this many rows or this many seconds, whichever comes first
+SYNC_EVERY_ROWS = 50
+SYNC_INTERVAL = 1.0
+
+
+def preset_hash(steps, mappings, rules=None, transforms=None, lookups=None):
+    """Stable hash of the automation steps, column mappings and mapping settings of a run
+
+    rules, transforms and lookups are the {variable: settings} dicts of the
+    mapped variables; changing any of them changes what rows are typed, so
+    a journal of the old settings is not resumed.
+    """
+    settings = {name: {variable: value for variable, value in (values or {}).items()
+                       if variable in mappings and value}
+                for name, values in (("rules", rules), ("transforms", transforms), ("lookups", lookups))}
+    payload = json.dumps({"steps": steps, "mappings": mappings, **settings}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def journal_path(workbook_hash, sheet_name, preset_digest, journal_dir=JOURNAL_DIR):
+    key = hashlib.sha1(f"{workbook_hash}\0{sheet_name}\0{preset_digest}".encode("utf-8")).hexdigest()
+    return os.path.join(journal_dir, f"{key}.journal")
+
+
+class RunJournal:
+    """Append-only record of completed row indices for one workbook + preset
+
+    The first line is a JSON header describing the run; every further line
+    is the index of a completed row. Writes are buffered and fsynced in
+    batches, so marking a row costs one buffered write. A line torn by a
+    crash is ignored when the journal is read back.
+    """
+
+    def __init__(self, path, header=None):
+        self.path = path
+        self.header = header or {}
+        self._file = None
+        self._pending = 0
+        self._last_sync = 0.0
+
+    def completed(self):
+        """Return the set of row indices recorded as completed"""
+        rows = set()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                next(f, None)  # header
+                for line in f:
+                    if line.endswith("\n") and line[:-1].isdigit():
+                        rows.add(int(line))
+        except OSError:
+            pass
+        return rows
+
+    def open(self, reset=False):
+        """Open the journal for appending; reset starts it over"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fresh = reset or not os.path.exists(self.path)
+        torn = not fresh and self._ends_mid_line()
+        self._file = open(self.path, "w" if fresh else "a", encoding="utf-8")
+        if torn:
+            # A line cut short by a crash may be the prefix of another index
+            # ("7" of "75"); mark it invalid before appending
+            self._file.write("#\n")
+        if fresh:
+            header = dict(self.header, created=datetime.now().isoformat(timespec="seconds"))
+            self._file.write(json.dumps(header) + "\n")
+            self.sync()
+        self._last_sync = time.monotonic()
+        return self
+
+    def _ends_mid_line(self):
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def mark_done(self, row_idx):
+        self._file.write(f"{row_idx}\n")
+        self._pending += 1
+        if self._pending >= SYNC_EVERY_ROWS or time.monotonic() - self._last_sync >= SYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        """Flush buffered rows and force them to disk"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+def first_incomplete(start_row, end_row, completed):
+    """Return the first row in [start_row, end_row) not completed, or None"""
+    for row_idx in range(start_row, end_row):
+        if row_idx not in completed:
+            return row_idx
+    return None
@@ -0,0 +1,99 @@
+"""
+File-backed execution log with a background writer thread and on-disk search
+"""
+
+import atexit
+import glob
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime
+
+LOG_DIR = "logs"
+LOG_FILE = "dataflow.log"
+MAX_LOG_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# Lines kept in the log widget; everything else lives only on disk
+WIDGET_MAX_LINES = 1000
+
+# Cap on lines returned by a search so results stay cheap to display
+MAX_SEARCH_RESULTS = 1000
+
+
+def row_tag(row):
+    """Language-independent marker written in front of row-related lines"""
+    return f"[row {row}]"
+
+
+class RunLog:
+    """Stream every log line to a rotating file from a background thread
+
+    write() only enqueues the record, so callers on the automation thread
+    never wait for disk I/O. The files are searched lazily, line by line,
+    without loading them into memory or into the log widget.
+    """
+
+    def __init__(self, log_dir=LOG_DIR, file_name=LOG_FILE, max_bytes=MAX_LOG_BYTES, backup_count=BACKUP_COUNT):
+        os.makedirs(log_dir, exist_ok=True)
+        self.path = os.path.join(log_dir, file_name)
+
+        handler = logging.handlers.RotatingFileHandler(
+            self.path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        self._queue = queue.Queue()
+        self._logger = logging.getLogger(f"dataflow.run.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(logging.handlers.QueueHandler(self._queue))
+
+        self._listener = logging.handlers.QueueListener(self._queue, handler)
+        self._listener.start()
+        self._handler = handler
+        atexit.register(self.stop)
+
+    def write(self, message, row=None, when=None):
+        when = when or datetime.now()
+        tag = f"{row_tag(row)} " if row is not None else ""
+        self._logger.info(f"{when:%Y-%m-%d %H:%M:%S} {tag}{message}")
+
+    def stop(self):
+        """Flush queued lines to disk and stop the writer thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._handler.close()
+            self._listener = None
+
+    def files(self):
+        """Log files from oldest to newest"""
+        backups = [p for p in glob.glob(self.path + ".*") if p.rsplit(".", 1)[1].isdigit()]
+        # Higher suffixes are older: dataflow.log.5 is rotated out first
+        backups.sort(key=lambda p: int(p.rsplit(".", 1)[1]), reverse=True)
+        return backups + ([self.path] if os.path.exists(self.path) else [])
+
+    def _iter_lines(self):
+        for path in self.files():
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        yield line.rstrip("\n")
+            except OSError:
+                continue
+
+    def search(self, text, limit=MAX_SEARCH_RESULTS):
+        """Return up to limit lines containing text (case-insensitive)"""
+        needle = text.lower()
+        results = []
+        for line in self._iter_lines():
+            if needle in line.lower():
+                results.append(line)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def row_lines(self, row, limit=MAX_SEARCH_RESULTS):
+        """Return the most recent lines logged for a row, across runs"""
+        tag = row_tag(row)
+        return [line for line in self._iter_lines() if tag in line][-limit:]
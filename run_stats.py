@@ -0,0 +1,140 @@
+"""
+Per-step latency histograms and throughput statistics for automation runs
+"""
+
+import csv
+import json
+import math
+import os
+import time
+from datetime import datetime
+
+STATS_DIR = "run_stats"
+
+# Log-spaced buckets from 1 µs upward, each 10% wider than the previous one,
+# so percentiles are within 10% whatever the scale of the step
+BUCKET_MIN = 1e-6
+BUCKET_GROWTH = 1.1
+BUCKET_COUNT = 300
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+PERCENTILES = (50, 95)
+
+# Timing components recorded for every step
+COMPONENTS = ("action", "delay", "overhead")
+
+
+class LatencyHistogram:
+    """Fixed-memory histogram of durations in seconds
+
+    Recording is O(1) and memory does not grow with the number of rows.
+    Percentiles are reported as the upper bound of their bucket, capped at
+    the exact maximum seen.
+    """
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if seconds <= BUCKET_MIN:
+            bucket = 0
+        else:
+            bucket = min(int(math.log(seconds / BUCKET_MIN) / _LOG_GROWTH) + 1, BUCKET_COUNT - 1)
+        self.counts[bucket] += 1
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(BUCKET_MIN * BUCKET_GROWTH ** bucket, self.max)
+        return self.max
+
+    def summary(self):
+        """Return {p50, p95, max, mean, total} in seconds"""
+        result = {f"p{p}": self.percentile(p) for p in PERCENTILES}
+        result["max"] = self.max
+        result["mean"] = self.total / self.count if self.count else 0.0
+        result["total"] = self.total
+        return result
+
+
+class RunStats:
+    """Timings of one automation run: a histogram per step and component
+
+    The automation thread records into it; the Tk thread reads summary()
+    while the run goes on, so a summary may lag a step behind.
+    """
+
+    def __init__(self, plan, clock=time.perf_counter):
+        self.clock = clock
+        self.steps = [(step.index, step.action) for step in plan]
+        self.histograms = [{component: LatencyHistogram() for component in COMPONENTS} for _ in plan]
+        self.rows = LatencyHistogram()
+        self.started = clock()
+        self.finished = None
+
+    def record_step(self, position, action, delay, overhead):
+        """Record one step run; position is the step's place in the plan"""
+        histograms = self.histograms[position]
+        histograms["action"].record(action)
+        histograms["delay"].record(delay)
+        histograms["overhead"].record(overhead)
+
+    def record_row(self, seconds):
+        self.rows.record(seconds)
+
+    def finish(self):
+        self.finished = self.clock()
+
+    def elapsed(self):
+        return (self.finished if self.finished is not None else self.clock()) - self.started
+
+    def rows_per_minute(self):
+        elapsed = self.elapsed()
+        return self.rows.count * 60 / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        """One dict per step with the p50/p95/max of every component"""
+        rows = []
+        for (index, action), histograms in zip(self.steps, self.histograms):
+            record = {"step": index + 1, "action": action, "runs": histograms["action"].count}
+            for component, histogram in histograms.items():
+                for name, value in histogram.summary().items():
+                    record[f"{component}_{name}"] = value
+            rows.append(record)
+        return rows
+
+    def totals(self):
+        return {
+            "rows": self.rows.count,
+            "elapsed": self.elapsed(),
+            "rows_per_minute": self.rows_per_minute(),
+            "row_time": self.rows.summary(),
+        }
+
+    def export(self, stats_dir=STATS_DIR, when=None):
+        """Write the statistics (in seconds) as JSON and CSV; returns the two paths"""
+        os.makedirs(stats_dir, exist_ok=True)
+        base = os.path.join(stats_dir, f"run_{(when or datetime.now()):%Y%m%d_%H%M%S}")
+        steps = self.summary()
+
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump({"units": "seconds", "totals": self.totals(), "steps": steps}, f, indent=2)
+
+        with open(base + ".csv", "w", encoding="utf-8", newline="") as f:
+            if steps:
+                writer = csv.DictWriter(f, fieldnames=list(steps[0]))
+                writer.writeheader()
+                writer.writerows(steps)
+        return base + ".json", base + ".csv"
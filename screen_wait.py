@@ -0,0 +1,50 @@
+"""
+Adaptive waits that return as soon as a screen region stops changing
+"""
+
+import time
+
+# Time between screenshots of the watched region
+POLL_INTERVAL = 0.05
+
+# Consecutive unchanged screenshots needed before the region counts as stable
+STABLE_FRAMES = 3
+
+# Fraction of pixels allowed to differ between frames (blinking text cursors)
+CHANGE_THRESHOLD = 0.001
+
+
+def changed_fraction(previous, current):
+    """Fraction of pixels that differ between two frames of the same region"""
+    import numpy as np
+    if previous.shape != current.shape:
+        return 1.0
+    diff = previous != current
+    if diff.ndim == 3:
+        diff = diff.any(axis=2)
+    return np.count_nonzero(diff) / diff.size if diff.size else 0.0
+
+
+def wait_until_stable(grab, region, timeout, interval=POLL_INTERVAL, stable_frames=STABLE_FRAMES,
+                      threshold=CHANGE_THRESHOLD, sleep=time.sleep):
+    """Block until region looks the same for stable_frames polls, or timeout
+
+    grab(region=(x, y, width, height)) must return an image (anything
+    np.asarray understands), e.g. pyautogui.screenshot. Returns True when the
+    region became stable and False when the timeout expired first.
+    """
+    import numpy as np
+    deadline = time.monotonic() + timeout
+    previous = np.asarray(grab(region=region))
+    unchanged = 0
+    while time.monotonic() < deadline:
+        sleep(interval)
+        current = np.asarray(grab(region=region))
+        if changed_fraction(previous, current) <= threshold:
+            unchanged += 1
+            if unchanged >= stable_frames:
+                return True
+        else:
+            unchanged = 0
+        previous = current
+    return False
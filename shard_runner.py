@@ -0,0 +1,321 @@
+"""
+Coordinator that splits a headless run into shards, each driving its own X display
+
+Linux only. Every shard is a cli.py process with DISPLAY set to its own
+(usually Xvfb) display running its own copy of the target application.
+
+Example:
+    python shard_runner.py --preset p.json --workbook orders.xlsx --xvfb 4 --launch "wine app.exe"
+    python shard_runner.py --preset p.json --workbook orders.xlsx --displays :1 :2
+"""
+
+import argparse
+import bisect
+import json
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import cli
+from error_policy import default_failures_path
+from row_filter import FilterError, matching_rows
+from run_journal import RunJournal
+
+# Seconds between aggregated progress lines
+REPORT_INTERVAL = 2.0
+POLL_INTERVAL = 0.1
+
+# Seconds to give a freshly started Xvfb before connecting to it
+XVFB_START_WAIT = 1.0
+
+SCREEN_GEOMETRY = "1920x1080x24"
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+
+# Which child exit code the coordinator returns when shards disagree
+EXIT_PRIORITY = (cli.EXIT_INTERRUPTED, cli.EXIT_DATA_ERROR, cli.EXIT_USAGE, cli.EXIT_ROW_ERRORS)
+
+
+def split_rows(start_row, end_row, shards, completed=(), selected=None):
+    """Split the rows of [start_row, end_row) not yet completed into shards
+
+    selected, if given, lists the rows a filter matched; only those count.
+    Returns up to shards (first, last) pairs of 0-based inclusive row indices,
+    each covering about the same number of remaining rows.
+    """
+    rows = range(start_row, end_row) if selected is None else selected
+    remaining = [row_idx for row_idx in rows if start_row <= row_idx < end_row and row_idx not in completed]
+    shards = min(shards, len(remaining))
+    ranges = []
+    for shard in range(shards):
+        chunk = remaining[len(remaining) * shard // shards:len(remaining) * (shard + 1) // shards]
+        ranges.append((chunk[0], chunk[-1]))
+    return ranges
+
+
+def shard_journal_path(journal_path, shard):
+    return f"{journal_path}.shard{shard}"
+
+
+def shard_journal_paths(journal_path):
+    """Shard journals existing next to a main journal, including stale ones"""
+    directory = os.path.dirname(journal_path) or "."
+    prefix = os.path.basename(journal_path) + ".shard"
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in os.listdir(directory) if name.startswith(prefix)]
+
+
+def merge_shard_journals(journal):
+    """Fold rows completed by shard journals into the run's main journal
+
+    Also picks up shard journals left behind by an interrupted coordinator.
+    Returns the set of all completed rows.
+    """
+    completed = journal.completed()
+    shard_paths = shard_journal_paths(journal.path)
+    if not shard_paths:
+        return completed
+
+    new_rows = set()
+    for path in shard_paths:
+        new_rows |= RunJournal(path).completed()
+    new_rows -= completed
+    journal.open()
+    try:
+        for row_idx in sorted(new_rows):
+            journal.mark_done(row_idx)
+    finally:
+        journal.close()
+    for path in shard_paths:
+        os.remove(path)
+    return completed | new_rows
+
+
+class Shard:
+    """One cli.py child process and the progress it has reported"""
+
+    def __init__(self, number, display, first_row, last_row, selected=None):
+        self.number = number
+        self.display = display
+        self.first_row = first_row
+        self.last_row = last_row
+        self.done = 0
+        # An estimate until the child's first progress event gives the rows
+        # it runs, after its filter and validation rules
+        if selected is None:
+            self.total = last_row - first_row + 1
+        else:
+            self.total = bisect.bisect_right(selected, last_row) - bisect.bisect_left(selected, first_row)
+        self.failures = []
+        self.summary = None
+        self.errors = []
+        self.process = None
+        self._reader = None
+
+    def start(self, args, journal_path, failures_path):
+        command = [sys.executable, CLI_PATH, "--events",
+                   "--preset", args.preset, "--workbook", args.workbook, "--sheet", args.sheet,
+                   "--from-row", str(self.first_row + 1), "--to-row", str(self.last_row + 1),
+                   "--journal", shard_journal_path(journal_path, self.number),
+                   "--skip-journal", journal_path, "--failures-file", failures_path,
+                   "--input-mode", args.input_mode, "--lang", args.lang]
+        if args.filter:
+            command += ["--filter", args.filter]
+        if args.streaming:
+            command.append("--streaming")
+        command += cli.policy_arguments(args)
+        if args.dry_run:
+            command.append("--dry-run")
+        env = dict(os.environ, DISPLAY=self.display)
+        self.process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE, text=True)
+        self._reader = threading.Thread(target=self._read_events, daemon=True)
+        self._reader.start()
+
+    def _read_events(self):
+        for line in self.process.stdout:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            kind = event.get("event")
+            if kind == "progress":
+                self.done = event["done"]
+                self.total = event["total"]
+            elif kind == "row_failed":
+                self.failures.append((event["row"], event["error"]))
+            elif kind == "summary":
+                self.summary = event
+            elif kind == "error":
+                self.errors.append(event["message"])
+
+    def wait(self):
+        code = self.process.wait()
+        self._reader.join()
+        return code
+
+
+def start_xvfb(count, base):
+    """Start count Xvfb servers on displays :base, :base+1, ...; return (displays, processes)"""
+    displays = [f":{base + i}" for i in range(count)]
+    processes = [subprocess.Popen(["Xvfb", display, "-screen", "0", SCREEN_GEOMETRY, "-nolisten", "tcp"],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                 for display in displays]
+    time.sleep(XVFB_START_WAIT)
+    for display, process in zip(displays, processes):
+        if process.poll() is not None:
+            stop_processes(processes)
+            raise RuntimeError(f"Xvfb could not start on display {display}")
+    return displays, processes
+
+
+def launch_apps(command, displays, wait):
+    """Start the target application once on every display"""
+    processes = [subprocess.Popen(shlex.split(command), env=dict(os.environ, DISPLAY=display))
+                 for display in displays]
+    time.sleep(wait)
+    return processes
+
+
+def stop_processes(processes):
+    for process in processes:
+        if process.poll() is None:
+            process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def report_progress(shards, started):
+    done = sum(shard.done for shard in shards)
+    total = sum(shard.total for shard in shards)
+    elapsed = time.perf_counter() - started
+    rate = done * 60 / elapsed if elapsed > 0 else 0.0
+    detail = ", ".join(f"{shard.display} {shard.done}/{shard.total}" for shard in shards)
+    print(f"Progress: {done}/{total} rows, {rate:.1f} rows/min ({detail})", flush=True)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Run a DataFlow Pro preset in parallel across X displays")
+    parser.add_argument("--preset", required=True, help="preset JSON saved from the GUI")
+    parser.add_argument("--workbook", required=True, help="Excel workbook, CSV/TSV or Parquet file to read rows from")
+    parser.add_argument("--sheet", help="sheet name (default: the first sheet)")
+    parser.add_argument("--from-row", type=int, default=1, help="first data row to process, 1-based")
+    parser.add_argument("--to-row", type=int, help="last data row to process (default: the last row)")
+    parser.add_argument("--filter", metavar="EXPR", help="process only rows matching a condition (see cli.py)")
+    targets = parser.add_mutually_exclusive_group(required=True)
+    targets.add_argument("--displays", nargs="+", help="existing X displays to use, one shard each (e.g. :1 :2)")
+    targets.add_argument("--xvfb", type=int, metavar="N", help="start N Xvfb displays, one shard each")
+    parser.add_argument("--display-base", type=int, default=90, help="first display number used with --xvfb")
+    parser.add_argument("--launch", help="command starting the target application on every display")
+    parser.add_argument("--launch-wait", type=float, default=5.0, help="seconds to let the application start")
+    parser.add_argument("--streaming", action="store_true", help="stream .xlsx rows instead of loading the sheet")
+    parser.add_argument("--input-mode", choices=("type", "paste"), default="type")
+    parser.add_argument("--resume", action="store_true", help="skip rows completed by an interrupted run")
+    cli.add_policy_arguments(parser)
+    parser.add_argument("--dry-run", action="store_true", help="run every step without sending input events")
+    parser.add_argument("--lang", default="en", help="language of log messages")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not sys.platform.startswith("linux"):
+        print("Sharded runs need Linux X displays", file=sys.stderr)
+        return cli.EXIT_USAGE
+
+    try:
+        steps, mappings, rules, transforms = cli.load_preset(args.preset)
+        # Only the row count and filter columns are needed here; the shards parse the rows themselves
+        args.sheet, source = cli.open_source(args.workbook, args.sheet, mappings, streaming=True)
+    except Exception as e:
+        print(e, file=sys.stderr)
+        return cli.EXIT_DATA_ERROR
+
+    start_row = max(args.from_row - 1, 0)
+    end_row = source.row_count if args.to_row is None else min(args.to_row, source.row_count)
+    selected = None
+    if args.filter:
+        # Balance the shards by matching rows; each shard applies the filter again
+        try:
+            selected = matching_rows(source, args.filter, start_row, end_row).tolist()
+        except FilterError as e:
+            print(f"Invalid row filter: {e}", file=sys.stderr)
+            return cli.EXIT_USAGE
+
+    journal = cli.open_journal(args.workbook, args.sheet, steps, mappings, rules, transforms)
+    if args.resume:
+        completed = merge_shard_journals(journal)
+    else:
+        for path in shard_journal_paths(journal.path):
+            os.remove(path)
+        # The shards read the main journal, so it has to exist even when empty
+        journal.open(reset=True)
+        journal.close()
+        completed = set()
+
+    helpers = []
+    try:
+        if args.xvfb:
+            displays, xvfb = start_xvfb(args.xvfb, args.display_base)
+            helpers += xvfb
+        else:
+            displays = args.displays
+        ranges = split_rows(start_row, end_row, len(displays), completed, selected)
+        if not ranges:
+            print("No rows left to process")
+            return cli.EXIT_OK
+        if args.launch:
+            helpers += launch_apps(args.launch, displays[:len(ranges)], args.launch_wait)
+
+        shards = [Shard(number, display, first, last, selected)
+                  for number, (display, (first, last)) in enumerate(zip(displays, ranges))]
+        # All shards append their failed rows to one shared failures file
+        failures_path = default_failures_path()
+        started = time.perf_counter()
+        for shard in shards:
+            shard.start(args, journal.path, failures_path)
+
+        # Ctrl+C reaches the children through the process group; SIGTERM is forwarded
+        signal.signal(signal.SIGINT, lambda signum, frame: None)
+        signal.signal(signal.SIGTERM, lambda signum, frame: [shard.process.send_signal(signal.SIGINT)
+                                                             for shard in shards])
+        next_report = started + REPORT_INTERVAL
+        while any(shard.process.poll() is None for shard in shards):
+            time.sleep(POLL_INTERVAL)
+            if time.perf_counter() >= next_report:
+                report_progress(shards, started)
+                next_report += REPORT_INTERVAL
+        codes = [shard.wait() for shard in shards]
+        elapsed = time.perf_counter() - started
+    finally:
+        stop_processes(helpers)
+
+    merge_shard_journals(journal)
+
+    completed_rows = sum(shard.summary["completed"] for shard in shards if shard.summary)
+    failures = sorted(failure for shard in shards for failure in shard.failures)
+    for shard, code in zip(shards, codes):
+        for message in shard.errors:
+            print(f"{shard.display}: {message}", file=sys.stderr)
+    for row, error in failures:
+        print(f"Row {row} failed: {error}")
+    if failures:
+        print(f"Failed rows saved to {failures_path}")
+    print(f"Rows completed: {completed_rows}, failed: {len(failures)}, shards: {len(shards)}, "
+          f"elapsed: {elapsed:.1f}s, {completed_rows * 60 / elapsed if elapsed > 0 else 0:.1f} rows/min")
+
+    for code in EXIT_PRIORITY:
+        if code in codes:
+            return code
+    return cli.EXIT_OK if all(code == cli.EXIT_OK for code in codes) else cli.EXIT_ROW_ERRORS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+"""
+On-disk cache of parsed sheets, keyed by the source file's size, mtime and content hash
+"""
+
+import datetime
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Bumped when sheets are parsed or stored differently, so older entries are re-read
+CACHE_VERSION = 3
+
+DEFAULT_CACHE_DIR = ".dataflow_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+INDEX_FILE = "index.json"
+
+
+@functools.lru_cache(maxsize=None)
+def has_feather():
+    """Return True if pyarrow is installed, enabling the Feather format
+
+    Checked on first store rather than at import, since pyarrow is slow to load.
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def file_fingerprint(file_path, chunk_size=1024 * 1024):
+    """Return size, mtime and SHA-256 content hash of a file"""
+    stat = os.stat(file_path)
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": digest.hexdigest()}
+
+
+def _tag(value):
+    """json.dumps default: tag the cell and label types JSON has no form for
+
+    Raises TypeError for any other type, so such a sheet is not cached.
+    """
+    import numpy as np
+    import pandas as pd
+    if value is pd.NaT:
+        return {"$nat": 0}
+    if value is pd.NA:
+        return {"$na": 0}
+    if isinstance(value, pd.Timestamp):
+        return {"$timestamp": value.isoformat()}
+    if isinstance(value, datetime.datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, datetime.timedelta):
+        return {"$timedelta": value.total_seconds()}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+
+def _untag(obj):
+    """json.loads object_hook undoing _tag"""
+    import pandas as pd
+    if len(obj) == 1:
+        (tag, value), = obj.items()
+        if tag == "$nat":
+            return pd.NaT
+        if tag == "$na":
+            return pd.NA
+        if tag == "$timestamp":
+            return pd.Timestamp(value)
+        if tag == "$datetime":
+            return datetime.datetime.fromisoformat(value)
+        if tag == "$date":
+            return datetime.date.fromisoformat(value)
+        if tag == "$time":
+            return datetime.time.fromisoformat(value)
+        if tag == "$timedelta":
+            return datetime.timedelta(seconds=value)
+    return obj
+
+
+def _dumps(values):
+    return json.dumps(values, default=_tag)
+
+
+def _loads(text):
+    return json.loads(text, object_hook=_untag)
+
+
+def _save_arrays(frame, path):
+    """Save the columns of frame to an .npz file; return the positions stored as JSON
+
+    Columns with a plain NumPy dtype are saved as they are. Object and
+    extension columns become tagged JSON text, so loading them never
+    unpickles anything.
+    """
+    import numpy as np
+    arrays = {}
+    encoded = []
+    for i, name in enumerate(frame.columns):
+        series = frame[name]
+        if isinstance(series.dtype, np.dtype) and series.dtype != object:
+            arrays[name] = series.to_numpy()
+        else:
+            text = _dumps(series.to_numpy(dtype=object).tolist())
+            arrays[name] = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+            encoded.append(i)
+    np.savez(path, **arrays)
+    return encoded
+
+
+def _load_arrays(path, positions, dtypes, encoded):
+    """Read the columns at positions back from an .npz file written by _save_arrays"""
+    import numpy as np
+    import pandas as pd
+    columns = {}
+    with np.load(path, allow_pickle=False) as arrays:
+        for i in positions:
+            array = arrays[f"c{i}"]
+            if i in encoded:
+                series = pd.Series(_loads(array.tobytes().decode("utf-8")), dtype=object)
+                columns[f"c{i}"] = series if dtypes[i] == "object" else series.astype(dtypes[i])
+            else:
+                columns[f"c{i}"] = array
+    return pd.DataFrame(columns, columns=[f"c{i}" for i in positions])
+
+
+class SheetCache:
+    """Sidecar cache storing each parsed sheet in a columnar file
+
+    Sheets are written as Feather when pyarrow is available and as an .npz
+    file of NumPy arrays otherwise; neither runs code when read back. Column
+    labels are kept in the index as tagged JSON, so they come back with
+    their types. The cache is bounded to max_bytes; the least recently used
+    sheets are evicted first.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._fingerprints = {}
+
+    # Index handling
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._index_path() + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp_path, self._index_path())
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _key(file_path, sheet_name):
+        ident = f"{os.path.abspath(file_path)}\0{sheet_name}"
+        return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+    def fingerprint(self, file_path):
+        """Hash the file once per (path, size, mtime) for this session"""
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._fingerprints:
+            self._fingerprints[memo_key] = file_fingerprint(file_path)
+        return self._fingerprints[memo_key]
+
+    def _remove_entry(self, index, key):
+        entry = index.pop(key, None)
+        if entry:
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except OSError:
+                pass
+
+    # Public API
+
+    def header(self, file_path, sheet_name):
+        """Return the full column list recorded for a cached sheet, or None"""
+        entry = self._read_index().get(self._key(file_path, sheet_name))
+        if not entry or entry.get("version") != CACHE_VERSION:
+            return None
+        return _loads(entry["all_columns"])
+
+    def load(self, file_path, sheet_name, columns=None):
+        """Return the cached DataFrame, or None if missing or stale
+
+        With columns, only those are returned, and the lookup misses unless
+        the cached sheet holds all of them.
+        """
+        with self._lock:
+            index = self._read_index()
+            key = self._key(file_path, sheet_name)
+            entry = index.get(key)
+            if entry is None:
+                return None
+
+            # Size and mtime are free to check; only hash when they match
+            stat = os.stat(file_path)
+            if entry.get("version") != CACHE_VERSION or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime_ns \
+                    or entry["hash"] != self.fingerprint(file_path)["hash"]:
+                self._remove_entry(index, key)
+                self._write_index(index)
+                return None
+
+            cached_columns = _loads(entry["columns"])
+            if columns is None:
+                positions = list(range(len(cached_columns)))
+            else:
+                if any(col not in cached_columns for col in columns):
+                    return None
+                positions = [cached_columns.index(col) for col in dict.fromkeys(columns)]
+            stored_names = [f"c{i}" for i in positions]
+
+            data_path = os.path.join(self.cache_dir, entry["file"])
+            try:
+                import pandas as pd
+                if entry["format"] == "feather":
+                    # Feather is columnar, so only the requested columns are read
+                    data = pd.read_feather(data_path, columns=stored_names)
+                else:
+                    # So is .npz: each column is a separate array of the archive
+                    data = _load_arrays(data_path, positions, entry["dtypes"], entry["encoded"])
+            except Exception:
+                self._remove_entry(index, key)
+                self._write_index(index)
+                return None
+            data.columns = [cached_columns[i] for i in positions]
+
+            entry["last_used"] = time.time()
+            self._write_index(index)
+            return data
+
+    def store(self, file_path, sheet_name, data, all_columns=None):
+        """Write a parsed sheet to the cache; return False if it could not be stored or kept
+
+        data may be a column projection; all_columns records the sheet's full
+        column list so it can be restored without re-reading the workbook.
+        """
+        with self._lock:
+            data_path = None
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                key = self._key(file_path, sheet_name)
+                fingerprint = self.fingerprint(file_path)
+
+                # Column labels may be ints, dates or duplicates, so store them
+                # positionally and restore them from the index on load; labels
+                # of other types fail here, before any file is written.
+                labels = _dumps(list(data.columns))
+                all_labels = labels if all_columns is None else _dumps(list(all_columns))
+                frame = data.reset_index(drop=True)
+                frame.columns = [f"c{i}" for i in range(len(frame.columns))]
+
+                fmt = None
+                encoded = []
+                if has_feather():
+                    try:
+                        file_name = f"{key}.feather"
+                        data_path = os.path.join(self.cache_dir, file_name)
+                        frame.to_feather(data_path)
+                        fmt = "feather"
+                    except Exception:
+                        # Mixed-type object columns are not representable in Arrow
+                        if os.path.exists(data_path):
+                            os.remove(data_path)
+                        fmt = None
+                if fmt is None:
+                    file_name = f"{key}.npz"
+                    data_path = os.path.join(self.cache_dir, file_name)
+                    encoded = _save_arrays(frame, data_path)
+                    fmt = "npz"
+
+                index = self._read_index()
+                old = index.get(key)
+                if old and old["file"] != file_name:
+                    self._remove_entry(index, key)
+                index[key] = {
+                    "source": os.path.abspath(file_path),
+                    "sheet": sheet_name,
+                    "size": fingerprint["size"],
+                    "mtime": fingerprint["mtime"],
+                    "hash": fingerprint["hash"],
+                    "file": file_name,
+                    "format": fmt,
+                    "version": CACHE_VERSION,
+                    "columns": labels,
+                    "all_columns": all_labels,
+                    "dtypes": [str(dtype) for dtype in frame.dtypes],
+                    "encoded": encoded,
+                    "bytes": os.path.getsize(data_path),
+                    "last_used": time.time(),
+                }
+                # A sheet bigger than the whole cache is not kept; otherwise
+                # older sheets make room for it
+                kept = index[key]["bytes"] <= self.max_bytes
+                if kept:
+                    self._evict(index, keep=key)
+                else:
+                    self._remove_entry(index, key)
+                self._write_index(index)
+                return kept
+            except Exception:
+                # A data file without its index entry would never be read or evicted
+                if data_path is not None:
+                    try:
+                        os.remove(data_path)
+                    except OSError:
+                        pass
+                return False
+
+    def invalidate(self, file_path=None):
+        """Drop cached sheets of one file, or the whole cache; return the number removed"""
+        with self._lock:
+            index = self._read_index()
+            if file_path is None:
+                keys = list(index)
+            else:
+                source = os.path.abspath(file_path)
+                keys = [key for key, entry in index.items() if entry["source"] == source]
+            for key in keys:
+                self._remove_entry(index, key)
+            if keys:
+                self._write_index(index)
+            return len(keys)
+
+    def _evict(self, index, keep=None):
+        """Remove least recently used sheets, except keep, until the cache fits in max_bytes"""
+        total = sum(entry["bytes"] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= index[key]["bytes"]
+            self._remove_entry(index, key)
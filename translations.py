@@ -117,6 +117,129 @@ translations = {
         # Capture window
         "position_mouse": "Position your mouse where you want to click",
         "current_position": "Current position: X={}, Y={}",
+
+        # Streaming
+        "streaming_mode": "Stream rows (large files)",
+
+        # Sheet cache
+        "clear_sheet_cache": "Clear Sheet Cache",
+        "sheet_from_cache": "Sheet '{}' loaded from cache",
+        "sheet_cache_cleared": "Sheet cache cleared: {} entries removed",
+
+        # Background loading
+        "cancel_loading": "Cancel Loading",
+        "reading_workbook": "Reading workbook {}...",
+        "loading_sheet": "Loading sheet '{}'...",
+        "scanning_rows": "Scanning sheet '{}': {} rows...",
+        "load_cancelled": "Loading cancelled",
+
+        # Column projection
+        "columns_projected": "Loaded {} of {} columns (only mapped columns)",
+        "column_not_loaded": "(loaded when mapped)",
+
+        # Execution plan
+        "invalid_steps": "Automation steps are invalid: {}",
+
+        # Log search
+        "search_log": "Search Log",
+        "row": "Row:",
+        "jump_to_row": "Go to Row",
+        "search_results": "Log lines matching '{}'",
+        "row_log": "Log lines for row {}",
+        "no_log_matches": "No matching log lines",
+
+        # Wait until stable
+        "wait_stable": "Wait Until Stable",
+        "width": "Width:",
+        "height": "Height:",
+        "timeout_s": "Timeout (s):",
+
+        # Clipboard paste
+        "input_mode": "Input:",
+        "paste_long_text": "Paste long text via clipboard",
+
+        # Run journal
+        "resume_run": "Resume Run",
+        "resume_from_row": "An earlier run of this preset on this workbook already completed {} rows of this range.\n\nResume at row {} and skip the completed rows?",
+        "all_rows_completed": "All {} rows of this range were already completed by an earlier run.\n\nRun them again?",
+        "resuming_at_row": "Resuming interrupted run at row {}",
+
+        # Step statistics
+        "step_statistics": "Step Statistics",
+        "runs": "Runs",
+        "p50_ms": "p50 (ms)",
+        "p95_ms": "p95 (ms)",
+        "max_ms": "Max (ms)",
+        "delay_p50_ms": "Delay p50 (ms)",
+        "overhead_p50_ms": "Overhead p50 (ms)",
+        "rows_per_minute": "Rows/min: {:.1f}",
+        "stats_exported": "Step statistics saved to {}",
+
+        # Startup
+        "startup_time": "Startup: imports {:.0f} ms, window built in {:.0f} ms, first paint after {:.0f} ms",
+
+        # Error policy
+        "on_row_error": "On row error:",
+        "error_skip": "Skip row and continue",
+        "error_abort": "Stop the run",
+        "retries": "Retries:",
+        "backoff_s": "Backoff (s):",
+        "stop_after_failures": "Stop after failures in a row (0 = never):",
+        "retrying_row": "Row {} failed, retry {} in {:.1f}s: {}",
+        "run_aborted": "Run stopped after {} failed row(s) in a row",
+        "failures_saved": "{} failed row(s) saved to {}",
+
+        # Pause and resume
+        "pause": "Pause",
+        "resume": "Resume",
+        "automation_paused": "Automation paused",
+        "automation_resumed": "Automation resumed",
+
+        # Emergency stop hotkey
+        "stop_hotkey_active": "Emergency stop: press {} in any window",
+        "stop_hotkey_unavailable": "Emergency stop hotkey unavailable ({}); use Stop or Esc in this window",
+
+        # Row filter
+        "row_filter": "Filter rows:",
+        "filter_matches": "{} of {} rows match the filter",
+        "invalid_filter": "Invalid row filter: {}",
+        "counting_rows": "Counting matching rows...",
+
+        # Pre-flight validation
+        "validation_rules": "Validation rules",
+        "rule_required": "required",
+        "rule_max_length": "Max length:",
+        "rule_pattern": "Pattern:",
+        "rule_min": "Min:",
+        "rule_max": "Max:",
+        "rule_date_format": "Date format:",
+        "invalid_rules": "Invalid validation rules: {}",
+        "validate_data": "Validate Data",
+        "no_validation_rules": "No mapping has validation rules; double-click a mapping to add some",
+        "validation_summary": "Validation: {} rows checked, {} rejected in {:.2f}s",
+        "row_rejected": "Row {} rejected: {}",
+        "more_rejected_rows": "... and {} more rejected rows (see the log)",
+
+        # Value formats and templates
+        "value_format": "Value format",
+        "format_label": "Format:",
+        "template_label": "Template:",
+        "invalid_transforms": "Invalid format or template: {}",
+
+        # Lookup joins
+        "lookup": "Lookup in another sheet",
+        "lookup_sheet": "Sheet:",
+        "lookup_key": "Key column:",
+        "lookup_value": "Value column:",
+        "invalid_lookup": "Invalid lookup: {}",
+
+        # Run outcome
+        "run_outcome_stopped": "Automation stopped: {} row(s) completed, {} failed, {} rejected",
+        "run_outcome_aborted": "Automation aborted: {} row(s) completed, {} failed, {} rejected",
+        "run_outcome_errors": "Automation completed with errors: {} row(s) completed, {} failed, {} rejected",
+
+        # Row range
+        "invalid_row_range": "The From and To rows must be whole numbers",
     },
 
     "it": {
@@ -237,6 +360,129 @@ translations = {
         # Finestra cattura
         "position_mouse": "Posiziona il mouse dove vuoi cliccare",
         "current_position": "Posizione attuale: X={}, Y={}",
+
+        # Streaming
+        "streaming_mode": "Lettura in streaming (file grandi)",
+
+        # Cache fogli
+        "clear_sheet_cache": "Svuota cache fogli",
+        "sheet_from_cache": "Foglio '{}' caricato dalla cache",
+        "sheet_cache_cleared": "Cache fogli svuotata: {} voci rimosse",
+
+        # Caricamento in background
+        "cancel_loading": "Annulla caricamento",
+        "reading_workbook": "Lettura cartella di lavoro {}...",
+        "loading_sheet": "Caricamento foglio '{}'...",
+        "scanning_rows": "Scansione foglio '{}': {} righe...",
+        "load_cancelled": "Caricamento annullato",
+
+        # Proiezione colonne
+        "columns_projected": "Caricate {} di {} colonne (solo colonne mappate)",
+        "column_not_loaded": "(caricata quando mappata)",
+
+        # Piano di esecuzione
+        "invalid_steps": "Passi di automazione non validi: {}",
+
+        # Ricerca nel log
+        "search_log": "Cerca nel log",
+        "row": "Riga:",
+        "jump_to_row": "Vai alla riga",
+        "search_results": "Righe di log contenenti '{}'",
+        "row_log": "Righe di log per la riga {}",
+        "no_log_matches": "Nessuna riga di log trovata",
+
+        # Attendi stabilità
+        "wait_stable": "Attendi stabilità",
+        "width": "Larghezza:",
+        "height": "Altezza:",
+        "timeout_s": "Timeout (s):",
+
+        # Incolla dagli appunti
+        "input_mode": "Inserimento:",
+        "paste_long_text": "Incolla testi lunghi dagli appunti",
+
+        # Registro esecuzione
+        "resume_run": "Riprendi esecuzione",
+        "resume_from_row": "Un'esecuzione precedente di questo preset su questa cartella ha già completato {} righe di questo intervallo.\n\nRiprendere dalla riga {} saltando le righe completate?",
+        "all_rows_completed": "Tutte le {} righe di questo intervallo sono già state completate da un'esecuzione precedente.\n\nEseguirle di nuovo?",
+        "resuming_at_row": "Ripresa dell'esecuzione interrotta dalla riga {}",
+
+        # Statistiche passi
+        "step_statistics": "Statistiche Passi",
+        "runs": "Esecuzioni",
+        "p50_ms": "p50 (ms)",
+        "p95_ms": "p95 (ms)",
+        "max_ms": "Max (ms)",
+        "delay_p50_ms": "Ritardo p50 (ms)",
+        "overhead_p50_ms": "Overhead p50 (ms)",
+        "rows_per_minute": "Righe/min: {:.1f}",
+        "stats_exported": "Statistiche dei passi salvate in {}",
+
+        # Avvio
+        "startup_time": "Avvio: import {:.0f} ms, finestra creata in {:.0f} ms, primo disegno dopo {:.0f} ms",
+
+        # Gestione errori
+        "on_row_error": "In caso di errore:",
+        "error_skip": "Salta la riga e continua",
+        "error_abort": "Interrompi l'esecuzione",
+        "retries": "Tentativi:",
+        "backoff_s": "Attesa (s):",
+        "stop_after_failures": "Interrompi dopo errori consecutivi (0 = mai):",
+        "retrying_row": "Riga {} fallita, tentativo {} tra {:.1f}s: {}",
+        "run_aborted": "Esecuzione interrotta dopo {} righe fallite consecutive",
+        "failures_saved": "{} righe fallite salvate in {}",
+
+        # Pausa e ripresa
+        "pause": "Pausa",
+        "resume": "Riprendi",
+        "automation_paused": "Automazione in pausa",
+        "automation_resumed": "Automazione ripresa",
+
+        # Tasto di arresto di emergenza
+        "stop_hotkey_active": "Arresto di emergenza: premi {} in qualsiasi finestra",
+        "stop_hotkey_unavailable": "Tasto di arresto di emergenza non disponibile ({}); usa Ferma o Esc in questa finestra",
+
+        # Filtro righe
+        "row_filter": "Filtra righe:",
+        "filter_matches": "{} righe su {} corrispondono al filtro",
+        "invalid_filter": "Filtro righe non valido: {}",
+        "counting_rows": "Conteggio delle righe corrispondenti...",
+
+        # Validazione preliminare
+        "validation_rules": "Regole di validazione",
+        "rule_required": "obbligatorio",
+        "rule_max_length": "Lunghezza max:",
+        "rule_pattern": "Modello:",
+        "rule_min": "Min:",
+        "rule_max": "Max:",
+        "rule_date_format": "Formato data:",
+        "invalid_rules": "Regole di validazione non valide: {}",
+        "validate_data": "Valida Dati",
+        "no_validation_rules": "Nessuna mappatura ha regole di validazione; fai doppio clic su una mappatura per aggiungerle",
+        "validation_summary": "Validazione: {} righe controllate, {} scartate in {:.2f}s",
+        "row_rejected": "Riga {} scartata: {}",
+        "more_rejected_rows": "... e altre {} righe scartate (vedi il log)",
+
+        # Formati e modelli dei valori
+        "value_format": "Formato valore",
+        "format_label": "Formato:",
+        "template_label": "Modello:",
+        "invalid_transforms": "Formato o modello non valido: {}",
+
+        # Ricerche in altri fogli
+        "lookup": "Cerca in un altro foglio",
+        "lookup_sheet": "Foglio:",
+        "lookup_key": "Colonna chiave:",
+        "lookup_value": "Colonna valore:",
+        "invalid_lookup": "Ricerca non valida: {}",
+
+        # Esito dell'esecuzione
+        "run_outcome_stopped": "Automazione fermata: {} righe completate, {} fallite, {} rifiutate",
+        "run_outcome_aborted": "Automazione interrotta: {} righe completate, {} fallite, {} rifiutate",
+        "run_outcome_errors": "Automazione completata con errori: {} righe completate, {} fallite, {} rifiutate",
+
+        # Intervallo di righe
+        "invalid_row_range": "Le righe Da e A devono essere numeri interi",
     },
 
     "ru": {
@@ -357,6 +603,129 @@ translations = {
         # Окно захвата
         "position_mouse": "Наведите мышь туда, где хотите кликнуть",
         "current_position": "Текущая позиция: X={}, Y={}",
+
+        # Потоковое чтение
+        "streaming_mode": "Потоковое чтение (большие файлы)",
+
+        # Кэш листов
+        "clear_sheet_cache": "Очистить кэш листов",
+        "sheet_from_cache": "Лист '{}' загружен из кэша",
+        "sheet_cache_cleared": "Кэш листов очищен: удалено записей: {}",
+
+        # Фоновая загрузка
+        "cancel_loading": "Отменить загрузку",
+        "reading_workbook": "Чтение книги {}...",
+        "loading_sheet": "Загрузка листа '{}'...",
+        "scanning_rows": "Сканирование листа '{}': {} строк...",
+        "load_cancelled": "Загрузка отменена",
+
+        # Проекция столбцов
+        "columns_projected": "Загружено столбцов: {} из {} (только сопоставленные)",
+        "column_not_loaded": "(загрузится после сопоставления)",
+
+        # План выполнения
+        "invalid_steps": "Недопустимые шаги автоматизации: {}",
+
+        # Поиск в журнале
+        "search_log": "Поиск в журнале",
+        "row": "Строка:",
+        "jump_to_row": "Перейти к строке",
+        "search_results": "Строки журнала, содержащие '{}'",
+        "row_log": "Строки журнала для строки {}",
+        "no_log_matches": "Совпадений в журнале нет",
+
+        # Ожидание стабильности
+        "wait_stable": "Ждать стабильности",
+        "width": "Ширина:",
+        "height": "Высота:",
+        "timeout_s": "Тайм-аут (с):",
+
+        # Вставка из буфера обмена
+        "input_mode": "Ввод:",
+        "paste_long_text": "Вставлять длинный текст через буфер обмена",
+
+        # Журнал выполнения
+        "resume_run": "Продолжить выполнение",
+        "resume_from_row": "Предыдущий запуск этого пресета для этой книги уже обработал строк из диапазона: {}.\n\nПродолжить со строки {} и пропустить обработанные строки?",
+        "all_rows_completed": "Все {} строк диапазона уже обработаны предыдущим запуском.\n\nЗапустить их снова?",
+        "resuming_at_row": "Продолжение прерванного запуска со строки {}",
+
+        # Статистика шагов
+        "step_statistics": "Статистика шагов",
+        "runs": "Запуски",
+        "p50_ms": "p50 (мс)",
+        "p95_ms": "p95 (мс)",
+        "max_ms": "Макс (мс)",
+        "delay_p50_ms": "Задержка p50 (мс)",
+        "overhead_p50_ms": "Накладные p50 (мс)",
+        "rows_per_minute": "Строк/мин: {:.1f}",
+        "stats_exported": "Статистика шагов сохранена в {}",
+
+        # Запуск
+        "startup_time": "Запуск: импорт {:.0f} мс, окно создано за {:.0f} мс, первая отрисовка через {:.0f} мс",
+
+        # Обработка ошибок
+        "on_row_error": "При ошибке строки:",
+        "error_skip": "Пропустить строку и продолжить",
+        "error_abort": "Остановить выполнение",
+        "retries": "Повторы:",
+        "backoff_s": "Пауза (с):",
+        "stop_after_failures": "Остановить после ошибок подряд (0 = никогда):",
+        "retrying_row": "Строка {} не выполнена, повтор {} через {:.1f} с: {}",
+        "run_aborted": "Выполнение остановлено после {} ошибочных строк подряд",
+        "failures_saved": "Ошибочные строки ({}) сохранены в {}",
+
+        # Пауза и продолжение
+        "pause": "Пауза",
+        "resume": "Продолжить",
+        "automation_paused": "Автоматизация приостановлена",
+        "automation_resumed": "Автоматизация продолжена",
+
+        # Горячая клавиша аварийной остановки
+        "stop_hotkey_active": "Аварийная остановка: нажмите {} в любом окне",
+        "stop_hotkey_unavailable": "Клавиша аварийной остановки недоступна ({}); используйте Стоп или Esc в этом окне",
+
+        # Фильтр строк
+        "row_filter": "Фильтр строк:",
+        "filter_matches": "Фильтру соответствуют {} из {} строк",
+        "invalid_filter": "Неверный фильтр строк: {}",
+        "counting_rows": "Подсчет подходящих строк...",
+
+        # Предварительная проверка
+        "validation_rules": "Правила проверки",
+        "rule_required": "обязательно",
+        "rule_max_length": "Макс. длина:",
+        "rule_pattern": "Шаблон:",
+        "rule_min": "Мин:",
+        "rule_max": "Макс:",
+        "rule_date_format": "Формат даты:",
+        "invalid_rules": "Неверные правила проверки: {}",
+        "validate_data": "Проверить данные",
+        "no_validation_rules": "Ни у одного сопоставления нет правил проверки; дважды щелкните сопоставление, чтобы добавить их",
+        "validation_summary": "Проверка: проверено строк {}, отклонено {} за {:.2f}с",
+        "row_rejected": "Строка {} отклонена: {}",
+        "more_rejected_rows": "... и еще {} отклоненных строк (см. журнал)",
+
+        # Форматы значений и шаблоны
+        "value_format": "Формат значения",
+        "format_label": "Формат:",
+        "template_label": "Шаблон:",
+        "invalid_transforms": "Неверный формат или шаблон: {}",
+
+        # Поиск по другим листам
+        "lookup": "Поиск на другом листе",
+        "lookup_sheet": "Лист:",
+        "lookup_key": "Ключевой столбец:",
+        "lookup_value": "Столбец значений:",
+        "invalid_lookup": "Неверный поиск: {}",
+
+        # Итог выполнения
+        "run_outcome_stopped": "Автоматизация остановлена: строк выполнено {}, с ошибкой {}, отклонено {}",
+        "run_outcome_aborted": "Автоматизация прервана: строк выполнено {}, с ошибкой {}, отклонено {}",
+        "run_outcome_errors": "Автоматизация завершена с ошибками: строк выполнено {}, с ошибкой {}, отклонено {}",
+
+        # Диапазон строк
+        "invalid_row_range": "Строки «От» и «До» должны быть целыми числами",
     },
 
     "fr": {
@@ -477,6 +846,129 @@ translations = {
         # Fenêtre de capture
         "position_mouse": "Positionnez votre souris où vous voulez cliquer",
         "current_position": "Position actuelle: X={}, Y={}",
+
+        # Lecture en flux
+        "streaming_mode": "Lecture en flux (gros fichiers)",
+
+        # Cache des feuilles
+        "clear_sheet_cache": "Vider le cache des feuilles",
+        "sheet_from_cache": "Feuille '{}' chargée depuis le cache",
+        "sheet_cache_cleared": "Cache des feuilles vidé: {} entrées supprimées",
+
+        # Chargement en arrière-plan
+        "cancel_loading": "Annuler le chargement",
+        "reading_workbook": "Lecture du classeur {}...",
+        "loading_sheet": "Chargement de la feuille '{}'...",
+        "scanning_rows": "Analyse de la feuille '{}': {} lignes...",
+        "load_cancelled": "Chargement annulé",
+
+        # Projection des colonnes
+        "columns_projected": "{} colonnes sur {} chargées (colonnes mappées uniquement)",
+        "column_not_loaded": "(chargée une fois mappée)",
+
+        # Plan d'exécution
+        "invalid_steps": "Étapes d'automatisation invalides: {}",
+
+        # Recherche dans le journal
+        "search_log": "Rechercher dans le journal",
+        "row": "Ligne:",
+        "jump_to_row": "Aller à la ligne",
+        "search_results": "Lignes du journal contenant '{}'",
+        "row_log": "Lignes du journal pour la ligne {}",
+        "no_log_matches": "Aucune ligne correspondante",
+
+        # Attente de stabilité
+        "wait_stable": "Attendre la stabilité",
+        "width": "Largeur:",
+        "height": "Hauteur:",
+        "timeout_s": "Délai max (s):",
+
+        # Collage via le presse-papiers
+        "input_mode": "Saisie:",
+        "paste_long_text": "Coller les textes longs via le presse-papiers",
+
+        # Journal d'exécution
+        "resume_run": "Reprendre l'exécution",
+        "resume_from_row": "Une exécution précédente de ce préréglage sur ce classeur a déjà terminé {} lignes de cette plage.\n\nReprendre à la ligne {} en ignorant les lignes terminées?",
+        "all_rows_completed": "Les {} lignes de cette plage ont déjà été terminées par une exécution précédente.\n\nLes exécuter à nouveau?",
+        "resuming_at_row": "Reprise de l'exécution interrompue à la ligne {}",
+
+        # Statistiques des étapes
+        "step_statistics": "Statistiques des Étapes",
+        "runs": "Exécutions",
+        "p50_ms": "p50 (ms)",
+        "p95_ms": "p95 (ms)",
+        "max_ms": "Max (ms)",
+        "delay_p50_ms": "Délai p50 (ms)",
+        "overhead_p50_ms": "Surcoût p50 (ms)",
+        "rows_per_minute": "Lignes/min : {:.1f}",
+        "stats_exported": "Statistiques des étapes enregistrées dans {}",
+
+        # Démarrage
+        "startup_time": "Démarrage : imports {:.0f} ms, fenêtre créée en {:.0f} ms, premier affichage après {:.0f} ms",
+
+        # Gestion des erreurs
+        "on_row_error": "En cas d'erreur :",
+        "error_skip": "Ignorer la ligne et continuer",
+        "error_abort": "Arrêter l'exécution",
+        "retries": "Tentatives :",
+        "backoff_s": "Attente (s) :",
+        "stop_after_failures": "Arrêter après échecs consécutifs (0 = jamais) :",
+        "retrying_row": "Ligne {} en échec, nouvelle tentative {} dans {:.1f}s : {}",
+        "run_aborted": "Exécution arrêtée après {} ligne(s) en échec consécutives",
+        "failures_saved": "{} ligne(s) en échec enregistrée(s) dans {}",
+
+        # Pause et reprise
+        "pause": "Pause",
+        "resume": "Reprendre",
+        "automation_paused": "Automatisation en pause",
+        "automation_resumed": "Automatisation reprise",
+
+        # Raccourci d'arrêt d'urgence
+        "stop_hotkey_active": "Arrêt d'urgence : appuyez sur {} dans n'importe quelle fenêtre",
+        "stop_hotkey_unavailable": "Raccourci d'arrêt d'urgence indisponible ({}) ; utilisez Arrêter ou Échap dans cette fenêtre",
+
+        # Filtre de lignes
+        "row_filter": "Filtrer les lignes :",
+        "filter_matches": "{} lignes sur {} correspondent au filtre",
+        "invalid_filter": "Filtre de lignes invalide : {}",
+        "counting_rows": "Comptage des lignes correspondantes...",
+
+        # Validation préalable
+        "validation_rules": "Règles de validation",
+        "rule_required": "obligatoire",
+        "rule_max_length": "Longueur max :",
+        "rule_pattern": "Motif :",
+        "rule_min": "Min :",
+        "rule_max": "Max :",
+        "rule_date_format": "Format de date :",
+        "invalid_rules": "Règles de validation invalides : {}",
+        "validate_data": "Valider les données",
+        "no_validation_rules": "Aucun mappage n'a de règles de validation ; double-cliquez sur un mappage pour en ajouter",
+        "validation_summary": "Validation : {} lignes vérifiées, {} rejetées en {:.2f}s",
+        "row_rejected": "Ligne {} rejetée : {}",
+        "more_rejected_rows": "... et {} autres lignes rejetées (voir le journal)",
+
+        # Formats de valeur et modèles
+        "value_format": "Format de valeur",
+        "format_label": "Format :",
+        "template_label": "Modèle :",
+        "invalid_transforms": "Format ou modèle invalide : {}",
+
+        # Recherches dans d'autres feuilles
+        "lookup": "Recherche dans une autre feuille",
+        "lookup_sheet": "Feuille :",
+        "lookup_key": "Colonne clé :",
+        "lookup_value": "Colonne valeur :",
+        "invalid_lookup": "Recherche invalide : {}",
+
+        # Résultat de l'exécution
+        "run_outcome_stopped": "Automatisation arrêtée : {} ligne(s) terminée(s), {} en échec, {} rejetée(s)",
+        "run_outcome_aborted": "Automatisation interrompue : {} ligne(s) terminée(s), {} en échec, {} rejetée(s)",
+        "run_outcome_errors": "Automatisation terminée avec des erreurs : {} ligne(s) terminée(s), {} en échec, {} rejetée(s)",
+
+        # Plage de lignes
+        "invalid_row_range": "Les lignes De et À doivent être des nombres entiers",
     },
 
     "es": {
@@ -597,6 +1089,129 @@ translations = {
         # Ventana de captura
         "position_mouse": "Posicione su ratón donde desea hacer clic",
         "current_position": "Posición actual: X={}, Y={}",
+
+        # Lectura en flujo
+        "streaming_mode": "Lectura en flujo (archivos grandes)",
+
+        # Caché de hojas
+        "clear_sheet_cache": "Vaciar caché de hojas",
+        "sheet_from_cache": "Hoja '{}' cargada desde la caché",
+        "sheet_cache_cleared": "Caché de hojas vaciada: {} entradas eliminadas",
+
+        # Carga en segundo plano
+        "cancel_loading": "Cancelar carga",
+        "reading_workbook": "Leyendo libro {}...",
+        "loading_sheet": "Cargando hoja '{}'...",
+        "scanning_rows": "Analizando hoja '{}': {} filas...",
+        "load_cancelled": "Carga cancelada",
+
+        # Proyección de columnas
+        "columns_projected": "Cargadas {} de {} columnas (solo columnas mapeadas)",
+        "column_not_loaded": "(se carga al mapearla)",
+
+        # Plan de ejecución
+        "invalid_steps": "Pasos de automatización no válidos: {}",
+
+        # Búsqueda en el registro
+        "search_log": "Buscar en el registro",
+        "row": "Fila:",
+        "jump_to_row": "Ir a la fila",
+        "search_results": "Líneas del registro que contienen '{}'",
+        "row_log": "Líneas del registro de la fila {}",
+        "no_log_matches": "No hay líneas coincidentes",
+
+        # Esperar estabilidad
+        "wait_stable": "Esperar estabilidad",
+        "width": "Ancho:",
+        "height": "Alto:",
+        "timeout_s": "Tiempo máx. (s):",
+
+        # Pegar desde el portapapeles
+        "input_mode": "Entrada:",
+        "paste_long_text": "Pegar textos largos desde el portapapeles",
+
+        # Diario de ejecución
+        "resume_run": "Reanudar ejecución",
+        "resume_from_row": "Una ejecución anterior de este preajuste sobre este libro ya completó {} filas de este rango.\n\n¿Reanudar en la fila {} omitiendo las filas completadas?",
+        "all_rows_completed": "Las {} filas de este rango ya fueron completadas por una ejecución anterior.\n\n¿Ejecutarlas de nuevo?",
+        "resuming_at_row": "Reanudando la ejecución interrumpida en la fila {}",
+
+        # Estadísticas de pasos
+        "step_statistics": "Estadísticas de Pasos",
+        "runs": "Ejecuciones",
+        "p50_ms": "p50 (ms)",
+        "p95_ms": "p95 (ms)",
+        "max_ms": "Máx (ms)",
+        "delay_p50_ms": "Retraso p50 (ms)",
+        "overhead_p50_ms": "Sobrecarga p50 (ms)",
+        "rows_per_minute": "Filas/min: {:.1f}",
+        "stats_exported": "Estadísticas de pasos guardadas en {}",
+
+        # Inicio
+        "startup_time": "Inicio: importaciones {:.0f} ms, ventana creada en {:.0f} ms, primer dibujado tras {:.0f} ms",
+
+        # Gestión de errores
+        "on_row_error": "Ante un error:",
+        "error_skip": "Omitir fila y continuar",
+        "error_abort": "Detener la ejecución",
+        "retries": "Reintentos:",
+        "backoff_s": "Espera (s):",
+        "stop_after_failures": "Detener tras fallos seguidos (0 = nunca):",
+        "retrying_row": "Fila {} fallida, reintento {} en {:.1f}s: {}",
+        "run_aborted": "Ejecución detenida tras {} fila(s) fallidas seguidas",
+        "failures_saved": "{} fila(s) fallidas guardadas en {}",
+
+        # Pausa y reanudación
+        "pause": "Pausa",
+        "resume": "Reanudar",
+        "automation_paused": "Automatización en pausa",
+        "automation_resumed": "Automatización reanudada",
+
+        # Atajo de parada de emergencia
+        "stop_hotkey_active": "Parada de emergencia: pulse {} en cualquier ventana",
+        "stop_hotkey_unavailable": "Atajo de parada de emergencia no disponible ({}); use Detener o Esc en esta ventana",
+
+        # Filtro de filas
+        "row_filter": "Filtrar filas:",
+        "filter_matches": "{} de {} filas coinciden con el filtro",
+        "invalid_filter": "Filtro de filas no válido: {}",
+        "counting_rows": "Contando filas coincidentes...",
+
+        # Validación previa
+        "validation_rules": "Reglas de validación",
+        "rule_required": "obligatorio",
+        "rule_max_length": "Longitud máx.:",
+        "rule_pattern": "Patrón:",
+        "rule_min": "Mín:",
+        "rule_max": "Máx:",
+        "rule_date_format": "Formato de fecha:",
+        "invalid_rules": "Reglas de validación no válidas: {}",
+        "validate_data": "Validar Datos",
+        "no_validation_rules": "Ningún mapeo tiene reglas de validación; haga doble clic en un mapeo para añadirlas",
+        "validation_summary": "Validación: {} filas comprobadas, {} rechazadas en {:.2f}s",
+        "row_rejected": "Fila {} rechazada: {}",
+        "more_rejected_rows": "... y {} filas rechazadas más (ver el registro)",
+
+        # Formatos de valor y plantillas
+        "value_format": "Formato de valor",
+        "format_label": "Formato:",
+        "template_label": "Plantilla:",
+        "invalid_transforms": "Formato o plantilla no válidos: {}",
+
+        # Búsquedas en otras hojas
+        "lookup": "Buscar en otra hoja",
+        "lookup_sheet": "Hoja:",
+        "lookup_key": "Columna clave:",
+        "lookup_value": "Columna de valor:",
+        "invalid_lookup": "Búsqueda no válida: {}",
+
+        # Resultado de la ejecución
+        "run_outcome_stopped": "Automatización detenida: {} fila(s) completada(s), {} fallida(s), {} rechazada(s)",
+        "run_outcome_aborted": "Automatización abortada: {} fila(s) completada(s), {} fallida(s), {} rechazada(s)",
+        "run_outcome_errors": "Automatización completada con errores: {} fila(s) completada(s), {} fallida(s), {} rechazada(s)",
+
+        # Rango de filas
+        "invalid_row_range": "Las filas Desde y Hasta deben ser números enteros",
     },
 
     "de": {
@@ -717,6 +1332,129 @@ translations = {
         # Erfassungsfenster
         "position_mouse": "Positionieren Sie Ihre Maus, wo Sie klicken möchten",
         "current_position": "Aktuelle Position: X={}, Y={}",
+
+        # Streaming
+        "streaming_mode": "Zeilen streamen (große Dateien)",
+
+        # Blatt-Cache
+        "clear_sheet_cache": "Blatt-Cache leeren",
+        "sheet_from_cache": "Blatt '{}' aus dem Cache geladen",
+        "sheet_cache_cleared": "Blatt-Cache geleert: {} Einträge entfernt",
+
+        # Laden im Hintergrund
+        "cancel_loading": "Laden abbrechen",
+        "reading_workbook": "Arbeitsmappe {} wird gelesen...",
+        "loading_sheet": "Blatt '{}' wird geladen...",
+        "scanning_rows": "Blatt '{}' wird durchsucht: {} Zeilen...",
+        "load_cancelled": "Laden abgebrochen",
+
+        # Spaltenprojektion
+        "columns_projected": "{} von {} Spalten geladen (nur zugeordnete Spalten)",
+        "column_not_loaded": "(wird bei Zuordnung geladen)",
+
+        # Ausführungsplan
+        "invalid_steps": "Ungültige Automatisierungsschritte: {}",
+
+        # Protokollsuche
+        "search_log": "Protokoll durchsuchen",
+        "row": "Zeile:",
+        "jump_to_row": "Zu Zeile springen",
+        "search_results": "Protokollzeilen mit '{}'",
+        "row_log": "Protokollzeilen für Zeile {}",
+        "no_log_matches": "Keine passenden Protokollzeilen",
+
+        # Warten auf Stabilität
+        "wait_stable": "Warten bis stabil",
+        "width": "Breite:",
+        "height": "Höhe:",
+        "timeout_s": "Zeitlimit (s):",
+
+        # Einfügen über die Zwischenablage
+        "input_mode": "Eingabe:",
+        "paste_long_text": "Lange Texte über die Zwischenablage einfügen",
+
+        # Ausführungsjournal
+        "resume_run": "Ausführung fortsetzen",
+        "resume_from_row": "Ein früherer Lauf dieser Vorlage mit dieser Arbeitsmappe hat bereits {} Zeilen dieses Bereichs abgeschlossen.\n\nBei Zeile {} fortsetzen und abgeschlossene Zeilen überspringen?",
+        "all_rows_completed": "Alle {} Zeilen dieses Bereichs wurden bereits von einem früheren Lauf abgeschlossen.\n\nErneut ausführen?",
+        "resuming_at_row": "Unterbrochener Lauf wird bei Zeile {} fortgesetzt",
+
+        # Schrittstatistik
+        "step_statistics": "Schrittstatistik",
+        "runs": "Ausführungen",
+        "p50_ms": "p50 (ms)",
+        "p95_ms": "p95 (ms)",
+        "max_ms": "Max (ms)",
+        "delay_p50_ms": "Verzögerung p50 (ms)",
+        "overhead_p50_ms": "Overhead p50 (ms)",
+        "rows_per_minute": "Zeilen/Min: {:.1f}",
+        "stats_exported": "Schrittstatistik gespeichert unter {}",
+
+        # Start
+        "startup_time": "Start: Importe {:.0f} ms, Fenster erstellt in {:.0f} ms, erste Darstellung nach {:.0f} ms",
+
+        # Fehlerbehandlung
+        "on_row_error": "Bei Zeilenfehler:",
+        "error_skip": "Zeile überspringen und fortfahren",
+        "error_abort": "Ausführung beenden",
+        "retries": "Wiederholungen:",
+        "backoff_s": "Wartezeit (s):",
+        "stop_after_failures": "Nach Fehlern in Folge beenden (0 = nie):",
+        "retrying_row": "Zeile {} fehlgeschlagen, Wiederholung {} in {:.1f}s: {}",
+        "run_aborted": "Ausführung nach {} fehlgeschlagenen Zeilen in Folge beendet",
+        "failures_saved": "{} fehlgeschlagene Zeile(n) gespeichert unter {}",
+
+        # Pause und Fortsetzen
+        "pause": "Pause",
+        "resume": "Fortsetzen",
+        "automation_paused": "Automatisierung pausiert",
+        "automation_resumed": "Automatisierung fortgesetzt",
+
+        # Not-Aus-Tastenkürzel
+        "stop_hotkey_active": "Not-Aus: {} in einem beliebigen Fenster drücken",
+        "stop_hotkey_unavailable": "Not-Aus-Tastenkürzel nicht verfügbar ({}); Stopp oder Esc in diesem Fenster verwenden",
+
+        # Zeilenfilter
+        "row_filter": "Zeilen filtern:",
+        "filter_matches": "{} von {} Zeilen entsprechen dem Filter",
+        "invalid_filter": "Ungültiger Zeilenfilter: {}",
+        "counting_rows": "Passende Zeilen werden gezählt...",
+
+        # Vorabprüfung
+        "validation_rules": "Prüfregeln",
+        "rule_required": "Pflichtfeld",
+        "rule_max_length": "Max. Länge:",
+        "rule_pattern": "Muster:",
+        "rule_min": "Min:",
+        "rule_max": "Max:",
+        "rule_date_format": "Datumsformat:",
+        "invalid_rules": "Ungültige Prüfregeln: {}",
+        "validate_data": "Daten prüfen",
+        "no_validation_rules": "Keine Zuordnung hat Prüfregeln; Doppelklick auf eine Zuordnung, um welche hinzuzufügen",
+        "validation_summary": "Prüfung: {} Zeilen geprüft, {} abgelehnt in {:.2f}s",
+        "row_rejected": "Zeile {} abgelehnt: {}",
+        "more_rejected_rows": "... und {} weitere abgelehnte Zeilen (siehe Protokoll)",
+
+        # Wertformate und Vorlagen
+        "value_format": "Wertformat",
+        "format_label": "Format:",
+        "template_label": "Vorlage:",
+        "invalid_transforms": "Ungültiges Format oder ungültige Vorlage: {}",
+
+        # Nachschlagen in anderen Blättern
+        "lookup": "In anderem Blatt nachschlagen",
+        "lookup_sheet": "Blatt:",
+        "lookup_key": "Schlüsselspalte:",
+        "lookup_value": "Wertspalte:",
+        "invalid_lookup": "Ungültiges Nachschlagen: {}",
+
+        # Ergebnis des Laufs
+        "run_outcome_stopped": "Automatisierung gestoppt: {} Zeile(n) abgeschlossen, {} fehlgeschlagen, {} abgelehnt",
+        "run_outcome_aborted": "Automatisierung abgebrochen: {} Zeile(n) abgeschlossen, {} fehlgeschlagen, {} abgelehnt",
+        "run_outcome_errors": "Automatisierung mit Fehlern abgeschlossen: {} Zeile(n) abgeschlossen, {} fehlgeschlagen, {} abgelehnt",
+
+        # Zeilenbereich
+        "invalid_row_range": "Die Zeilen Von und Bis müssen ganze Zahlen sein",
     },
 
     "zh": {
@@ -837,6 +1575,129 @@ translations = {
         # 捕获窗口
         "position_mouse": "将鼠标放在要点击的位置",
         "current_position": "当前位置: X={}, Y={}",
+
+        # 流式读取
+        "streaming_mode": "流式读取行（大文件）",
+
+        # 工作表缓存
+        "clear_sheet_cache": "清除工作表缓存",
+        "sheet_from_cache": "工作表'{}'已从缓存加载",
+        "sheet_cache_cleared": "工作表缓存已清除: 删除了{}个条目",
+
+        # 后台加载
+        "cancel_loading": "取消加载",
+        "reading_workbook": "正在读取工作簿 {}...",
+        "loading_sheet": "正在加载工作表'{}'...",
+        "scanning_rows": "正在扫描工作表'{}': {}行...",
+        "load_cancelled": "加载已取消",
+
+        # 列投影
+        "columns_projected": "已加载{}/{}列（仅映射列）",
+        "column_not_loaded": "（映射后加载）",
+
+        # 执行计划
+        "invalid_steps": "自动化步骤无效: {}",
+
+        # 日志搜索
+        "search_log": "搜索日志",
+        "row": "行:",
+        "jump_to_row": "跳转到行",
+        "search_results": "包含'{}'的日志行",
+        "row_log": "第{}行的日志",
+        "no_log_matches": "没有匹配的日志行",
+
+        # 等待稳定
+        "wait_stable": "等待画面稳定",
+        "width": "宽度:",
+        "height": "高度:",
+        "timeout_s": "超时 (秒):",
+
+        # 剪贴板粘贴
+        "input_mode": "输入方式:",
+        "paste_long_text": "通过剪贴板粘贴长文本",
+
+        # 运行日志
+        "resume_run": "继续运行",
+        "resume_from_row": "此预设在此工作簿上的先前运行已完成该范围内的{}行。\n\n从第{}行继续并跳过已完成的行吗?",
+        "all_rows_completed": "该范围内的全部{}行已由先前的运行完成。\n\n要重新运行吗?",
+        "resuming_at_row": "从第{}行继续中断的运行",
+
+        # 步骤统计
+        "step_statistics": "步骤统计",
+        "runs": "次数",
+        "p50_ms": "p50 (毫秒)",
+        "p95_ms": "p95 (毫秒)",
+        "max_ms": "最大 (毫秒)",
+        "delay_p50_ms": "延迟 p50 (毫秒)",
+        "overhead_p50_ms": "开销 p50 (毫秒)",
+        "rows_per_minute": "行/分钟: {:.1f}",
+        "stats_exported": "步骤统计已保存到 {}",
+
+        # 启动
+        "startup_time": "启动: 导入 {:.0f} 毫秒, 窗口创建 {:.0f} 毫秒, 首次绘制 {:.0f} 毫秒",
+
+        # 错误处理
+        "on_row_error": "行出错时:",
+        "error_skip": "跳过该行并继续",
+        "error_abort": "停止运行",
+        "retries": "重试次数:",
+        "backoff_s": "退避 (秒):",
+        "stop_after_failures": "连续失败后停止 (0 = 从不):",
+        "retrying_row": "第 {} 行失败, 第 {} 次重试将在 {:.1f} 秒后进行: {}",
+        "run_aborted": "连续 {} 行失败后已停止运行",
+        "failures_saved": "{} 个失败行已保存到 {}",
+
+        # 暂停与继续
+        "pause": "暂停",
+        "resume": "继续",
+        "automation_paused": "自动化已暂停",
+        "automation_resumed": "自动化已继续",
+
+        # 紧急停止快捷键
+        "stop_hotkey_active": "紧急停止: 在任意窗口按 {}",
+        "stop_hotkey_unavailable": "紧急停止快捷键不可用 ({}); 请在本窗口使用停止或 Esc",
+
+        # 行筛选
+        "row_filter": "筛选行:",
+        "filter_matches": "{} / {} 行符合筛选条件",
+        "invalid_filter": "无效的行筛选: {}",
+        "counting_rows": "正在统计匹配的行...",
+
+        # 运行前校验
+        "validation_rules": "校验规则",
+        "rule_required": "必填",
+        "rule_max_length": "最大长度:",
+        "rule_pattern": "模式:",
+        "rule_min": "最小值:",
+        "rule_max": "最大值:",
+        "rule_date_format": "日期格式:",
+        "invalid_rules": "无效的校验规则: {}",
+        "validate_data": "校验数据",
+        "no_validation_rules": "没有映射设置校验规则; 双击映射以添加",
+        "validation_summary": "校验: 已检查 {} 行, 拒绝 {} 行, 用时 {:.2f}秒",
+        "row_rejected": "第 {} 行被拒绝: {}",
+        "more_rejected_rows": "... 另有 {} 行被拒绝 (见日志)",
+
+        # 值格式和模板
+        "value_format": "值格式",
+        "format_label": "格式：",
+        "template_label": "模板：",
+        "invalid_transforms": "格式或模板无效：{}",
+
+        # 跨工作表查找
+        "lookup": "在其他工作表中查找",
+        "lookup_sheet": "工作表：",
+        "lookup_key": "键列：",
+        "lookup_value": "值列：",
+        "invalid_lookup": "查找无效：{}",
+
+        # 运行结果
+        "run_outcome_stopped": "自动化已停止: 完成 {} 行, 失败 {} 行, 拒绝 {} 行",
+        "run_outcome_aborted": "自动化已中止: 完成 {} 行, 失败 {} 行, 拒绝 {} 行",
+        "run_outcome_errors": "自动化已完成但有错误: 完成 {} 行, 失败 {} 行, 拒绝 {} 行",
+
+        # 行范围
+        "invalid_row_range": "“从”和“到”的行号必须是整数",
     }
 }
 
@@ -0,0 +1,71 @@
+"""
+Thread-safe event channel between automation workers and the Tk thread
+"""
+
+import queue
+
+# Default drain interval: 10 widget updates per second at most
+FRAME_INTERVAL_MS = 100
+
+# Upper bound of events handled per frame so a flood cannot stall the UI
+MAX_EVENTS_PER_FRAME = 10000
+
+
+class UIEventQueue:
+    """Producer/consumer queue drained on the Tk thread with root.after
+
+    Worker threads call post(); they never touch widgets. Every frame the Tk
+    thread drains the queue and coalesces what it found:
+
+    - batched kinds (e.g. "log") call their handler once with the list of
+      all payloads posted since the last frame
+    - coalesced kinds (e.g. "progress", "status") call their handler once
+      with the most recent payload only
+    - any other kind calls its handler for every event, in order
+    """
+
+    def __init__(self, root, handlers, batched=("log",), coalesced=("progress", "status"),
+                 interval_ms=FRAME_INTERVAL_MS):
+        self.root = root
+        self.handlers = handlers
+        self.batched = set(batched)
+        self.coalesced = set(coalesced)
+        self.interval_ms = interval_ms
+        self._queue = queue.Queue()
+
+    def post(self, kind, *payload):
+        """Queue an event; safe to call from any thread"""
+        self._queue.put((kind, payload))
+
+    def start(self):
+        self.root.after(self.interval_ms, self._drain_loop)
+
+    def _drain_loop(self):
+        try:
+            self.drain()
+        finally:
+            self.root.after(self.interval_ms, self._drain_loop)
+
+    def drain(self):
+        """Apply all pending events with as few widget updates as possible"""
+        batches = {}
+        latest = {}
+        ordered = []
+        for _ in range(MAX_EVENTS_PER_FRAME):
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind in self.batched:
+                batches.setdefault(kind, []).append(payload)
+            elif kind in self.coalesced:
+                latest[kind] = payload
+            else:
+                ordered.append((kind, payload))
+
+        for kind, payloads in batches.items():
+            self.handlers[kind](payloads)
+        for kind, payload in latest.items():
+            self.handlers[kind](*payload)
+        for kind, payload in ordered:
+            self.handlers[kind](*payload)
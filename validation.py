@@ -0,0 +1,249 @@
+"""
+Pre-flight validation of mapped columns against per-mapping rules
+"""
+
+import itertools
+import re
+import time
+
+from engine import column_to_strings
+
+# pandas and numpy are imported where they are used, like in data_sources
+
+# Rule settings a mapping can have, as stored in presets under "mapping_rules"
+RULE_KEYS = ("required", "max_length", "pattern", "min", "max", "date_format")
+
+# Rows parsed per batch when validating a streaming sheet
+VALIDATION_CHUNK_ROWS = 50000
+
+
+class ValidationError(ValueError):
+    """A row rejected by pre-flight validation; recorded like a failed row"""
+
+
+def normalize_rules(rules):
+    """Check one mapping's rules and return them without unset entries
+
+    Raises ValueError for unknown rules, non-numeric limits or a pattern
+    that is not a valid regular expression.
+    """
+    clean = {}
+    for key, value in (rules or {}).items():
+        if key not in RULE_KEYS:
+            raise ValueError(f"Unknown validation rule '{key}'")
+        if value is None or value == "" or value is False:
+            continue
+        if key == "required":
+            value = bool(value)
+        elif key == "max_length":
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"'max_length' must be a whole number, got {value!r}")
+            if value < 1:
+                raise ValueError(f"'max_length' must be at least 1, got {value}")
+        elif key in ("min", "max"):
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{key}' must be a number, got {value!r}")
+        elif key == "pattern":
+            try:
+                re.compile(value)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern {value!r}: {e}")
+        clean[key] = value
+    if "min" in clean and "max" in clean and clean["min"] > clean["max"]:
+        raise ValueError(f"'min' ({clean['min']:g}) is greater than 'max' ({clean['max']:g})")
+    return clean
+
+
+def _problem_text(rule, rules):
+    if rule == "required":
+        return "empty"
+    if rule == "max_length":
+        return f"longer than {rules['max_length']} characters"
+    if rule == "pattern":
+        return f"does not match {rules['pattern']}"
+    if rule == "number":
+        return "not a number"
+    if rule == "min":
+        return f"below {rules['min']:g}"
+    if rule == "max":
+        return f"above {rules['max']:g}"
+    return f"not a date like {rules['date_format']}"
+
+
+def check_column(values, rules):
+    """Return [(rule, mask)] marking the cells of values that break each rule
+
+    values is a pandas Series of raw cells. Text rules are checked once per
+    distinct value and spread back over the column by NumPy indexing, so
+    repeated values (statuses, countries, dates) cost nothing extra. Cells
+    are checked as the text that would be typed; empty cells only break
+    required.
+    """
+    import numpy as np
+    import pandas as pd
+    from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+    numeric = is_numeric_dtype(values) and not is_bool_dtype(values)
+    problems = []
+    if numeric and not any(key in rules for key in ("max_length", "pattern", "date_format")):
+        # Plain number column: nothing to convert to text
+        numbers = values.to_numpy(dtype=float)
+        if rules.get("required"):
+            problems.append(("required", np.isnan(numbers)))
+        if "min" in rules:
+            problems.append(("min", numbers < rules["min"]))
+        if "max" in rules:
+            problems.append(("max", numbers > rules["max"]))
+        return problems
+
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+    texts = pd.Series(column_to_strings(pd.Series(uniques, dtype=object)), dtype=object)
+
+    def spread(per_value, empty=False):
+        # Code -1 (an empty cell) picks the extra last slot
+        return np.append(per_value, empty)[codes]
+
+    blank = (texts.str.strip() == "").to_numpy(dtype=bool)
+    present = ~blank
+    if rules.get("required"):
+        problems.append(("required", spread(blank, True)))
+    if "max_length" in rules:
+        problems.append(("max_length", spread(present & (texts.str.len() > rules["max_length"]).to_numpy())))
+    if "pattern" in rules:
+        matches = texts.str.fullmatch(rules["pattern"]).to_numpy(dtype=bool)
+        problems.append(("pattern", spread(present & ~matches)))
+    if "min" in rules or "max" in rules:
+        numbers = pd.to_numeric(texts.where(present), errors="coerce").to_numpy(dtype=float)
+        problems.append(("number", spread(present & np.isnan(numbers))))
+        numbers = spread(numbers, np.nan)
+        if "min" in rules:
+            problems.append(("min", numbers < rules["min"]))
+        if "max" in rules:
+            problems.append(("max", numbers > rules["max"]))
+    if "date_format" in rules:
+        dates = pd.to_datetime(texts.where(present), format=rules["date_format"], errors="coerce")
+        problems.append(("date_format", spread(present & dates.isna().to_numpy())))
+    return problems
+
+
+class ValidationReport:
+    """Rows of a range that break the rules of their mappings
+
+    Problems are kept as one array of row indices per broken rule, so even
+    a sheet where most rows are rejected is summarized without a per-row
+    Python loop; reason() looks a single row up.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.checked = 0
+        self.elapsed = 0.0
+        self._hits = []  # (variable, rule, sorted row indices, the rows' text values)
+        self._rejected = None
+
+    def add(self, variable, rule, row_indices, values):
+        if len(row_indices):
+            self._hits.append((variable, rule, row_indices, values))
+            self._rejected = None
+
+    @property
+    def rejected(self):
+        """Sorted indices of the rejected rows"""
+        import numpy as np
+        if self._rejected is None:
+            rows = [row_indices for _, _, row_indices, _ in self._hits]
+            self._rejected = np.unique(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+        return self._rejected
+
+    def problems(self, row_idx):
+        """[(variable, rule, value)] broken by one row"""
+        import numpy as np
+        found = []
+        for variable, rule, row_indices, values in self._hits:
+            position = np.searchsorted(row_indices, row_idx)
+            if position < len(row_indices) and row_indices[position] == row_idx:
+                found.append((variable, rule, values[position]))
+        return found
+
+    def reason(self, row_idx):
+        return "; ".join(f"{variable}: {_problem_text(rule, self.rules[variable])} ({value!r})"
+                         for variable, rule, value in self.problems(row_idx))
+
+    def values(self, row_idx):
+        """The offending cells of a rejected row, as {variable: text}"""
+        return {variable: value for variable, rule, value in self.problems(row_idx)}
+
+    def summary(self):
+        """One line per broken rule: which mapping, what is wrong and how many rows"""
+        counts = {}
+        for variable, rule, row_indices, _ in self._hits:
+            counts[(variable, rule)] = counts.get((variable, rule), 0) + len(row_indices)
+        return [f"{variable}: {count} row(s) {_problem_text(rule, self.rules[variable])}"
+                for (variable, rule), count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+
+
+def validate_rows(source, mappings, rules, start=0, stop=None, selected=None, progress=None, transforms=None):
+    """Check rows [start, stop) of a row source against per-mapping rules
+
+    mappings is a {variable: column} dict and rules a {variable: rules}
+    dict of normalized rules; only mappings with rules are read, unless
+    transforms (a value_transforms.ValueTransforms) are given: then the rules
+    check the formatted text, which may use every mapped column. selected,
+    if given, restricts the check to those row indices (see
+    row_filter.matching_rows). Streaming sheets are checked in batches,
+    calling progress(rows_checked) after each. Returns a ValidationReport.
+    """
+    import numpy as np
+    import pandas as pd
+
+    started = time.perf_counter()
+    checked = {variable: rules[variable] for variable in mappings if rules.get(variable)}
+    report = ValidationReport(checked)
+    stop = source.row_count if stop is None else min(stop, source.row_count)
+    start = min(start, stop)
+    if selected is not None:
+        selected = selected[(selected >= start) & (selected < stop)]
+    read = list(mappings) if transforms and checked else list(checked)
+    columns = [mappings[variable] for variable in read]
+    source.ensure_columns(columns)
+
+    def check(frame, indices):
+        # frame holds the columns in order; two mappings may share a column
+        cells = {variable: frame.iloc[:, position] for position, variable in enumerate(read)}
+        if transforms and checked:
+            cells = {variable: pd.Series(texts, dtype=object) for variable, texts in transforms.apply(cells).items()}
+        for variable, variable_rules in checked.items():
+            values = cells[variable]
+            for rule, mask in check_column(values, variable_rules):
+                if mask.any():
+                    report.add(variable, rule, indices[mask], column_to_strings(values[mask]))
+        report.checked += len(indices)
+
+    if not source.streaming:
+        if selected is None:
+            check(source.data.iloc[start:stop][columns], np.arange(start, stop))
+        else:
+            check(source.data.iloc[selected][columns], selected)
+    elif not checked:
+        report.checked = stop - start if selected is None else len(selected)
+    else:
+        wanted = None if selected is None else set(selected.tolist())
+        rows = source.iter_rows(start, stop, columns)
+        while True:
+            batch = list(itertools.islice(rows, VALIDATION_CHUNK_ROWS))
+            if not batch:
+                break
+            if wanted is not None:
+                batch = [row for row in batch if row[0] in wanted]
+            if batch:
+                indices = np.fromiter((row_idx for row_idx, _ in batch), dtype=np.int64, count=len(batch))
+                check(pd.DataFrame([values for _, values in batch], dtype=object), indices)
+            if progress:
+                progress(report.checked)
+
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,221 @@
+"""
+Per-mapping value formats and multi-column templates, compiled once per run
+"""
+
+import string
+import warnings
+
+from engine import column_to_strings
+
+# pandas and numpy are imported where they are used, like in data_sources
+
+# Settings a mapping can have, as stored in presets under "mapping_transforms"
+TRANSFORM_KEYS = ("format", "template")
+
+# Format steps without an argument, and those written as name:argument
+SIMPLE_FORMATS = ("strip", "upper", "lower", "title", "number")
+ARGUMENT_FORMATS = ("number", "date", "zfill", "default")
+
+
+def _text(series):
+    import pandas as pd
+    return pd.Series(column_to_strings(series), index=series.index, dtype=object)
+
+
+def _merge(values, converted, rendered):
+    """Text of a column: rendered for the converted cells, plain text for the rest"""
+    import numpy as np
+    import pandas as pd
+    text = np.empty(len(values), dtype=object)
+    text[converted] = rendered
+    if not converted.all():
+        text[~converted] = column_to_strings(values[~converted])
+    return pd.Series(text, index=values.index)
+
+
+def _format_number(values, spec):
+    """Numbers formatted with a format spec (whole floats lose their .0); other cells as text"""
+    import numpy as np
+    import pandas as pd
+    from pandas.api.types import is_datetime64_any_dtype
+
+    if is_datetime64_any_dtype(values):
+        return _text(values)
+    numbers = pd.to_numeric(values, errors="coerce")
+    is_number = numbers.notna().to_numpy()
+
+    def render(number):
+        if spec:
+            return format(number, spec)
+        return str(int(number)) if float(number).is_integer() else str(number)
+
+    # Each distinct number is formatted once, then spread over the column
+    codes, distinct = pd.factorize(numbers[is_number])
+    rendered = np.array([render(number) for number in distinct], dtype=object)[codes]
+    return _merge(values, is_number, rendered)
+
+
+def _format_date(values, spec):
+    """Dates and date-like text rewritten with a strftime format; other cells as text"""
+    import pandas as pd
+    from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+    if is_datetime64_any_dtype(values):
+        dates = values
+    elif is_numeric_dtype(values):
+        return _text(values)  # Plain numbers are never dates
+    else:
+        # Leave numeric cells alone: pandas would read them as epoch offsets
+        candidates = values.where(pd.to_numeric(values, errors="coerce").isna())
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            dates = pd.to_datetime(candidates, errors="coerce")
+    is_date = dates.notna().to_numpy()
+    return _merge(values, is_date, dates[is_date].dt.strftime(spec).to_numpy(dtype=object))
+
+
+def _compile_step(step, spec):
+    name, _, argument = step.partition(":")
+    name = name.strip().lower()
+    if name not in SIMPLE_FORMATS + ARGUMENT_FORMATS:
+        raise ValueError(f"Unknown format '{name}' in '{spec}'")
+    if not argument and name not in SIMPLE_FORMATS:
+        raise ValueError(f"Format '{name}' needs an argument, e.g. {name}:... in '{spec}'")
+
+    if name in ("strip", "upper", "lower", "title"):
+        return lambda values: getattr(_text(values).str, name)()
+    if name == "number":
+        try:
+            format(1.5, argument)
+        except ValueError as e:
+            raise ValueError(f"Invalid number format '{argument}': {e}")
+        return lambda values: _format_number(values, argument)
+    if name == "date":
+        return lambda values: _format_date(values, argument)
+    if name == "zfill":
+        try:
+            width = int(argument)
+        except ValueError:
+            raise ValueError(f"zfill needs a width, got '{argument}'")
+
+        def zfill(values):
+            text = _text(values)
+            return text.where(text == "", text.str.zfill(width))
+        return zfill
+
+    def default(values):
+        text = _text(values)
+        return text.where(text.str.strip() != "", argument)
+    return default
+
+
+def compile_format(spec):
+    """Turn 'strip|upper' or 'number:,.2f' into a function of a column
+
+    The function takes a pandas Series of raw cells and returns the text to
+    type for each, as an object Series; steps run left to right over the
+    whole column. Raises ValueError for unknown formats.
+    """
+    steps = [_compile_step(step, spec) for step in spec.split("|") if step.strip()]
+
+    def apply(values):
+        for step in steps:
+            values = step(values)
+        return values if steps else _text(values)
+    return apply
+
+
+def compile_template(template, variables):
+    """Split '{first} {last}' into literal text and variable names
+
+    Fields must name mapped variables; formatting belongs in the mapping's
+    format, so '{amount:.2f}' and '{name!r}' are rejected.
+    """
+    parts = []
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"Invalid template '{template}': {e}")
+    for literal, field, spec, conversion in parsed:
+        if literal:
+            parts.append((literal, None))
+        if field is None:
+            continue
+        if field not in variables:
+            raise ValueError(f"Template '{template}' uses '{{{field}}}', which is not a mapped variable")
+        if spec or conversion:
+            raise ValueError(f"Template '{template}': put formats in the mapping's format, not in '{{{field}}}'")
+        parts.append((None, field))
+    return parts
+
+
+def normalize_transforms(settings, variables=None):
+    """Check one mapping's format and template; return them without unset entries
+
+    variables, when given, are the mapped variable names a template may use.
+    """
+    clean = {}
+    for key, value in (settings or {}).items():
+        if key not in TRANSFORM_KEYS:
+            raise ValueError(f"Unknown mapping setting '{key}'")
+        if value is None or not str(value).strip():
+            continue
+        value = str(value)
+        if key == "format":
+            compile_format(value)
+        elif variables is not None:
+            compile_template(value, variables)
+        clean[key] = value
+    return clean
+
+
+class ValueTransforms:
+    """Formats and templates of a set of mappings, compiled for a run
+
+    apply() turns the raw columns of a block of rows into the text of every
+    variable column by column: first each variable's lookup join (lookups is
+    a lookups.LookupTables), then its format, then the templates, which see
+    the formatted values of the variables they name. A row then only needs
+    one lookup per variable.
+    """
+
+    def __init__(self, mappings, settings, lookups=None):
+        variables = list(mappings)
+        self.variables = variables
+        self.lookups = lookups
+        # The settings as given, for preset_hash
+        self.settings = {variable: options for variable, options in settings.items() if variable in mappings}
+        self.formats = {}
+        self.templates = {}
+        for variable, options in settings.items():
+            if variable not in mappings:
+                continue
+            if options.get("format"):
+                self.formats[variable] = compile_format(options["format"])
+            if options.get("template"):
+                self.templates[variable] = compile_template(options["template"], variables)
+
+    def __bool__(self):
+        return bool(self.formats or self.templates or self.lookups)
+
+    def apply(self, columns):
+        """Map {variable: raw Series} to {variable: list of str}, all over the same rows"""
+        import numpy as np
+
+        texts = {}
+        for variable, values in columns.items():
+            if self.lookups and variable in self.lookups:
+                values = self.lookups.resolve(variable, values)
+            apply = self.formats.get(variable)
+            texts[variable] = (apply(values) if apply else _text(values)).to_numpy(dtype=object)
+
+        rendered = {}
+        for variable, parts in self.templates.items():
+            result = ""
+            for literal, field in parts:
+                result = result + (literal if field is None else texts[field])
+            if isinstance(result, str):  # Only literal text
+                result = np.full(len(texts[variable]), result, dtype=object)
+            rendered[variable] = result
+        texts.update(rendered)
+        return {variable: texts[variable].tolist() for variable in columns}